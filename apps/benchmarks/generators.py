@@ -0,0 +1,76 @@
+# src/benchmarks/generators.py
+import random
+import string
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import List, Tuple
+
+# Message, endpoint and status of the requests in the sample log
+LOG_EVENTS = (
+    ('INFO: Page visited', '/home', 200),
+    ('INFO: Page loaded successfully', '/about', 200),
+    ('INFO: User registered', '/register', 201),
+    ('INFO: User profile updated', '/profile', 200),
+    ('INFO: User settings saved', '/settings', 200),
+    ('INFO: Data retrieved successfully', '/data', 200),
+    ('INFO: User session expired', '/logout', 200),
+    ('WARNING: Multiple failed login attempts', '/login', 401),
+    ('WARNING: Suspicious login attempt', '/login', 401),
+    ('WARNING: Incomplete form submission', '/submit', 400),
+    ('WARNING: Unresponsive server detected', '/status', 503),
+    ('ERROR: File not found', '/file', 404),
+    ('ERROR: Database connection lost', '/data', 503),
+    ('ERROR: Critical error in module', '/module', 500),
+    ('ERROR: Server overload', '/api', 503),
+)
+LOG_START_TIME = datetime(2020, 1, 1)
+
+
+class DataGenerator:
+    """
+    Seeded source of benchmark data, the same seed always yields the
+    same keys, values and logs, so runs on different commits compare.
+    """
+
+    # Attributes
+    seed: int
+
+    def __init__(self, seed: int = 0):
+        self.seed = seed
+        self._random = random.Random(seed)
+
+    def get_word(self, min_length: int = 5, max_length: int = 26) -> str:
+        length = self._random.randint(min_length, max_length)
+        return ''.join(self._random.choices(string.ascii_letters, k=length))
+
+    def get_keys(self, count: int, prefix: str = 'KEY_') -> List[str]:
+        """
+        'count' distinct keys, like the ones of the functional tests.
+        """
+        keys = set()
+        while len(keys) < count:
+            keys.add(prefix + self.get_word())
+        return sorted(keys)
+
+    def get_items(self, count: int) -> List[Tuple[str, int]]:
+        return [(key, self._random.randint(0, 999999)) for key in self.get_keys(count)]
+
+    def get_log_lines(self, count: int) -> List[str]:
+        """
+        Lines in the format of the sample log, a few seconds apart.
+        """
+        log_lines = []
+        timestamp = LOG_START_TIME
+        for _ in range(count):
+            timestamp += timedelta(seconds=self._random.randint(1, 30))
+            message, endpoint, status = self._random.choice(LOG_EVENTS)
+            user_id = ''.join(self._random.choices(string.ascii_letters + string.digits, k=8))
+            log_lines.append(f'{timestamp:%Y-%m-%d %H:%M:%S} | {message} | {user_id} | {endpoint} | {status}')
+        return log_lines
+
+    def write_log(self, file_path: str | Path, line_count: int) -> int:
+        """
+        Writes 'line_count' generated lines to 'file_path', returns its size.
+        """
+        content = '\n'.join(self.get_log_lines(line_count)) + '\n'
+        return Path(file_path).write_text(content)
@@ -0,0 +1,361 @@
+# src/benchmarks/suite.py
+import argparse
+import asyncio
+import itertools
+import json
+import os
+import platform
+import random
+import sys
+import tempfile
+import time
+import zlib
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable, Dict, List, Sequence, Tuple
+
+from apps.bloom_filter.bloom_filter import BloomFilter
+from apps.consistent_hashing.benchmarks import benchmark_partitioners
+from apps.consistent_hashing.consistent_hashing import HashNode, HashRing
+from apps.crdt.benchmarks import benchmark_crdts
+from apps.gossip_protocol.benchmarks import benchmark_simulator
+from apps.gossip_protocol.gossip_protocol import Coordinator
+from apps.map_reduce.benchmarks import benchmark_parsers
+from apps.map_reduce.executors import INLINE
+from apps.map_reduce.map_reduce import MapReduce
+from apps.merkle_tree.merkle_tree import MerkleTree
+from apps.raft.benchmarks import benchmark_raft
+
+from .generators import DataGenerator
+
+Metrics = Dict[str, float]
+
+# Metric name suffixes, other metrics are reported but never compared
+LOWER_IS_BETTER = ('_seconds', '_ms', '_us', '_ns', '_bytes')
+HIGHER_IS_BETTER = ('_per_second',)
+
+DEFAULT_TOLERANCE = 0.25
+DEFAULT_REPEAT = 3
+
+# Statuses of a metric compared against the baseline
+REGRESSION = 'regression'
+IMPROVEMENT = 'improvement'
+UNCHANGED = 'unchanged'
+
+
+def benchmark_bloom_filter(generator: DataGenerator, key_count: int) -> Metrics:
+    """
+    Insert and lookup latency, and the false positive rate at ten bits per key.
+    """
+    keys = generator.get_keys(2 * key_count)
+    inserted_keys, absent_keys = keys[::2], keys[1::2]
+    bloom_filter = BloomFilter(10 * key_count)
+
+    start_time = time.perf_counter()
+    [bloom_filter.insert(key, index) for index, key in enumerate(inserted_keys)]
+    insert_time = time.perf_counter() - start_time
+
+    start_time = time.perf_counter()
+    [key in bloom_filter for key in inserted_keys]
+    false_positives = sum(key in bloom_filter for key in absent_keys)
+    lookup_time = time.perf_counter() - start_time
+
+    return {
+        'insert_ns': insert_time / key_count * 1e9,
+        'lookup_ns': lookup_time / len(keys) * 1e9,
+        'false_positive_rate': false_positives / key_count,
+    }
+
+
+def benchmark_merkle_tree(generator: DataGenerator, key_count: int, bucket_count: int = 64) -> Metrics:
+    """
+    Insert latency, then diffing and replicating against a replica where
+    one value in a hundred differs.
+    """
+    items = [(zlib.crc32(key.encode()) % bucket_count, key, value) for key, value in generator.get_items(key_count)]
+    tree = MerkleTree(bucket_count, bucket_count)
+    replica = MerkleTree(bucket_count, bucket_count)
+
+    start_time = time.perf_counter()
+    [tree.insert(*item) for item in items]
+    insert_time = time.perf_counter() - start_time
+    [replica.insert(bucket, key, value + (index % 100 == 0)) for index, (bucket, key, value) in enumerate(items)]
+
+    start_time = time.perf_counter()
+    different_buckets = tree.get_different_buckets(replica)
+    diff_time = time.perf_counter() - start_time
+
+    start_time = time.perf_counter()
+    replica.replicate_from(tree)
+    replicate_time = time.perf_counter() - start_time
+
+    return {
+        'insert_ns': insert_time / key_count * 1e9,
+        'diff_us': diff_time * 1e6,
+        'replicate_us': replicate_time * 1e6,
+        'different_buckets': len(different_buckets),
+    }
+
+
+def benchmark_hash_ring(generator: DataGenerator, node_count: int, key_count: int) -> Metrics:
+    """
+    Batched and single key reads and writes on a ring of two replicas,
+    and the time to rebalance when one more node joins.
+    """
+    hash_ring = HashRing(replication_factor=2, virtual_nodes=16)
+    [hash_ring.add_node(HashNode(f'node-{index}')) for index in range(node_count)]
+    items = generator.get_items(key_count)
+    keys = [key for key, _ in items]
+    sample_keys = keys[:1000]
+
+    start_time = time.perf_counter()
+    hash_ring.set_many(items)
+    set_many_time = time.perf_counter() - start_time
+
+    start_time = time.perf_counter()
+    hash_ring.get_many(keys)
+    get_many_time = time.perf_counter() - start_time
+
+    start_time = time.perf_counter()
+    [hash_ring.get_data(key) for key in sample_keys]
+    get_time = time.perf_counter() - start_time
+
+    start_time = time.perf_counter()
+    hash_ring.add_node(HashNode(f'node-{node_count}'))
+    add_node_time = time.perf_counter() - start_time
+
+    return {
+        'set_many_ns': set_many_time / key_count * 1e9,
+        'get_many_ns': get_many_time / key_count * 1e9,
+        'get_ns': get_time / len(sample_keys) * 1e9,
+        'add_node_ms': add_node_time * 1e3,
+    }
+
+
+def benchmark_map_reduce(generator: DataGenerator, line_count: int) -> Metrics:
+    """
+    Single worker throughput on a generated log, inline so only the
+    parse, map, combine and reduce path is measured.
+    """
+    with tempfile.TemporaryDirectory() as directory:
+        log_path = Path(directory) / 'generated.log'
+        file_bytes = generator.write_log(log_path, line_count)
+
+        mapreduce = MapReduce(1, 1, backend=INLINE)
+        start_time = time.perf_counter()
+        mapreduce.process_log(str(log_path))
+        elapsed_time = time.perf_counter() - start_time
+
+    return {
+        'process_seconds': elapsed_time,
+        'lines_per_second': line_count / elapsed_time,
+        'megabytes_per_second': file_bytes / elapsed_time / 1024 ** 2,
+    }
+
+
+def benchmark_gossip(generator: DataGenerator, node_count: int) -> Metrics:
+    """
+    Rounds, wall time and traffic of the 'Coordinator' until every node
+    knows every other one, without delay between rounds.
+    """
+    # Peers are sampled from the global generator
+    random.seed(generator.seed)
+    coordinator = Coordinator(gossip_rate=0, max_rounds=100)
+    [coordinator.add() for _ in range(node_count)]
+
+    convergence = asyncio.run(coordinator.gossip_worker())
+
+    return {
+        'rounds': convergence['rounds'],
+        'converged': convergence['converged'],
+        'gossip_seconds': convergence['seconds'],
+        'gossip_bytes': coordinator.total_bytes,
+        'gossips_per_node': coordinator.total_gossips / node_count,
+    }
+
+
+# Workload -> (benchmark, parameter -> values to run it with)
+WORKLOADS: Dict[str, Tuple[Callable[..., Metrics], Dict[str, Sequence[int]]]] = {
+    'bloom_filter': (benchmark_bloom_filter, {'key_count': (1_000, 10_000)}),
+    'merkle_tree': (benchmark_merkle_tree, {'key_count': (1_000, 10_000)}),
+    'hash_ring': (benchmark_hash_ring, {'node_count': (8, 64), 'key_count': (10_000,)}),
+    'map_reduce': (benchmark_map_reduce, {'line_count': (10_000, 100_000)}),
+    'gossip': (benchmark_gossip, {'node_count': (32, 256)}),
+}
+
+# The benchmarks of every app, each already a set of named cases
+APP_BENCHMARKS: Dict[str, Callable[[], Dict[str, Metrics]]] = {
+    'consistent_hashing.partitioners': benchmark_partitioners,
+    'map_reduce.parsers': benchmark_parsers,
+    'crdt': lambda: benchmark_crdts((2, 8, 32)),
+    'gossip_protocol.simulator': lambda: benchmark_simulator((1_000, 10_000)),
+    'raft': lambda: benchmark_raft(proposal_count=500),
+}
+
+
+def get_cases(workloads: Sequence[str], parameters: Dict[str, Sequence[int]] | None = None) -> List[Tuple[str, Dict]]:
+    """
+    '(workload, arguments)' of every combination of parameter values,
+    values in 'parameters' replacing the defaults of every workload.
+    """
+    parameters = parameters or {}
+    cases = []
+    for workload in workloads:
+        _, grid = WORKLOADS[workload]
+        grid = {name: parameters.get(name, values) for name, values in grid.items()}
+        cases += [(workload, dict(zip(grid, values))) for values in itertools.product(*grid.values())]
+    return cases
+
+
+def get_case_name(workload: str, arguments: Dict) -> str:
+    return '/'.join([workload, *(f'{name}_{value}' for name, value in arguments.items())])
+
+
+def run_suite(
+    workloads: Sequence[str] = tuple(WORKLOADS),
+    parameters: Dict[str, Sequence[int]] | None = None,
+    seed: int = 0,
+    repeat: int = DEFAULT_REPEAT,
+    app_benchmarks: Sequence[str] = (),
+) -> Dict:
+    """
+    Runs every case of 'workloads' 'repeat' times on the same generated
+    data, keeping the best value of every compared metric, then the
+    'app_benchmarks' once.
+    """
+    _perform_validations(workloads, app_benchmarks, repeat)
+
+    results = {}
+    for workload, arguments in get_cases(workloads, parameters):
+        benchmark, _ = WORKLOADS[workload]
+        runs = [benchmark(DataGenerator(seed), **arguments) for _ in range(repeat)]
+        results[get_case_name(workload, arguments)] = _get_best_metrics(runs)
+
+    for name in app_benchmarks:
+        for case_name, metrics in APP_BENCHMARKS[name]().items():
+            results[f'{name}/{case_name}'] = metrics
+
+    return {
+        'metadata': {
+            'created_at': datetime.now(timezone.utc).isoformat(),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'seed': seed,
+            'repeat': repeat,
+        },
+        'results': results,
+    }
+
+
+def compare_results(results: Dict, baseline: Dict, tolerance: float = DEFAULT_TOLERANCE) -> List[Dict]:
+    """
+    Compares every metric of a case present in both runs, changes beyond
+    'tolerance', a share of the baseline value, are regressions or
+    improvements depending on the metric's direction.
+    """
+    comparisons = []
+    baseline_results = baseline['results']
+    for case_name, metrics in results['results'].items():
+        baseline_metrics = baseline_results.get(case_name, {})
+        for metric, value in metrics.items():
+            baseline_value = baseline_metrics.get(metric)
+            direction = _get_direction(metric)
+            if baseline_value is None or direction == 0 or not baseline_value:
+                continue
+
+            change = (value - baseline_value) / abs(baseline_value)
+            if change * direction > tolerance:
+                status = REGRESSION
+            elif change * direction < -tolerance:
+                status = IMPROVEMENT
+            else:
+                status = UNCHANGED
+            comparisons.append({
+                'case': case_name,
+                'metric': metric,
+                'baseline': baseline_value,
+                'value': value,
+                'change': change,
+                'status': status,
+            })
+
+    return comparisons
+
+
+def _get_direction(metric: str) -> int:
+    """
+    1 when a higher value is worse, -1 when it is better, 0 if not compared.
+    """
+    if metric.endswith(HIGHER_IS_BETTER):
+        return -1
+    if metric.endswith(LOWER_IS_BETTER):
+        return 1
+    return 0
+
+
+def _get_best_metrics(runs: List[Metrics]) -> Metrics:
+    best_metrics = dict(runs[-1])
+    for metric in best_metrics:
+        direction = _get_direction(metric)
+        if direction:
+            values = [run[metric] for run in runs]
+            best_metrics[metric] = min(values) if direction > 0 else max(values)
+    return best_metrics
+
+
+def _perform_validations(workloads: Sequence[str], app_benchmarks: Sequence[str], repeat: int):
+    unknown_names = (set(workloads) - WORKLOADS.keys()) | (set(app_benchmarks) - APP_BENCHMARKS.keys())
+    if unknown_names:
+        error_message = f'Unknown benchmarks: {sorted(unknown_names)}. Use any of {[*WORKLOADS, *APP_BENCHMARKS]}'
+        raise ValueError(error_message)
+
+    if repeat < 1:
+        error_message = f'Every case must run at least once, got {repeat}'
+        raise ValueError(error_message)
+
+
+if __name__ == '__main__':
+    import django
+
+    # Ring positions are salted with the secret key
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings.local')
+    django.setup()
+
+    parser = argparse.ArgumentParser(description='Benchmark suite of every primitive, compared against a baseline.')
+    parser.add_argument('--workloads', nargs='+', choices=WORKLOADS, default=list(WORKLOADS))
+    parser.add_argument('--keys', type=int, nargs='+', help='Key counts')
+    parser.add_argument('--nodes', type=int, nargs='+', help='Node counts')
+    parser.add_argument('--lines', type=int, nargs='+', help='Log line counts')
+    parser.add_argument('--apps', nargs='*', choices=APP_BENCHMARKS, default=[], help='App benchmarks to include')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--repeat', type=int, default=DEFAULT_REPEAT)
+    parser.add_argument('--output', help='Where to save the results, e.g. as the next baseline')
+    parser.add_argument('--baseline', help='Results to compare against, exits with 1 on regressions')
+    parser.add_argument('--tolerance', type=float, default=DEFAULT_TOLERANCE)
+    arguments = parser.parse_args()
+
+    parameter_flags = {'key_count': arguments.keys, 'node_count': arguments.nodes, 'line_count': arguments.lines}
+    suite_results = run_suite(
+        arguments.workloads,
+        {name: values for name, values in parameter_flags.items() if values},
+        arguments.seed,
+        arguments.repeat,
+        arguments.apps,
+    )
+    if arguments.output:
+        Path(arguments.output).write_text(json.dumps(suite_results, indent=2))
+    else:
+        print(json.dumps(suite_results, indent=2))
+
+    if arguments.baseline:
+        suite_comparisons = compare_results(
+            suite_results, json.loads(Path(arguments.baseline).read_text()), arguments.tolerance
+        )
+        regressions = [comparison for comparison in suite_comparisons if comparison['status'] == REGRESSION]
+        for comparison in regressions:
+            print(
+                f"Regression in {comparison['case']} {comparison['metric']}: "
+                f"{comparison['baseline']:.4g} -> {comparison['value']:.4g} ({comparison['change']:+.1%})",
+                file=sys.stderr,
+            )
+        sys.exit(1 if regressions else 0)
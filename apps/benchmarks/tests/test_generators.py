@@ -0,0 +1,37 @@
+import tempfile
+from pathlib import Path
+
+from django.test import TestCase
+
+from apps.map_reduce.parsers import LogLineParser
+
+from ..generators import DataGenerator
+
+
+class TestSuite(TestCase):
+    def test_should_generate_the_same_data_for_a_seed(self):
+        # Do
+        items = DataGenerator(seed=7).get_items(100)
+        same_items = DataGenerator(seed=7).get_items(100)
+        other_items = DataGenerator(seed=8).get_items(100)
+
+        # Assert
+        assert items == same_items
+        assert items != other_items
+        assert len({key for key, _ in items}) == 100
+
+    def test_should_generate_parsable_logs(self):
+        # Build test data
+        parser = LogLineParser()
+
+        with tempfile.TemporaryDirectory() as directory:
+            log_path = Path(directory) / 'generated.log'
+
+            # Do
+            file_bytes = DataGenerator().write_log(log_path, 50)
+            log_lines = log_path.read_text().splitlines()
+
+            # Assert
+            assert file_bytes == log_path.stat().st_size
+            assert len(log_lines) == 50
+            assert all(parser.parse(log_line) for log_line in log_lines)
@@ -0,0 +1,46 @@
+from django.test import TestCase
+
+from ..suite import IMPROVEMENT, REGRESSION, UNCHANGED, WORKLOADS, compare_results, get_cases, run_suite
+
+
+class TestSuite(TestCase):
+    def test_should_run_every_workload(self):
+        # Do
+        suite_results = run_suite(
+            parameters={'key_count': [200], 'node_count': [8], 'line_count': [200]}, repeat=2
+        )
+
+        # Assert
+        results = suite_results['results']
+        assert len(results) == len(WORKLOADS)
+        assert results['hash_ring/node_count_8/key_count_200']['set_many_ns'] > 0
+        assert results['gossip/node_count_8']['converged']
+        assert suite_results['metadata']['repeat'] == 2
+
+    def test_should_expand_parameter_grids(self):
+        # Do
+        cases = get_cases(['hash_ring', 'bloom_filter'], {'node_count': [4, 8]})
+
+        # Assert
+        assert cases == [
+            ('hash_ring', {'node_count': 4, 'key_count': 10_000}),
+            ('hash_ring', {'node_count': 8, 'key_count': 10_000}),
+            ('bloom_filter', {'key_count': 1_000}),
+            ('bloom_filter', {'key_count': 10_000}),
+        ]
+
+    def test_should_compare_against_baseline(self):
+        # Build test data
+        baseline = {'results': {'case': {'lookup_ns': 100, 'keys_per_second': 1000, 'add_ms': 10, 'rounds': 3}}}
+        results = {'results': {'case': {'lookup_ns': 150, 'keys_per_second': 2000, 'add_ms': 11, 'rounds': 9}}}
+
+        # Do
+        comparisons = compare_results(results, baseline, tolerance=0.2)
+
+        # Assert
+        statuses = {comparison['metric']: comparison['status'] for comparison in comparisons}
+        assert statuses == {'lookup_ns': REGRESSION, 'keys_per_second': IMPROVEMENT, 'add_ms': UNCHANGED}
+
+    def test_should_not_allow_unknown_workloads(self):
+        with self.assertRaises(ValueError):
+            run_suite(['unknown'])
@@ -0,0 +1,81 @@
+# src/consistent_hashing/benchmarks.py
+import json
+import os
+import statistics
+import time
+import tracemalloc
+from collections import Counter
+from typing import Callable, Dict
+
+from .consistent_hashing import HashNode
+from .partitioners import (
+    JumpHashPartitioner,
+    MaglevPartitioner,
+    Partitioner,
+    RendezvousPartitioner,
+    RingPartitioner,
+)
+from .utils import h
+
+PARTITIONERS: Dict[str, Callable[[], Partitioner]] = {
+    'ring': RingPartitioner,
+    'ring_virtual_nodes': lambda: RingPartitioner(virtual_nodes=64),
+    'jump': JumpHashPartitioner,
+    'rendezvous': RendezvousPartitioner,
+    'maglev': MaglevPartitioner,
+}
+
+
+def benchmark_partitioners(node_count: int = 50, key_count: int = 10000) -> Dict[str, Dict[str, float]]:
+    """
+    Compares every partitioner on lookup latency, memory used by its
+    lookup structures, load balance across nodes and the share of keys
+    that change owner when one more node joins.
+    """
+    nodes = [HashNode(f'node-{index}') for index in range(node_count)]
+    hashed_keys = [h(f'key-{index}') for index in range(key_count)]
+    mean_load = key_count / node_count
+
+    results = {}
+    for name, partitioner_factory in PARTITIONERS.items():
+        # Memory, including structures built lazily on first lookup
+        tracemalloc.start()
+        partitioner = partitioner_factory()
+        [partitioner.add_node(node) for node in nodes]
+        partitioner.get_nodes(hashed_keys[0], 1)
+        memory_bytes, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        # Lookup latency
+        start_time = time.perf_counter()
+        owners = [partitioner.get_nodes(hashed_key, 1)[0] for hashed_key in hashed_keys]
+        elapsed_time = time.perf_counter() - start_time
+
+        # Balance
+        loads = Counter(owners)
+        node_loads = [loads.get(node, 0) for node in nodes]
+
+        # Key movement on membership change
+        partitioner.add_node(HashNode(f'node-{node_count}'))
+        moved_keys = sum(
+            1 for hashed_key, owner in zip(hashed_keys, owners) if partitioner.get_nodes(hashed_key, 1)[0] is not owner
+        )
+
+        results[name] = {
+            'lookup_ns': elapsed_time / key_count * 1e9,
+            'memory_bytes': memory_bytes,
+            'max_load_ratio': max(node_loads) / mean_load,
+            'load_stddev_ratio': statistics.pstdev(node_loads) / mean_load,
+            'moved_keys_ratio': moved_keys / key_count,
+            'ideal_moved_keys_ratio': 1 / (node_count + 1),
+        }
+
+    return results
+
+
+if __name__ == '__main__':
+    import django
+
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings.local')
+    django.setup()
+    print(json.dumps(benchmark_partitioners(), indent=2))
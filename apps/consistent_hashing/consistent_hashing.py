@@ -1,6 +1,13 @@
 # src/consistent_hashing/consistent_hashing.py
-from typing import List, Dict, Tuple
-
+import itertools
+import math
+import threading
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Callable, List, Dict, Tuple
+
+from .partitioners import Partitioner, RingPartitioner
+from .rebalancer import MigrationPlan
 from .utils import h
 
 
@@ -9,6 +16,7 @@ class HashNode:
     uid: int | str
     huid: str
     data: Dict[str, int]
+    available: bool
 
     # Limits
     MAX_KEYS: int = 100000
@@ -18,6 +26,7 @@ class HashNode:
         self.id = uid
         self.huid = h(uid)
         self.data = {}
+        self.available = True
 
     def __lt__(self, other) -> bool:
         return self.huid < other.huid
@@ -37,6 +46,9 @@ class HashNode:
     def get_all_data(self) -> List[Tuple[str, int]]:
         return list(self.data.items())
 
+    def contains_data(self, key: str) -> bool:
+        return key in self.data
+
     def retrieve_data(self, key) -> int | None:
         self._perform_retrieve_validations(key)
         return self.data.get(key)
@@ -46,15 +58,41 @@ class HashNode:
         self.data[key] = value
         return True
 
+    def retrieve_many(self, keys: List[str]) -> Dict[str, int]:
+        """
+        Returns the subset of 'keys' held by this node.
+        Missing keys are left out instead of raising.
+        """
+        self._perform_availability_validations()
+        return {key: self.data[key] for key in keys if key in self.data}
+
+    def store_many(self, items: List[Tuple[str, int]], override: bool = False) -> bool:
+        """
+        Stores a batch of data, validating all of it first
+        so that the batch is either fully stored or not at all.
+        """
+        self._perform_store_many_validations(items, override)
+        self.data.update(items)
+        return True
+
     def delete_data(self, key: str):
         del self.data[key]
 
+    def _perform_availability_validations(self) -> None:
+        if not self.available:
+            error_message = f"Node {self.id} is not available"
+            raise ConnectionError(error_message)
+
     def _perform_retrieve_validations(self, key: str) -> None:
+        self._perform_availability_validations()
+
         if key not in self.data:
             error_message = f"Node {self.id} does not contain key: {key}"
             raise KeyError(error_message)
 
     def _perform_store_validations(self, key: str, override=False) -> None:
+        self._perform_availability_validations()
+
         if len(self.data) >= self.MAX_KEYS:
             error_message = (
                 f"Node {self.id} reached maximum key count ({self.MAX_KEYS})"
@@ -65,17 +103,72 @@ class HashNode:
             error_message = f"Node {self.id} already contains key: {key}"
             raise KeyError(error_message)
 
+    def _perform_store_many_validations(self, items: List[Tuple[str, int]], override=False) -> None:
+        self._perform_availability_validations()
+
+        new_keys = [key for key, _ in items if key not in self.data]
+        if len(self.data) + len(new_keys) > self.MAX_KEYS:
+            error_message = (
+                f"Node {self.id} reached maximum key count ({self.MAX_KEYS})"
+            )
+            raise ValueError(error_message)
+
+        for key, _ in items:
+            if not override and key in self.data:
+                error_message = f"Node {self.id} already contains key: {key}"
+                raise KeyError(error_message)
+
 
 class HashRing:
     # Attributes
     node_list: List[HashNode]
+    partitioner: Partitioner
+    executor: ThreadPoolExecutor | None
+    lock: threading.RLock  # Serializes writes with membership cutovers
+    spill_distances: Counter  # Nodes skipped before placing a key -> key count
+    total_load: int  # Copies held by the ring's nodes, kept as writes land instead of summing every node
+    max_probe_depth: int  # No copy sits deeper in its key's probe order, bounds the search for stale copies
+    load_lock: threading.Lock  # Guards 'total_load'
+
+    # Tunable Config
+    replication_factor: int
+    write_quorum: int
+    read_quorum: int
+    load_factor: float | None  # Bounded loads capacity factor 'c', disabled if None
 
     # Limits
     MAX_NODES: int = 100
     MIN_NODES: int = 0
-
-    def __init__(self):
+    MAX_WORKERS: int = 8
+
+    def __init__(
+        self,
+        replication_factor: int = 1,
+        write_quorum: int | None = None,
+        read_quorum: int | None = None,
+        virtual_nodes: int = 1,
+        partitioner: Partitioner | None = None,
+        load_factor: float | None = None,
+    ):
         self.node_list = []
+        # Classic ring unless another key to node mapping is plugged in
+        self.partitioner = partitioner if partitioner is not None else RingPartitioner(virtual_nodes)
+        self.replication_factor = replication_factor
+        # Default to majority quorums, so that 'R + W > N'
+        majority = replication_factor // 2 + 1
+        self.write_quorum = write_quorum if write_quorum is not None else majority
+        self.read_quorum = read_quorum if read_quorum is not None else majority
+        self.load_factor = load_factor
+        self.spill_distances = Counter()
+        self.total_load = 0
+        self.max_probe_depth = 0
+        self._perform_config_validations()
+
+        # Created on first parallel call, single copies are called inline
+        self.executor = None
+        self.lock = threading.RLock()
+        # Replica writes may still land on executor threads once the quorum is reached
+        self.load_lock = threading.Lock()
 
     def get_node_count(self) -> int:
         return len(self.node_list)
@@ -83,72 +176,438 @@ class HashRing:
     def add_node(self, node: HashNode) -> bool:
         """
         Adds a 'HashNode' to this consistent hashing ring.
-        NOTE: First implementation using 'List',
-              improve with binary tree.
+        Data is migrated from the nodes the partitioner reports as
+        affected, for the classic ring those are the ones that follow
+        each of the new virtual nodes.
         """
         self._perform_validations(node)
 
         self.node_list.append(node)
         self.node_list.sort()
+        self.partitioner.add_node(node)
+        self._add_load(node.get_data_count())
+        # Every other node moves at most one position down the probe orders
+        self.max_probe_depth += 1
 
-        # Find next sequential clockwise node
-        try:
-            next_node_index: int = self.node_list.index(node) + 1
-            next_node: HashNode = self.node_list[next_node_index]
-        except IndexError:
-            next_node: HashNode = self.node_list[0]
-
-        # Migrate all corresponding data
-        for next_node_key, next_node_value in next_node.get_all_data():
-            if h(next_node_key) < node.huid:
-                node.store_data(next_node_key, next_node_value)
-                next_node.delete_data(next_node_key)
+        # Find next sequential clockwise nodes and migrate corresponding data
+        affected_nodes = self.partitioner.find_affected_nodes(node, self.replication_factor, predecessors=False)
+        self._rebalance(affected_nodes)
 
         return True
 
     def remove_node(self, node: HashNode) -> bool:
-        # Find next sequential clockwise node
-        try:
-            next_node_index = self.node_list.index(node) + 1
-            next_node = self.node_list[next_node_index]
-        except IndexError:
-            next_node = self.node_list[0]
-
-        # Migrate all data and free memory
-        [next_node.store_data(k, v) for k, v in node.get_all_data()]
+        """
+        Removes a 'HashNode' from this consistent hashing ring.
+        Its data is handed over to the next clockwise nodes. If the
+        node is no longer available, lost copies are restored from the
+        remaining replicas instead. Partitioners that reshuffle other
+        keys on removal also rebalance the affected nodes.
+        """
         self.node_list.remove(node)
+        self._add_load(-node.get_data_count())
+
+        # Ideally only the node's own keys change owners, fall back to its neighbours' copies if it is gone
+        affected_nodes = [node]
+        if not node.available or not self.partitioner.MINIMAL_DISRUPTION:
+            affected_nodes += self.partitioner.find_affected_nodes(node, self.replication_factor, predecessors=True)
+
+        self.partitioner.remove_node(node)
+        self._rebalance(affected_nodes)
 
         return True
 
-    def get_data(self, data_key: str) -> int:
+    def plan_changes(self, add: List[HashNode] | None = None, remove: List[HashNode] | None = None) -> MigrationPlan:
+        """
+        Computes the key range transfers needed to add and remove a batch
+        of nodes at once, without moving any data. Hand the plan to a
+        'RebalanceExecutor' to stream it and switch membership.
+        Only supported for the classic ring without bounded loads.
+        """
+        add = add or []
+        remove = remove or []
+        self._perform_plan_validations(add, remove)
+
+        new_partitioner = self.partitioner.clone()
+        [new_partitioner.remove_node(node) for node in remove]
+        [new_partitioner.add_node(node) for node in add]
+        return MigrationPlan(self.partitioner, new_partitioner, self.replication_factor, add, remove)
+
+    def apply_plan(self, plan: MigrationPlan) -> None:
+        """
+        Switches to the membership of an already streamed 'plan'.
+        """
+        with self.lock:
+            self.partitioner = plan.new_partitioner
+            self.node_list = sorted(plan.new_partitioner.node_list)
+            # Streamed transfers wrote to the nodes directly
+            self.recount_load()
+
+    def recount_load(self) -> None:
+        """
+        Recounts 'total_load' from every node, after their data was
+        changed without going through the ring.
+        """
+        with self.load_lock:
+            self.total_load = sum(node.get_data_count() for node in self.node_list)
+
+    def preference_list(self, data_key: str) -> List[HashNode]:
+        """
+        Returns the distinct physical nodes responsible for 'data_key'.
+        The first one is the coordinator. With bounded loads the key
+        may have spilled over to the nodes that follow them.
+        """
+        return self.partitioner.get_nodes(h(data_key), self.replication_factor)
+
+    def get_data(self, data_key: str, read_quorum: int | None = None) -> int:
         """
-        Get data from appropriate node in ring.
-        Raises 'KeyError' if key is not in any node.
+        Get data from appropriate nodes in ring.
+        Returns as soon as 'read_quorum' replicas answered.
+        Raises 'KeyError' if key is not in enough nodes.
         """
         hashed_data_key = h(data_key)
-        node = self._find_node(hashed_data_key)
-        return node.retrieve_data(data_key)
+        nodes = self._find_read_nodes(hashed_data_key, data_key)
+        if len(nodes) == 1:
+            return nodes[0].retrieve_data(data_key)
 
-    def set_data(self, data_key: str, data_value: int) -> bool:
+        quorum = read_quorum if read_quorum is not None else self.read_quorum
+        if len(nodes) < min(quorum, len(self.node_list)):
+            error_message = f"Not enough replicas contain key: {data_key}"
+            raise KeyError(error_message)
+
+        values = self._call_replicas(HashNode.retrieve_data, nodes, quorum, data_key)
+        return values[0]
+
+    def set_data(self, data_key: str, data_value: int, write_quorum: int | None = None) -> bool:
         """
-        Store data in appropriate node in ring.
+        Store data in appropriate nodes in ring.
+        Succeeds once 'write_quorum' replicas acknowledged the write.
+        With bounded loads, full nodes are skipped for the next ones.
         Raises 'ValueError' if corresponding node reached its max data limit.
         Raise 'KeyError' if 'override=False' and key already exists in node.
         """
         hashed_data_key = h(data_key)
-        node = self._find_node(hashed_data_key)
-        return node.store_data(data_key, data_value)
+        with self.lock:
+            nodes = self._find_write_nodes(hashed_data_key, data_key)
+            if len(nodes) == 1:
+                return self._store_copy(nodes[0], data_key, data_value)
+
+            quorum = write_quorum if write_quorum is not None else self.write_quorum
+            self._call_replicas(self._store_copy, nodes, quorum, data_key, data_value)
+        return True
+
+    def get_many(
+        self, data_keys: List[str], read_quorum: int | None = None, concurrent: bool = False
+    ) -> Dict[str, int]:
+        """
+        Get a batch of data with one call per node instead of one per key.
+        Nodes can optionally be queried concurrently.
+        Raises 'KeyError' if any key is not in enough nodes.
+        """
+        node_batches = self._group_by_nodes(data_keys, for_write=False)
+        quorum = read_quorum if read_quorum is not None else self.read_quorum
+        quorum = min(quorum, len(self.node_list))
+
+        values = {}
+        answers = dict.fromkeys(data_keys, 0)
+        for _, result in self._call_batches(HashNode.retrieve_many, node_batches, concurrent):
+            if isinstance(result, Exception):
+                continue
+            values.update(result)
+            for key in result:
+                answers[key] += 1
+
+        missing_keys = [key for key, count in answers.items() if count < quorum]
+        if missing_keys:
+            error_message = f"Not enough replicas contain keys: {missing_keys}"
+            raise KeyError(error_message)
+
+        return values
+
+    def set_many(
+        self,
+        items: Dict[str, int] | List[Tuple[str, int]],
+        write_quorum: int | None = None,
+        concurrent: bool = False,
+    ) -> bool:
+        """
+        Store a batch of data with one call per node instead of one per key.
+        Nodes can optionally be written concurrently, each node's batch
+        is stored or rejected as a whole.
+        Raises the first node error if any key was not acknowledged
+        by enough replicas.
+        """
+        values = dict(items)
+        quorum = write_quorum if write_quorum is not None else self.write_quorum
+        quorum = min(quorum, len(self.node_list))
+
+        errors = []
+        acknowledgements = dict.fromkeys(values, 0)
+        with self.lock:
+            key_batches = self._group_by_nodes(list(values), for_write=True)
+            node_batches = {node: [(key, values[key]) for key in keys] for node, keys in key_batches.items()}
+            for node, result in self._call_batches(HashNode.store_many, node_batches, concurrent):
+                if isinstance(result, Exception):
+                    errors.append(result)
+                    continue
+                self._add_load(len(key_batches[node]))
+                for key in key_batches[node]:
+                    acknowledgements[key] += 1
+
+        if any(count < quorum for count in acknowledgements.values()):
+            raise errors[0]
+
+        return True
+
+    def get_spill_metrics(self) -> Dict:
+        """
+        Summarizes how far writes spilled past their preferred node
+        because of bounded loads.
+        """
+        placed_keys = sum(self.spill_distances.values())
+        spilled_keys = placed_keys - self.spill_distances[0]
+        total_distance = sum(distance * count for distance, count in self.spill_distances.items())
+        return {
+            'placed_keys': placed_keys,
+            'spilled_keys': spilled_keys,
+            'spilled_ratio': spilled_keys / placed_keys if placed_keys else 0.0,
+            'mean_distance': total_distance / placed_keys if placed_keys else 0.0,
+            'max_distance': max(self.spill_distances, default=0),
+            'histogram': dict(sorted(self.spill_distances.items())),
+        }
+
+    def _group_by_nodes(self, data_keys: List[str], for_write: bool) -> Dict[HashNode, List[str]]:
+        """
+        Splits a batch of keys by the nodes of their preference lists.
+        Keys are hashed once and sorted, so the classic ring can match
+        them against its positions in a single merged pass. Bounded
+        loads place keys one at a time against the batch's capacity.
+        """
+        hashed_keys = sorted((h(key), key) for key in data_keys)
+        if self.load_factor is None:
+            return self.partitioner.group_by_nodes(hashed_keys, self.replication_factor)
+
+        node_batches = {}
+        loads = {node: node.get_data_count() for node in self.node_list}
+        capacity = self._get_capacity(len(hashed_keys))
+        for hashed_key, key in hashed_keys:
+            if for_write:
+                nodes = self._find_write_nodes(hashed_key, key, loads, capacity)
+            else:
+                nodes = self._find_read_nodes(hashed_key, key)
+            for node in nodes:
+                node_batches.setdefault(node, []).append(key)
+        return node_batches
+
+    def _find_read_nodes(self, hashed_key: str, data_key: str) -> List[HashNode]:
+        """
+        Returns the nodes holding 'data_key'. With bounded loads they are
+        found by following the same probe order used when writing it.
+        """
+        if self.load_factor is None:
+            return self.partitioner.get_nodes(hashed_key, self.replication_factor)
+
+        nodes = []
+        for node in self.partitioner.iter_nodes(hashed_key):
+            if node.contains_data(data_key):
+                nodes.append(node)
+                if len(nodes) == self.replication_factor:
+                    break
+        return nodes
+
+    def _find_write_nodes(
+        self,
+        hashed_key: str,
+        data_key: str,
+        loads: Dict[HashNode, int] | None = None,
+        capacity: int | None = None,
+        record: bool = True,
+    ) -> List[HashNode]:
+        """
+        Returns the nodes that should hold 'data_key'. With bounded loads,
+        nodes that are at capacity and don't hold the key yet are skipped,
+        and 'loads' is updated with the chosen nodes.
+        Raises 'ValueError' if every node is full.
+        """
+        if self.load_factor is None:
+            return self.partitioner.get_nodes(hashed_key, self.replication_factor)
+
+        if loads is None:
+            # A single write only reads the loads of the nodes it probes
+            loads = {}
+            capacity = self._get_capacity(1)
+
+        nodes = []
+        skipped_nodes = 0
+        for depth, node in enumerate(self.partitioner.iter_nodes(hashed_key)):
+            if node.contains_data(data_key):
+                nodes.append(node)
+            elif loads.setdefault(node, node.get_data_count()) < capacity:
+                nodes.append(node)
+                loads[node] += 1
+            elif not nodes:
+                skipped_nodes += 1
+            if len(nodes) == self.replication_factor:
+                break
+
+        if not nodes:
+            error_message = f"Every node reached its maximum key count ({capacity})"
+            raise ValueError(error_message)
+
+        self.max_probe_depth = max(self.max_probe_depth, depth)
+
+        if record:
+            self.spill_distances[skipped_nodes] += 1
+        return nodes
+
+    def _get_capacity(self, new_keys: int) -> int:
+        """
+        Bounded loads capacity, 'c' times the average load once
+        'new_keys' are stored, never above a node's own limit.
+        """
+        total_load = self.total_load + new_keys * self.replication_factor
+        average_load = total_load / len(self.node_list)
+        return min(HashNode.MAX_KEYS, math.ceil(self.load_factor * average_load))
+
+    def _call_batches(
+        self, method: Callable, node_batches: Dict[HashNode, List], concurrent: bool
+    ) -> List[Tuple[HashNode, object]]:
+        """
+        Calls 'method' once per node with its batch, optionally in parallel.
+        Returns '(node, result)' pairs, where the result of a failed call
+        is the raised error.
+        """
+        results = []
+        if not concurrent:
+            for node, batch in node_batches.items():
+                try:
+                    results.append((node, method(node, batch)))
+                except (KeyError, ValueError, ConnectionError) as error:
+                    results.append((node, error))
+            return results
+
+        futures = {self._get_executor().submit(method, node, batch): node for node, batch in node_batches.items()}
+        for future in as_completed(futures):
+            try:
+                results.append((futures[future], future.result()))
+            except (KeyError, ValueError, ConnectionError) as error:
+                results.append((futures[future], error))
+        return results
+
+    def _call_replicas(self, method: Callable, nodes: List[HashNode], quorum: int, *args) -> List:
+        """
+        Calls 'method' on every replica in parallel and returns the
+        results of the first 'quorum' successful calls. Raises the first
+        error if not enough replicas succeeded.
+        """
+        quorum = min(quorum, len(nodes))
+        futures = [self._get_executor().submit(method, node, *args) for node in nodes]
+        results = []
+        errors = []
+        for future in as_completed(futures):
+            try:
+                results.append(future.result())
+            except (KeyError, ValueError, ConnectionError) as error:
+                errors.append(error)
+                continue
+            if len(results) >= quorum:
+                return results
+
+        raise errors[0]
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self.executor is None:
+            self.executor = ThreadPoolExecutor(max_workers=max(self.MAX_WORKERS, self.replication_factor))
+        return self.executor
+
+    def _rebalance(self, nodes: List[HashNode]) -> None:
+        """
+        Moves every key held by 'nodes' to its current preference list,
+        copying it to missing replicas and dropping it from nodes that
+        are no longer responsible for it.
+        """
+        loads = {ring_node: ring_node.get_data_count() for ring_node in self.node_list}
+        capacity = self._get_capacity(0) if self.load_factor is not None else None
+
+        for node in nodes:
+            if not node.available:
+                continue
+
+            in_ring = node in self.node_list
+            for key, value in node.get_all_data():
+                hashed_key = h(key)
+                preference_list = self._find_write_nodes(hashed_key, key, loads, capacity, record=False)
+                for replica in preference_list:
+                    if replica.available and not replica.contains_data(key):
+                        self._store_copy(replica, key, value)
+                if in_ring and node not in preference_list:
+                    node.delete_data(key)
+                    loads[node] -= 1
+                    self._add_load(-1)
+                if self.load_factor is not None:
+                    # Spilled copies may sit on nodes past the affected ones
+                    self._drop_stale_copies(hashed_key, key, preference_list, loads)
+
+    def _drop_stale_copies(
+        self, hashed_key: str, data_key: str, preference_list: List[HashNode], loads: Dict[HashNode, int]
+    ) -> None:
+        """
+        Deletes the copies of 'data_key' outside of its preference list.
+        Writes follow the probe order, so only its first 'max_probe_depth'
+        nodes can hold one, unless the partitioner reorders nodes on
+        membership changes.
+        """
+        candidates = self.node_list
+        if self.partitioner.MINIMAL_DISRUPTION:
+            candidates = itertools.islice(self.partitioner.iter_nodes(hashed_key), self.max_probe_depth + 1)
+
+        for ring_node in candidates:
+            if ring_node not in preference_list and ring_node.available and ring_node.contains_data(data_key):
+                ring_node.delete_data(data_key)
+                loads[ring_node] -= 1
+                self._add_load(-1)
+
+    def _store_copy(self, node: HashNode, data_key: str, data_value: int) -> bool:
+        node.store_data(data_key, data_value)
+        self._add_load(1)
+        return True
+
+    def _add_load(self, key_count: int) -> None:
+        with self.load_lock:
+            self.total_load += key_count
+
+    def _perform_config_validations(self):
+        if self.replication_factor < 1:
+            raise ValueError
+
+        if self.load_factor is not None and self.load_factor <= 1:
+            error_message = f"Load factor must be greater than 1, got {self.load_factor}"
+            raise ValueError(error_message)
+
+        for quorum in [self.write_quorum, self.read_quorum]:
+            if not 1 <= quorum <= self.replication_factor:
+                error_message = f"Quorum must be between 1 and {self.replication_factor}, got {quorum}"
+                raise ValueError(error_message)
+
+    def _perform_plan_validations(self, add: List[HashNode], remove: List[HashNode]):
+        if not isinstance(self.partitioner, RingPartitioner) or self.load_factor is not None:
+            error_message = "Migration plans need a ring partitioner without bounded loads"
+            raise NotImplementedError(error_message)
+
+        if len(self.node_list) + len(add) - len(remove) > self.MAX_NODES:
+            raise ValueError
+
+        for node in remove:
+            if node not in self.node_list:
+                error_message = f"Node {node.id} is not in the ring"
+                raise KeyError(error_message)
 
-    def _find_node(self, hashed_key: str) -> HashNode:
-        for node in self.node_list:
-            if hashed_key < node.huid:
-                return node
-        # Wrap around and return to complete clockwise search
-        return self.node_list[0]
+        for node in add:
+            if any(ring_node.huid == node.huid for ring_node in self.node_list):
+                raise KeyError
 
     def _perform_validations(self, node: HashNode):
         if len(self.node_list) >= self.MAX_NODES:
             raise ValueError
 
-        if node.huid in self.node_list:
+        if any(ring_node.huid == node.huid for ring_node in self.node_list):
             raise KeyError
@@ -0,0 +1,362 @@
+# src/consistent_hashing/partitioners.py
+import copy
+import heapq
+from array import array
+from bisect import bisect_left, bisect_right, insort
+from typing import Dict, Iterator, List, Set, Tuple
+
+from .utils import h
+
+UINT64_MASK = 0xFFFFFFFFFFFFFFFF
+
+
+def to_int(hashed_key: str) -> int:
+    """
+    Takes the first 64 bits of a hex digest as an integer key.
+    """
+    return int(hashed_key[:16], 16)
+
+
+def mix(value: int) -> int:
+    """
+    SplitMix64 finalizer, scrambles a 64-bit integer.
+    """
+    value = ((value ^ (value >> 30)) * 0xBF58476D1CE4E5B9) & UINT64_MASK
+    value = ((value ^ (value >> 27)) * 0x94D049BB133111EB) & UINT64_MASK
+    return value ^ (value >> 31)
+
+
+def jump_hash(key: int, bucket_count: int) -> int:
+    """
+    Jump Consistent Hash (Lamping & Veach).
+    Maps a 64-bit key to a bucket in '[0, bucket_count)' in O(log n) time
+    without any lookup structure.
+    """
+    bucket, jump = -1, 0
+    while jump < bucket_count:
+        bucket = jump
+        key = (key * 2862933555777941757 + 1) & UINT64_MASK
+        jump = int((bucket + 1) * ((1 << 31) / ((key >> 33) + 1)))
+    return bucket
+
+
+class Partitioner:
+    """
+    Maps hashed keys to the nodes responsible for them.
+    Subclasses keep their own lookup structures up to date
+    as nodes are added and removed.
+    """
+
+    # Attributes
+    node_list: List
+
+    # Constants
+    MINIMAL_DISRUPTION = False  # Only the keys of a leaving node change owners
+
+    def __init__(self) -> None:
+        self.node_list = []
+
+    def get_node_count(self) -> int:
+        return len(self.node_list)
+
+    def clone(self):
+        """
+        Returns a copy with its own lookup structures, sharing the nodes.
+        Used to plan membership changes without touching this one.
+        """
+        partitioner = copy.copy(self)
+        partitioner.node_list = list(self.node_list)
+        return partitioner
+
+    def add_node(self, node) -> None:
+        self.node_list.append(node)
+
+    def remove_node(self, node) -> None:
+        self.node_list.remove(node)
+
+    def get_nodes(self, hashed_key: str, count: int) -> List:
+        """
+        Returns up to 'count' distinct nodes responsible for 'hashed_key'.
+        The first one is the owner, the rest hold its replicas.
+        """
+        raise NotImplementedError
+
+    def iter_nodes(self, hashed_key: str) -> Iterator:
+        """
+        Yields every node once, in the order they would take over
+        'hashed_key'. Used to probe past full nodes.
+        """
+        yield from self.get_nodes(hashed_key, len(self.node_list))
+
+    def group_by_nodes(self, hashed_keys: List[Tuple[str, str]], count: int) -> Dict[object, List[str]]:
+        """
+        Splits a batch of '(hashed_key, key)' pairs, sorted by hash,
+        by the nodes responsible for them.
+        """
+        node_batches = {}
+        for hashed_key, key in hashed_keys:
+            for node in self.get_nodes(hashed_key, count):
+                node_batches.setdefault(node, []).append(key)
+        return node_batches
+
+    def find_affected_nodes(self, node, count: int, predecessors: bool) -> List:
+        """
+        Finds the nodes that may hold keys whose owners change
+        when 'node' joins or leaves. Without any locality every
+        other node may be affected.
+        """
+        return [other_node for other_node in self.node_list if other_node is not node]
+
+
+class RingPartitioner(Partitioner):
+    """
+    Classic consistent hashing ring. Every node is placed on the ring
+    at 'virtual_nodes' hashed positions and owns the keys that fall
+    before each of them, clockwise.
+    """
+
+    # Attributes
+    ring_positions: List[str]  # Sorted hashed positions of every virtual node
+    ring_nodes: Dict[str, object]  # Hashed position -> physical node
+
+    # Constants
+    MINIMAL_DISRUPTION = True
+
+    # Tunable Config
+    virtual_nodes: int
+
+    def __init__(self, virtual_nodes: int = 1) -> None:
+        super().__init__()
+        self.ring_positions = []
+        self.ring_nodes = {}
+        self.virtual_nodes = virtual_nodes
+
+    def clone(self):
+        partitioner = super().clone()
+        partitioner.ring_positions = list(self.ring_positions)
+        partitioner.ring_nodes = dict(self.ring_nodes)
+        return partitioner
+
+    def add_node(self, node) -> None:
+        super().add_node(node)
+        for position in self._get_node_positions(node):
+            insort(self.ring_positions, position)
+            self.ring_nodes[position] = node
+
+    def remove_node(self, node) -> None:
+        super().remove_node(node)
+        for position in self._get_node_positions(node):
+            self.ring_positions.remove(position)
+            del self.ring_nodes[position]
+
+    def get_nodes(self, hashed_key: str, count: int) -> List:
+        """
+        Walks clockwise from 'hashed_key' collecting up to 'count'
+        distinct physical nodes, skipping virtual nodes of nodes
+        that were already collected.
+        """
+        start_index = bisect_right(self.ring_positions, hashed_key)
+        return self._walk_ring(start_index, count)
+
+    def iter_nodes(self, hashed_key: str) -> Iterator:
+        # Lazy clockwise walk, most probes stop at the first node or two
+        start_index = bisect_right(self.ring_positions, hashed_key)
+        position_count = len(self.ring_positions)
+        seen_nodes = set()
+        for step in range(position_count):
+            node = self.ring_nodes[self.ring_positions[(start_index + step) % position_count]]
+            if node not in seen_nodes:
+                seen_nodes.add(node)
+                yield node
+
+    def group_by_nodes(self, hashed_keys: List[Tuple[str, str]], count: int) -> Dict[object, List[str]]:
+        """
+        Matches the sorted keys against the ring positions in a single
+        merged pass, walking the ring once per owning virtual node
+        instead of once per key.
+        """
+        position_count = len(self.ring_positions)
+
+        node_batches = {}
+        index = 0
+        preference_list = None
+        for hashed_key, key in hashed_keys:
+            if index < position_count and self.ring_positions[index] <= hashed_key:
+                # Advance to the next position strictly after this key
+                while index < position_count and self.ring_positions[index] <= hashed_key:
+                    index += 1
+                preference_list = None
+
+            if preference_list is None:
+                preference_list = self._walk_ring(index, count)
+
+            for node in preference_list:
+                node_batches.setdefault(node, []).append(key)
+
+        return node_batches
+
+    def find_affected_nodes(self, node, count: int, predecessors: bool) -> List:
+        """
+        Only the next 'count' distinct nodes after each of the node's
+        virtual nodes and, optionally, the ones before them can share
+        keys with it.
+        """
+        affected_nodes: Set = set()
+        for position in self._get_node_positions(node):
+            index = bisect_left(self.ring_positions, position)
+            affected_nodes.update(self._walk_ring(index + 1, count, exclude=node))
+            if predecessors:
+                affected_nodes.update(self._walk_ring(index - 1, count, exclude=node, direction=-1))
+        return sorted(affected_nodes)
+
+    def _walk_ring(self, start_index: int, count: int, exclude=None, direction: int = 1) -> List:
+        nodes = []
+        position_count = len(self.ring_positions)
+        count = min(count, len(self.node_list))
+        for step in range(position_count):
+            index = (start_index + direction * step) % position_count
+            node = self.ring_nodes[self.ring_positions[index]]
+            if node is not exclude and node not in nodes:
+                nodes.append(node)
+                if len(nodes) == count:
+                    break
+        return nodes
+
+    def _get_node_positions(self, node) -> List[str]:
+        # First virtual node sits on the node's own hashed id
+        return [node.huid] + [h(f"{node.id}#{index}") for index in range(1, self.virtual_nodes)]
+
+
+class JumpHashPartitioner(Partitioner):
+    """
+    Jump Consistent Hash over the node list used as bucket array.
+    Needs no memory besides the list itself. Removing a node moves
+    the last bucket into its slot, so only the keys of those two
+    buckets change owners.
+    """
+
+    def remove_node(self, node) -> None:
+        index = self.node_list.index(node)
+        last_node = self.node_list.pop()
+        if last_node is not node:
+            self.node_list[index] = last_node
+
+    def get_nodes(self, hashed_key: str, count: int) -> List:
+        bucket_count = len(self.node_list)
+        bucket = jump_hash(to_int(hashed_key), bucket_count)
+        # Replicas live in the following buckets
+        return [self.node_list[(bucket + step) % bucket_count] for step in range(min(count, bucket_count))]
+
+
+class RendezvousPartitioner(Partitioner):
+    """
+    Rendezvous or Highest Random Weight hashing. Every node scores
+    every key and the highest scores win, so lookups are O(n) but
+    only the keys of a leaving node ever move.
+    """
+
+    # Attributes
+    node_seeds: List[int]  # Aligned with 'node_list'
+
+    # Constants
+    MINIMAL_DISRUPTION = True
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.node_seeds = []
+
+    def clone(self):
+        partitioner = super().clone()
+        partitioner.node_seeds = list(self.node_seeds)
+        return partitioner
+
+    def add_node(self, node) -> None:
+        super().add_node(node)
+        self.node_seeds.append(to_int(node.huid))
+
+    def remove_node(self, node) -> None:
+        index = self.node_list.index(node)
+        del self.node_list[index]
+        del self.node_seeds[index]
+
+    def get_nodes(self, hashed_key: str, count: int) -> List:
+        key = to_int(hashed_key)
+        scores = [(mix(seed ^ key), index) for index, seed in enumerate(self.node_seeds)]
+        return [self.node_list[index] for _, index in heapq.nlargest(count, scores)]
+
+
+class MaglevPartitioner(Partitioner):
+    """
+    Maglev hashing. Every node fills slots of a prime sized lookup
+    table following its own permutation, which gives near perfect
+    balance and O(1) lookups. The table is rebuilt lazily on the first
+    lookup after a membership change.
+    """
+
+    # Attributes
+    lookup_table: array  # Slot -> index in 'node_list'
+    stale: bool
+
+    # Tunable Config
+    table_size: int
+
+    # Constants
+    DEFAULT_TABLE_SIZE = 65537
+
+    def __init__(self, table_size: int = DEFAULT_TABLE_SIZE) -> None:
+        super().__init__()
+        self.table_size = table_size
+        self.lookup_table = array('I')
+        self.stale = False
+
+    def add_node(self, node) -> None:
+        super().add_node(node)
+        self.stale = True
+
+    def remove_node(self, node) -> None:
+        super().remove_node(node)
+        self.stale = True
+
+    def get_nodes(self, hashed_key: str, count: int) -> List:
+        if self.stale:
+            self._populate()
+
+        # Replicas are the next distinct nodes found in the table
+        count = min(count, len(self.node_list))
+        slot = to_int(hashed_key) % self.table_size
+        nodes = []
+        while len(nodes) < count:
+            node = self.node_list[self.lookup_table[slot]]
+            if node not in nodes:
+                nodes.append(node)
+            slot = (slot + 1) % self.table_size
+        return nodes
+
+    def _populate(self) -> None:
+        """
+        Lets every node claim, in turn, the next free slot
+        of its '(offset, skip)' permutation until the table is full.
+        """
+        size = self.table_size
+        permutations = [
+            (int(node.huid[:16], 16) % size, int(node.huid[16:32], 16) % (size - 1) + 1)
+            for node in self.node_list
+        ]
+        next_steps = [0] * len(self.node_list)
+        table = [-1] * size
+
+        filled = 0
+        while filled < size and self.node_list:
+            for index, (offset, skip) in enumerate(permutations):
+                slot = (offset + next_steps[index] * skip) % size
+                while table[slot] >= 0:
+                    next_steps[index] += 1
+                    slot = (offset + next_steps[index] * skip) % size
+                table[slot] = index
+                next_steps[index] += 1
+                filled += 1
+                if filled == size:
+                    break
+
+        self.lookup_table = array('I', table if self.node_list else [])
+        self.stale = False
@@ -0,0 +1,298 @@
+# src/consistent_hashing/rebalancer.py
+import threading
+import time
+from typing import Callable, Dict, List, Set, Tuple
+
+from .partitioners import RingPartitioner
+from .utils import h
+
+# Hashed key range '(start, end]', wrapping around the ring when 'start >= end'
+KeyRange = Tuple[str, str]
+
+
+def in_ranges(hashed_key: str, key_ranges: List[KeyRange]) -> bool:
+    for start, end in key_ranges:
+        if start < end:
+            if start < hashed_key <= end:
+                return True
+        elif hashed_key > start or hashed_key <= end:
+            return True
+    return False
+
+
+def append_range(key_ranges: List[KeyRange], key_range: KeyRange) -> None:
+    # Merge with the previous range when contiguous on the ring
+    if key_ranges and key_ranges[-1][1] == key_range[0]:
+        key_ranges[-1] = (key_ranges[-1][0], key_range[1])
+    else:
+        key_ranges.append(key_range)
+
+
+class Transfer:
+    """
+    Copy of every key in 'key_ranges' from 'source' to 'target'.
+    """
+
+    # Attributes
+    source: object
+    target: object
+    key_ranges: List[KeyRange]
+    keys: List[str]  # Snapshot of the keys to stream, taken when scanning 'source'
+    copied_keys: int
+
+    def __init__(self, source, target) -> None:
+        self.source = source
+        self.target = target
+        self.key_ranges = []
+        self.keys = []
+        self.copied_keys = 0
+
+    def __str__(self) -> str:
+        return f"{self.source} -> {self.target} ({len(self.key_ranges)} ranges)"
+
+    def __repr__(self) -> str:
+        return self.__str__()
+
+    def contains(self, hashed_key: str) -> bool:
+        return in_ranges(hashed_key, self.key_ranges)
+
+    def scan(self) -> List[str]:
+        self.keys = [key for key, _ in self.source.get_all_data() if self.contains(h(key))]
+        return self.keys
+
+
+class MigrationPlan:
+    """
+    Key range transfers needed to go from the 'old' to the 'new' ring.
+    The union of both rings' positions splits the key space into segments
+    owned by the same preference list on each side, so every segment only
+    moves to the nodes that join its list, from the first old replica still
+    available. Contiguous segments with the same source and target are
+    merged into a single range.
+    """
+
+    # Attributes
+    old_partitioner: RingPartitioner
+    new_partitioner: RingPartitioner
+    replication_factor: int
+    add_nodes: List
+    remove_nodes: List
+    transfers: List[Transfer]
+    drops: Dict[object, List[KeyRange]]  # Ranges each remaining node stops being responsible for
+    lost_ranges: List[KeyRange]  # Ranges with no available old replica to copy from
+
+    def __init__(
+        self,
+        old_partitioner: RingPartitioner,
+        new_partitioner: RingPartitioner,
+        replication_factor: int,
+        add_nodes: List,
+        remove_nodes: List,
+    ) -> None:
+        self.old_partitioner = old_partitioner
+        self.new_partitioner = new_partitioner
+        self.replication_factor = replication_factor
+        self.add_nodes = add_nodes
+        self.remove_nodes = remove_nodes
+        self.transfers = []
+        self.drops = {}
+        self.lost_ranges = []
+        self._plan()
+
+    def get_transfer_count(self) -> int:
+        return len(self.transfers)
+
+    def get_range_count(self) -> int:
+        return sum(len(transfer.key_ranges) for transfer in self.transfers)
+
+    def _plan(self) -> None:
+        positions = sorted(set(self.old_partitioner.ring_positions) | set(self.new_partitioner.ring_positions))
+        transfers: Dict[Tuple[object, object], Transfer] = {}
+
+        for index, end in enumerate(positions):
+            # Any key in '(start, end]' is placed exactly like 'start' itself
+            start = positions[index - 1]
+            old_nodes = self.old_partitioner.get_nodes(start, self.replication_factor)
+            new_nodes = self.new_partitioner.get_nodes(start, self.replication_factor)
+
+            sources = [node for node in old_nodes if node.available]
+            for target in new_nodes:
+                if target in old_nodes:
+                    continue
+                if not sources:
+                    append_range(self.lost_ranges, (start, end))
+                    continue
+                transfer = transfers.setdefault((sources[0], target), Transfer(sources[0], target))
+                append_range(transfer.key_ranges, (start, end))
+
+            for node in old_nodes:
+                if node not in new_nodes and node not in self.remove_nodes:
+                    append_range(self.drops.setdefault(node, []), (start, end))
+
+        self.transfers = list(transfers.values())
+
+
+class RebalanceExecutor:
+    """
+    Streams the transfers of a 'MigrationPlan' in throttled chunks while
+    the ring keeps serving reads and writes from the old owners. Once every
+    chunk is copied, a short cutover catches up with writes made in the
+    meantime, switches the ring's membership and drops stale copies.
+    """
+
+    # Attributes
+    hash_ring: object
+    plan: MigrationPlan
+    state: str
+    total_keys: int
+    copied_keys: int
+    caught_up_keys: int  # Written during streaming and copied at cutover
+    chunk_count: int
+    start_time: float | None
+    end_time: float | None
+    thread: threading.Thread | None
+
+    # Tunable Config
+    chunk_size: int
+    chunk_delay: float  # Seconds to wait between chunks, to throttle the stream
+    on_progress: Callable[[Dict], None] | None
+
+    # Constants
+    DEFAULT_CHUNK_SIZE = 500
+    PENDING = 'pending'
+    STREAMING = 'streaming'
+    CUTOVER = 'cutover'
+    DONE = 'done'
+
+    def __init__(
+        self,
+        hash_ring,
+        plan: MigrationPlan,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        chunk_delay: float = 0.0,
+        on_progress: Callable[[Dict], None] | None = None,
+    ) -> None:
+        self.hash_ring = hash_ring
+        self.plan = plan
+        self.chunk_size = chunk_size
+        self.chunk_delay = chunk_delay
+        self.on_progress = on_progress
+        self.state = self.PENDING
+        self.total_keys = 0
+        self.copied_keys = 0
+        self.caught_up_keys = 0
+        self.chunk_count = 0
+        self.start_time = None
+        self.end_time = None
+        self.thread = None
+        self._chunks = None
+
+    def run(self) -> Dict:
+        """
+        Streams every chunk and cuts over. Returns the final progress.
+        """
+        while self.step():
+            if self.chunk_delay:
+                time.sleep(self.chunk_delay)
+        self.cutover()
+        return self.get_progress()
+
+    def start(self) -> None:
+        """
+        Runs the migration on a background thread.
+        """
+        self.thread = threading.Thread(target=self.run, daemon=True)
+        self.thread.start()
+
+    def join(self, timeout: float | None = None) -> None:
+        if self.thread is not None:
+            self.thread.join(timeout)
+
+    def step(self) -> bool:
+        """
+        Copies the next chunk. Returns 'False' once there is nothing
+        left to stream.
+        """
+        if self._chunks is None:
+            self._begin()
+
+        try:
+            transfer, keys = next(self._chunks)
+        except StopIteration:
+            return False
+
+        # Keys deleted since the scan are simply skipped
+        values = transfer.source.retrieve_many(keys)
+        transfer.target.store_many(list(values.items()), override=True)
+        transfer.copied_keys += len(values)
+        self.copied_keys += len(values)
+        self.chunk_count += 1
+        self._report()
+        return True
+
+    def cutover(self) -> None:
+        """
+        Copies keys written to the moving ranges since they were scanned,
+        then switches the ring to its new membership and drops the ranges
+        old replicas are no longer responsible for.
+        """
+        self.state = self.CUTOVER
+        with self.hash_ring.lock:
+            for transfer in self.plan.transfers:
+                self._catch_up(transfer)
+            self.hash_ring.apply_plan(self.plan)
+
+        for node, key_ranges in self.plan.drops.items():
+            for key, _ in node.get_all_data():
+                if in_ranges(h(key), key_ranges):
+                    node.delete_data(key)
+        self.hash_ring.recount_load()
+
+        self.state = self.DONE
+        self.end_time = time.perf_counter()
+        self._report()
+
+    def get_progress(self) -> Dict:
+        end_time = self.end_time if self.end_time is not None else time.perf_counter()
+        return {
+            'state': self.state,
+            'transfers': len(self.plan.transfers),
+            'completed_transfers': sum(
+                1 for transfer in self.plan.transfers if transfer.keys and transfer.copied_keys >= len(transfer.keys)
+            ),
+            'total_keys': self.total_keys,
+            'copied_keys': self.copied_keys,
+            'caught_up_keys': self.caught_up_keys,
+            'chunks': self.chunk_count,
+            'progress': min(1.0, self.copied_keys / self.total_keys) if self.total_keys else 1.0,
+            'elapsed_seconds': end_time - self.start_time if self.start_time is not None else 0.0,
+        }
+
+    def _begin(self) -> None:
+        self.state = self.STREAMING
+        self.start_time = time.perf_counter()
+        self.total_keys = sum(len(transfer.scan()) for transfer in self.plan.transfers)
+        self._chunks = self._iter_chunks()
+
+    def _iter_chunks(self):
+        for transfer in self.plan.transfers:
+            for index in range(0, len(transfer.keys), self.chunk_size):
+                yield transfer, transfer.keys[index:index + self.chunk_size]
+
+    def _catch_up(self, transfer: Transfer) -> None:
+        # Only keys written after the scan need hashing again
+        scanned_keys: Set[str] = set(transfer.keys)
+        source_values = {
+            key: value
+            for key, value in transfer.source.get_all_data()
+            if key in scanned_keys or transfer.contains(h(key))
+        }
+        target_values = transfer.target.retrieve_many(list(source_values))
+        items = [(key, value) for key, value in source_values.items() if target_values.get(key) != value]
+        if items:
+            transfer.target.store_many(items, override=True)
+            self.caught_up_keys += len(items)
+
+    def _report(self) -> None:
+        if self.on_progress is not None:
+            self.on_progress(self.get_progress())
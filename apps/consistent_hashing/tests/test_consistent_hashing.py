@@ -1,7 +1,10 @@
 # src/consistent_hashing/tests.py
+import math
 import random
+from collections import Counter
 from functools import reduce
 from typing import List
+from unittest import mock
 
 import pytest
 from django.test import TestCase
@@ -158,3 +161,227 @@ class TestSuite(TestCase):
             hash_ring.get_data(test_data_key)
 
         assert exception
+
+    def test_should_return_distinct_physical_nodes_in_preference_list(self):
+        # Build test data
+        replication_factor: int = 3
+        hash_ring: HashRing = HashRing(replication_factor=replication_factor, virtual_nodes=8)
+        [hash_ring.add_node(HashNode(gen_word())) for _ in range(5)]
+
+        # Do
+        preference_list: List[HashNode] = hash_ring.preference_list('test_key')
+
+        # Assert
+        assert len(preference_list) == replication_factor
+        assert len(set(preference_list)) == replication_factor
+        assert len(hash_ring.partitioner.ring_positions) == 5 * 8
+
+    def test_should_store_data_in_every_replica(self):
+        # Build test data
+        replication_factor: int = 3
+        data_count: int = 100
+        hash_ring: HashRing = HashRing(replication_factor=replication_factor)
+        [hash_ring.add_node(HashNode(gen_word())) for _ in range(5)]
+
+        # Do
+        [hash_ring.set_data(*gen_data_tuple()) for _ in range(data_count)]
+
+        # Assert
+        total_data_count_across_all_nodes = sum(node.get_data_count() for node in hash_ring.node_list)
+        assert total_data_count_across_all_nodes == data_count * replication_factor
+
+    def test_should_retrieve_data_when_replica_is_unavailable(self):
+        # Build test data
+        hash_ring: HashRing = HashRing(replication_factor=3, read_quorum=1)
+        [hash_ring.add_node(HashNode(gen_word())) for _ in range(5)]
+        hash_ring.set_data('test_key', 7)
+
+        # Do
+        hash_ring.preference_list('test_key')[0].available = False
+
+        # Assert
+        assert hash_ring.get_data('test_key') == 7
+
+    def test_should_fail_write_when_quorum_is_not_reached(self):
+        # Build test data
+        hash_ring: HashRing = HashRing(replication_factor=3, write_quorum=3)
+        [hash_ring.add_node(HashNode(gen_word())) for _ in range(5)]
+
+        # Do
+        hash_ring.preference_list('test_key')[1].available = False
+
+        # Assert
+        with pytest.raises(ConnectionError):
+            hash_ring.set_data('test_key', 7)
+
+    def test_should_restore_replicas_when_removing_unavailable_node(self):
+        # Build test data
+        replication_factor: int = 3
+        data_count: int = 1000
+        hash_ring: HashRing = HashRing(replication_factor=replication_factor, virtual_nodes=4)
+        [hash_ring.add_node(HashNode(gen_word())) for _ in range(6)]
+        [hash_ring.set_data(*gen_data_tuple()) for _ in range(data_count)]
+
+        # Do
+        lost_node: HashNode = hash_ring.node_list[2]
+        lost_node.available = False
+        hash_ring.remove_node(lost_node)
+
+        # Assert
+        total_data_count_across_all_nodes = sum(node.get_data_count() for node in hash_ring.node_list)
+        assert total_data_count_across_all_nodes == data_count * replication_factor
+
+    def test_should_migrate_replicas_when_adding_node(self):
+        # Build test data
+        replication_factor: int = 2
+        data_count: int = 1000
+        hash_ring: HashRing = HashRing(replication_factor=replication_factor, virtual_nodes=4)
+        [hash_ring.add_node(HashNode(gen_word())) for _ in range(4)]
+        data = [gen_data_tuple() for _ in range(data_count)]
+        [hash_ring.set_data(key, value) for key, value in data]
+
+        # Do
+        hash_ring.add_node(HashNode(gen_word()))
+
+        # Assert
+        for key, value in data:
+            assert all(node.retrieve_data(key) == value for node in hash_ring.preference_list(key))
+        total_data_count_across_all_nodes = sum(node.get_data_count() for node in hash_ring.node_list)
+        assert total_data_count_across_all_nodes == data_count * replication_factor
+
+    def test_should_not_allow_quorum_above_replication_factor(self):
+        with pytest.raises(ValueError):
+            HashRing(replication_factor=2, write_quorum=3)
+
+    def test_should_set_and_get_many(self):
+        # Build test data
+        hash_ring: HashRing = build_hash_ring(10, 0)
+        data = dict(gen_data_tuple() for _ in range(1000))
+
+        # Do
+        hash_ring.set_many(data)
+
+        # Assert
+        assert hash_ring.get_many(list(data)) == data
+        for key, value in data.items():
+            assert hash_ring.get_data(key) == value
+
+    def test_should_set_and_get_many_concurrently_with_replicas(self):
+        # Build test data
+        replication_factor: int = 3
+        hash_ring: HashRing = HashRing(replication_factor=replication_factor, virtual_nodes=4)
+        [hash_ring.add_node(HashNode(gen_word())) for _ in range(5)]
+        data = dict(gen_data_tuple() for _ in range(1000))
+
+        # Do
+        hash_ring.set_many(data, concurrent=True)
+
+        # Assert
+        assert hash_ring.get_many(list(data), concurrent=True) == data
+        for key in data:
+            assert all(node.contains_data(key) for node in hash_ring.preference_list(key))
+
+    def test_should_fail_when_getting_many_with_non_existing_data(self):
+        # Build test data
+        hash_ring: HashRing = build_hash_ring(10, 0)
+        hash_ring.set_many([('test_key', 7)])
+
+        # Assert
+        with pytest.raises(KeyError) as exception:
+            hash_ring.get_many(['test_key', 'missing_key'])
+
+        assert 'missing_key' in str(exception.value)
+
+    def test_should_bound_node_loads(self):
+        # Build test data
+        node_count: int = 10
+        data_count: int = 2000
+        load_factor: float = 1.25
+        hash_ring: HashRing = HashRing(load_factor=load_factor)
+        [hash_ring.add_node(HashNode(gen_word())) for _ in range(node_count)]
+        data = dict(gen_data_tuple() for _ in range(data_count))
+
+        # Do
+        [hash_ring.set_data(key, value) for key, value in data.items()]
+
+        # Assert
+        capacity = math.ceil(load_factor * len(data) / node_count)
+        assert max(node.get_data_count() for node in hash_ring.node_list) <= capacity
+        assert hash_ring.get_many(list(data)) == data
+        for key, value in data.items():
+            assert hash_ring.get_data(key) == value
+
+    def test_should_report_spill_metrics(self):
+        # Build test data
+        hash_ring: HashRing = HashRing(load_factor=1.1)
+        [hash_ring.add_node(HashNode(gen_word())) for _ in range(10)]
+        data = dict(gen_data_tuple() for _ in range(2000))
+
+        # Do
+        hash_ring.set_many(data)
+        metrics = hash_ring.get_spill_metrics()
+
+        # Assert
+        assert metrics['placed_keys'] == len(data)
+        assert metrics['spilled_keys'] == len(data) - metrics['histogram'][0]
+        assert metrics['max_distance'] >= 1
+
+    def test_should_keep_bounded_keys_when_adding_node(self):
+        # Build test data
+        hash_ring: HashRing = HashRing(replication_factor=2, load_factor=1.25)
+        [hash_ring.add_node(HashNode(gen_word())) for _ in range(5)]
+        data = dict(gen_data_tuple() for _ in range(1000))
+        hash_ring.set_many(data)
+
+        # Do
+        hash_ring.add_node(HashNode(gen_word()))
+
+        # Assert
+        assert hash_ring.get_many(list(data)) == data
+        assert sum(node.get_data_count() for node in hash_ring.node_list) == 2 * len(data)
+
+    def test_should_drop_spilled_copies_when_rebalancing(self):
+        # Build test data, with this seed some keys spill past the nodes the new one affects
+        random.seed(0)
+        hash_ring: HashRing = HashRing(replication_factor=2, load_factor=1.25)
+        [hash_ring.add_node(HashNode(gen_word())) for _ in range(5)]
+        hash_ring.set_many(dict(gen_data_tuple() for _ in range(1000)))
+
+        # Do
+        hash_ring.add_node(HashNode(gen_word()))
+
+        # Assert, no copy is left outside of a key's preference list
+        copy_counts = Counter(key for node in hash_ring.node_list for key, _ in node.get_all_data())
+        assert set(copy_counts.values()) == {2}
+
+    def test_should_keep_total_load_with_bounded_loads(self):
+        # Build test data
+        random.seed(1)
+        hash_ring: HashRing = HashRing(replication_factor=2, load_factor=1.25)
+        node_list: List = [HashNode(gen_word()) for _ in range(6)]
+        [hash_ring.add_node(node) for node in node_list[:5]]
+
+        # Do
+        [hash_ring.set_data(*gen_data_tuple()) for _ in range(200)]
+        hash_ring.set_many(dict(gen_data_tuple() for _ in range(500)))
+        hash_ring.add_node(node_list[5])
+        hash_ring.remove_node(node_list[0])
+
+        # Assert
+        assert hash_ring.total_load == sum(node.get_data_count() for node in hash_ring.node_list)
+
+    def test_should_only_read_probed_loads_when_writing(self):
+        # Build test data
+        hash_ring: HashRing = HashRing(load_factor=1.25)
+        [hash_ring.add_node(HashNode(gen_word())) for _ in range(20)]
+
+        # Do
+        with mock.patch.object(HashNode, 'get_data_count', autospec=True, return_value=0) as get_data_count:
+            hash_ring.set_data(*gen_data_tuple())
+
+        # Assert, the first probed node has room
+        assert get_data_count.call_count == 1
+
+    def test_should_not_allow_load_factor_below_one(self):
+        with pytest.raises(ValueError):
+            HashRing(load_factor=1)
@@ -0,0 +1,87 @@
+# src/consistent_hashing/tests/test_partitioners.py
+import random
+from collections import Counter
+
+import pytest
+from django.test import TestCase
+
+from ..benchmarks import PARTITIONERS, benchmark_partitioners
+from ..consistent_hashing import HashNode, HashRing
+from ..partitioners import JumpHashPartitioner, MaglevPartitioner, Partitioner, jump_hash
+from ..utils import h
+from .test_consistent_hashing import gen_data_tuple, gen_word
+
+
+class TestSuite(TestCase):
+    def test_should_set_and_get_data_with_every_partitioner(self):
+        for name, partitioner_factory in PARTITIONERS.items():
+            # Build test data
+            hash_ring: HashRing = HashRing(replication_factor=2, partitioner=partitioner_factory())
+            [hash_ring.add_node(HashNode(gen_word())) for _ in range(5)]
+            data = dict(gen_data_tuple() for _ in range(200))
+
+            # Do
+            [hash_ring.set_data(key, value) for key, value in data.items()]
+            hash_ring.add_node(HashNode(gen_word()))
+            hash_ring.remove_node(hash_ring.node_list[0])
+
+            # Assert
+            assert hash_ring.get_many(list(data)) == data, name
+            for key, value in data.items():
+                assert hash_ring.get_data(key) == value, name
+
+    def test_should_return_distinct_replicas_with_every_partitioner(self):
+        for name, partitioner_factory in PARTITIONERS.items():
+            # Build test data
+            hash_ring: HashRing = HashRing(replication_factor=3, partitioner=partitioner_factory())
+            [hash_ring.add_node(HashNode(gen_word())) for _ in range(5)]
+
+            # Assert
+            assert len(set(hash_ring.preference_list('test_key'))) == 3, name
+
+    def test_jump_hash_should_only_move_keys_to_new_bucket(self):
+        keys = [random.getrandbits(64) for _ in range(1000)]
+
+        for key in keys:
+            bucket = jump_hash(key, 10)
+            next_bucket = jump_hash(key, 11)
+            assert 0 <= bucket < 10
+            assert next_bucket in (bucket, 10)
+
+    def test_jump_hash_partitioner_should_swap_last_node_on_removal(self):
+        # Build test data
+        partitioner = JumpHashPartitioner()
+        nodes = [HashNode(gen_word()) for _ in range(4)]
+        [partitioner.add_node(node) for node in nodes]
+
+        # Do
+        partitioner.remove_node(nodes[1])
+
+        # Assert
+        assert partitioner.node_list == [nodes[0], nodes[3], nodes[2]]
+
+    def test_maglev_should_fill_lookup_table_evenly(self):
+        # Build test data
+        table_size: int = 503
+        partitioner = MaglevPartitioner(table_size=table_size)
+        [partitioner.add_node(HashNode(gen_word())) for _ in range(5)]
+
+        # Do
+        partitioner.get_nodes(h('test_key'), 1)
+
+        # Assert
+        slot_counts = Counter(partitioner.lookup_table)
+        assert len(partitioner.lookup_table) == table_size
+        assert max(slot_counts.values()) - min(slot_counts.values()) <= 1
+
+    def test_should_benchmark_partitioners(self):
+        results = benchmark_partitioners(node_count=5, key_count=100)
+
+        assert set(results) == set(PARTITIONERS)
+        for result in results.values():
+            assert result['lookup_ns'] > 0
+            assert 0 <= result['moved_keys_ratio'] <= 1
+
+    def test_should_not_find_nodes_with_base_partitioner(self):
+        with pytest.raises(NotImplementedError):
+            Partitioner().get_nodes(h('test_key'), 1)
@@ -0,0 +1,126 @@
+# src/consistent_hashing/tests/test_rebalancer.py
+import random
+
+import pytest
+from django.test import TestCase
+
+from ..consistent_hashing import HashNode, HashRing
+from ..partitioners import JumpHashPartitioner
+from ..rebalancer import RebalanceExecutor
+from ..utils import h
+
+
+# Test Utils
+def gen_word():
+    length: int = random.randint(5, 26)
+    return ''.join(
+        [
+            random.choice([chr(random.randint(65, 90)), chr(random.randint(97, 123))])
+            for _ in range(length)
+        ]
+    )
+
+
+def gen_data_tuple():
+    return 'KEY_' + gen_word(), random.randint(0, 999999)
+
+
+def build_hash_ring(node_count: int, data_count: int, replication_factor: int = 1):
+    hash_ring: HashRing = HashRing(replication_factor=replication_factor, virtual_nodes=8)
+    [hash_ring.add_node(HashNode(gen_word())) for _ in range(node_count)]
+    data = dict(gen_data_tuple() for _ in range(data_count))
+    hash_ring.set_many(data)
+    return hash_ring, data
+
+
+class TestSuite(TestCase):
+    def test_should_plan_transfers_only_to_new_nodes(self):
+        # Build test data
+        hash_ring, data = build_hash_ring(5, 1000)
+        new_nodes = [HashNode(gen_word()) for _ in range(2)]
+
+        # Do
+        plan = hash_ring.plan_changes(add=new_nodes)
+
+        # Assert
+        assert plan.get_transfer_count() > 0
+        assert all(transfer.target in new_nodes for transfer in plan.transfers)
+        moving_keys = [key for key in data if any(transfer.contains(h(key)) for transfer in plan.transfers)]
+        owners = {key: hash_ring.preference_list(key)[0] for key in moving_keys}
+        hash_ring.apply_plan(plan)
+        assert all(hash_ring.preference_list(key)[0] in new_nodes for key in moving_keys)
+        assert all(hash_ring.preference_list(key)[0] is not owners[key] for key in moving_keys)
+
+    def test_should_stream_plan_and_cut_over(self):
+        # Build test data
+        hash_ring, data = build_hash_ring(5, 2000, replication_factor=2)
+        new_nodes = [HashNode(gen_word()) for _ in range(2)]
+        removed_node = hash_ring.node_list[0]
+        progress_reports = []
+
+        # Do
+        plan = hash_ring.plan_changes(add=new_nodes, remove=[removed_node])
+        executor = RebalanceExecutor(hash_ring, plan, chunk_size=50, on_progress=progress_reports.append)
+        progress = executor.run()
+
+        # Assert
+        assert progress['state'] == RebalanceExecutor.DONE
+        assert progress['copied_keys'] == progress['total_keys']
+        assert len(progress_reports) == progress['chunks'] + 1
+        assert removed_node not in hash_ring.node_list
+        assert all(node in hash_ring.node_list for node in new_nodes)
+        assert hash_ring.get_many(list(data)) == data
+        assert sum(node.get_data_count() for node in hash_ring.node_list) == 2 * len(data)
+
+    def test_should_serve_old_owners_until_cutover(self):
+        # Build test data
+        hash_ring, data = build_hash_ring(3, 1000)
+        new_node = HashNode(gen_word())
+        plan = hash_ring.plan_changes(add=[new_node])
+        executor = RebalanceExecutor(hash_ring, plan, chunk_size=10)
+
+        # Do
+        executor.step()
+        written_data = dict(gen_data_tuple() for _ in range(200))
+        hash_ring.set_many(written_data)
+
+        # Assert
+        assert new_node not in hash_ring.node_list
+        assert executor.get_progress()['state'] == RebalanceExecutor.STREAMING
+        assert hash_ring.get_many(list(data)) == data
+
+        # Do
+        while executor.step():
+            pass
+        executor.cutover()
+
+        # Assert
+        assert hash_ring.get_many(list(data)) == data
+        assert hash_ring.get_many(list(written_data)) == written_data
+
+    def test_should_run_in_background(self):
+        # Build test data
+        hash_ring, data = build_hash_ring(3, 500)
+        plan = hash_ring.plan_changes(add=[HashNode(gen_word())])
+        executor = RebalanceExecutor(hash_ring, plan, chunk_size=20, chunk_delay=0.001)
+
+        # Do
+        executor.start()
+        executor.join()
+
+        # Assert
+        assert executor.state == RebalanceExecutor.DONE
+        assert hash_ring.get_many(list(data)) == data
+
+    def test_should_not_plan_without_ring_partitioner(self):
+        hash_ring: HashRing = HashRing(partitioner=JumpHashPartitioner())
+        hash_ring.add_node(HashNode(gen_word()))
+
+        with pytest.raises(NotImplementedError):
+            hash_ring.plan_changes(add=[HashNode(gen_word())])
+
+    def test_should_not_plan_removal_of_unknown_node(self):
+        hash_ring, _ = build_hash_ring(3, 10)
+
+        with pytest.raises(KeyError):
+            hash_ring.plan_changes(remove=[HashNode(gen_word())])
@@ -0,0 +1,85 @@
+# src/crdt/benchmarks.py
+import argparse
+import json
+import pickle
+import random
+import time
+from typing import Callable, Dict, Sequence
+
+from .crdts import CRDT, GCounter, LWWElementSet, LWWMap, ORSet, PNCounter
+
+DEFAULT_REPLICA_COUNTS = (2, 8, 32, 128)
+
+# How every benchmarked CRDT is updated, given the replica and a random generator
+OPERATIONS: Dict[str, Callable[[CRDT, random.Random], CRDT]] = {
+    'g_counter': lambda replica, generator: replica.increment(),
+    'pn_counter': lambda replica, generator: replica.increment(generator.choice([-1, 1])),
+    'lww_element_set': lambda replica, generator: (
+        generator.choice([replica.add, replica.remove])(generator.randrange(100))
+    ),
+    'or_set': lambda replica, generator: (
+        generator.choice([replica.add, replica.remove])(generator.randrange(100))
+    ),
+    'lww_map': lambda replica, generator: replica.set(f'key-{generator.randrange(100)}', generator.random()),
+}
+
+CRDT_TYPES: Dict[str, Callable[[int], CRDT]] = {
+    'g_counter': GCounter,
+    'pn_counter': PNCounter,
+    'lww_element_set': LWWElementSet,
+    'or_set': ORSet,
+    'lww_map': LWWMap,
+}
+
+
+def benchmark_crdts(
+    replica_counts: Sequence[int] = DEFAULT_REPLICA_COUNTS, operation_count: int = 20, seed: int = 0
+) -> Dict[str, Dict]:
+    """
+    Merge cost and metadata size of every CRDT type as replicas grow.
+    Every replica applies 'operation_count' random updates, then all
+    states are merged, as a full anti-entropy pass would, and the merged
+    state is merged into a stale replica. Delta sizes are the mean
+    pickled size of a single update's delta.
+    """
+    results = {}
+    for name, crdt_factory in CRDT_TYPES.items():
+        for replica_count in replica_counts:
+            generator = random.Random(seed)
+            replicas = [crdt_factory(replica_id) for replica_id in range(replica_count)]
+            delta_bytes = [
+                len(pickle.dumps(OPERATIONS[name](replica, generator)))
+                for _ in range(operation_count)
+                for replica in replicas
+            ]
+
+            start_time = time.perf_counter()
+            merged_state = replicas[0].copy()
+            [merged_state.merge(replica) for replica in replicas[1:]]
+            merge_all_time = time.perf_counter() - start_time
+
+            stale_replica = crdt_factory(replica_count)
+            start_time = time.perf_counter()
+            stale_replica.merge(merged_state)
+            merge_time = time.perf_counter() - start_time
+
+            result = {
+                'merge_all_us': merge_all_time * 1e6,
+                'merge_us': merge_time * 1e6,
+                'state_bytes': len(pickle.dumps(merged_state)),
+                'delta_bytes': sum(delta_bytes) / len(delta_bytes),
+            }
+            if isinstance(merged_state, ORSet):
+                result['context_entries'] = len(merged_state.context)
+            results[f'{name}_{replica_count}'] = result
+
+    return results
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='CRDT merge cost and metadata size benchmark.')
+    parser.add_argument('--replicas', type=int, nargs='+', default=DEFAULT_REPLICA_COUNTS)
+    parser.add_argument('--operations', type=int, default=20)
+    arguments = parser.parse_args()
+
+    print(json.dumps(benchmark_crdts(arguments.replicas, arguments.operations), indent=2))
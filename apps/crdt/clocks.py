@@ -0,0 +1,125 @@
+# src/crdt/clocks.py
+from typing import Dict, Hashable, Set, Tuple
+
+ReplicaId = Hashable
+# An event, the n-th one of a replica
+Dot = Tuple[ReplicaId, int]
+
+
+class VectorClock:
+    """
+    Number of events seen from every replica. Two clocks are ordered when
+    one has seen everything the other has, otherwise they are concurrent.
+    """
+
+    # Attributes
+    counters: Dict[ReplicaId, int]
+
+    # Orderings
+    BEFORE = 'before'
+    AFTER = 'after'
+    EQUAL = 'equal'
+    CONCURRENT = 'concurrent'
+
+    def __init__(self, counters: Dict[ReplicaId, int] | None = None):
+        self.counters = dict(counters or {})
+
+    def __eq__(self, other: 'VectorClock') -> bool:
+        return self.compare(other) == self.EQUAL
+
+    def __repr__(self):
+        return f'VectorClock({self.counters})'
+
+    def get(self, replica_id: ReplicaId) -> int:
+        return self.counters.get(replica_id, 0)
+
+    def increment(self, replica_id: ReplicaId) -> int:
+        self.counters[replica_id] = self.get(replica_id) + 1
+        return self.counters[replica_id]
+
+    def merge(self, other: 'VectorClock') -> bool:
+        """
+        Keeps the highest counter of every replica, returns whether anything changed.
+        """
+        changed = False
+        for replica_id, counter in other.counters.items():
+            if counter > self.get(replica_id):
+                self.counters[replica_id] = counter
+                changed = True
+        return changed
+
+    def compare(self, other: 'VectorClock') -> str:
+        is_before = any(counter > self.get(replica_id) for replica_id, counter in other.counters.items())
+        is_after = any(counter > other.get(replica_id) for replica_id, counter in self.counters.items())
+        if is_before and is_after:
+            return self.CONCURRENT
+        if is_before:
+            return self.BEFORE
+        if is_after:
+            return self.AFTER
+        return self.EQUAL
+
+    def copy(self) -> 'VectorClock':
+        return VectorClock(self.counters)
+
+
+class DottedVersionVector:
+    """
+    Compact causal context, the set of every dot seen. Dots contiguous
+    from the first event of a replica are kept as a single counter, as in
+    a vector clock, and only the ones past a gap, e.g. received out of
+    order through deltas, are kept in a cloud until the gap is filled.
+    """
+
+    # Attributes
+    vector: VectorClock
+    cloud: Set[Dot]
+
+    def __init__(self):
+        self.vector = VectorClock()
+        self.cloud = set()
+
+    def __contains__(self, dot: Dot) -> bool:
+        replica_id, counter = dot
+        return counter <= self.vector.get(replica_id) or dot in self.cloud
+
+    def __len__(self) -> int:
+        """
+        Number of entries kept, one per replica plus one per cloud dot.
+        """
+        return len(self.vector.counters) + len(self.cloud)
+
+    def next_dot(self, replica_id: ReplicaId) -> Dot:
+        """
+        Dot of a new event of 'replica_id', which has seen all of its own events.
+        """
+        return replica_id, self.vector.increment(replica_id)
+
+    def add(self, dot: Dot):
+        if dot not in self:
+            self.cloud.add(dot)
+            self.compact()
+
+    def merge(self, other: 'DottedVersionVector') -> bool:
+        changed = self.vector.merge(other.vector)
+        for dot in other.cloud:
+            if dot not in self:
+                self.cloud.add(dot)
+                changed = True
+        self.compact()
+        return changed
+
+    def compact(self):
+        """
+        Folds cloud dots that became contiguous into the vector.
+        """
+        for replica_id, counter in sorted(self.cloud, key=lambda dot: dot[1]):
+            if counter == self.vector.get(replica_id) + 1:
+                self.vector.counters[replica_id] = counter
+        self.cloud = {dot for dot in self.cloud if dot[1] > self.vector.get(dot[0])}
+
+    def copy(self) -> 'DottedVersionVector':
+        dotted_version_vector = DottedVersionVector()
+        dotted_version_vector.vector = self.vector.copy()
+        dotted_version_vector.cloud = set(self.cloud)
+        return dotted_version_vector
@@ -0,0 +1,344 @@
+# src/crdt/crdts.py
+import time
+import zlib
+from typing import Any, Dict, Hashable, Iterable, Set, Tuple
+
+from .clocks import Dot, DottedVersionVector, ReplicaId
+
+# Timestamp and writer of a last writer wins value, compared in this order
+LWWStamp = Tuple[int, ReplicaId]
+
+
+class CRDT:
+    """
+    State based CRDT. 'merge' joins another replica's state, it is
+    commutative, associative and idempotent, so replicas converge no
+    matter the order or how many times states are delivered.
+    Mutators apply to the local state and return a delta, a small state
+    of the same type holding only the change, which any replica can
+    merge instead of the whole state.
+    Keyed types can be split in slices of keys, so anti-entropy only
+    exchanges the keys that differ.
+    """
+
+    # Attributes
+    replica_id: ReplicaId
+
+    # Constants
+    KEYED = False
+
+    def __init__(self, replica_id: ReplicaId):
+        self.replica_id = replica_id
+
+    def merge(self, other: 'CRDT') -> bool:
+        """
+        Joins 'other' into this state, returns whether anything changed.
+        """
+        raise NotImplementedError
+
+    def get_value(self) -> Any:
+        raise NotImplementedError
+
+    def copy(self) -> 'CRDT':
+        raise NotImplementedError
+
+    def get_keys(self) -> Iterable[str]:
+        raise NotImplementedError
+
+    def get_key_digest(self, key: str) -> int:
+        raise NotImplementedError
+
+    def get_slice(self, keys: Iterable[str]) -> 'CRDT':
+        raise NotImplementedError
+
+
+class GCounter(CRDT):
+    """
+    Grow only counter, one count per replica, merged by keeping the highest.
+    """
+
+    # Attributes
+    counts: Dict[ReplicaId, int]
+
+    # Constants
+    KEYED = True
+
+    def __init__(self, replica_id: ReplicaId):
+        super().__init__(replica_id)
+        self.counts = {}
+
+    def increment(self, amount: int = 1) -> 'GCounter':
+        self._perform_increment_validations(amount)
+        self.counts[self.replica_id] = self.counts.get(self.replica_id, 0) + amount
+        return self.get_slice([self.replica_id])
+
+    def merge(self, other: 'GCounter') -> bool:
+        changed = False
+        for replica_id, count in other.counts.items():
+            if count > self.counts.get(replica_id, 0):
+                self.counts[replica_id] = count
+                changed = True
+        return changed
+
+    def get_value(self) -> int:
+        return sum(self.counts.values())
+
+    def copy(self) -> 'GCounter':
+        return self.get_slice(self.counts)
+
+    def get_keys(self) -> Iterable[str]:
+        return self.counts.keys()
+
+    def get_key_digest(self, key: str) -> int:
+        return self.counts[key]
+
+    def get_slice(self, keys: Iterable[str]) -> 'GCounter':
+        counter = GCounter(self.replica_id)
+        counter.counts = {key: self.counts[key] for key in keys if key in self.counts}
+        return counter
+
+    @staticmethod
+    def _perform_increment_validations(amount: int):
+        if amount < 0:
+            error_message = f'A grow only counter cannot decrease, got {amount}'
+            raise ValueError(error_message)
+
+
+class PNCounter(CRDT):
+    """
+    Counter that can also decrease, a grow only counter of increments and
+    another one of decrements.
+    """
+
+    # Attributes
+    increments: GCounter
+    decrements: GCounter
+
+    def __init__(self, replica_id: ReplicaId):
+        super().__init__(replica_id)
+        self.increments = GCounter(replica_id)
+        self.decrements = GCounter(replica_id)
+
+    def increment(self, amount: int = 1) -> 'PNCounter':
+        counter = PNCounter(self.replica_id)
+        if amount >= 0:
+            counter.increments = self.increments.increment(amount)
+        else:
+            counter.decrements = self.decrements.increment(-amount)
+        return counter
+
+    def decrement(self, amount: int = 1) -> 'PNCounter':
+        return self.increment(-amount)
+
+    def merge(self, other: 'PNCounter') -> bool:
+        increments_changed = self.increments.merge(other.increments)
+        decrements_changed = self.decrements.merge(other.decrements)
+        return increments_changed or decrements_changed
+
+    def get_value(self) -> int:
+        return self.increments.get_value() - self.decrements.get_value()
+
+    def copy(self) -> 'PNCounter':
+        counter = PNCounter(self.replica_id)
+        counter.increments = self.increments.copy()
+        counter.decrements = self.decrements.copy()
+        return counter
+
+
+class LWWElementSet(CRDT):
+    """
+    Last writer wins set, the latest add and remove stamp of every
+    element. An element is in the set when added after it was last
+    removed, an add wins over a remove with the same timestamp.
+    """
+
+    # Attributes
+    adds: Dict[Hashable, LWWStamp]
+    removes: Dict[Hashable, LWWStamp]
+
+    def __init__(self, replica_id: ReplicaId):
+        super().__init__(replica_id)
+        self.adds = {}
+        self.removes = {}
+
+    def add(self, element: Hashable, timestamp: int | None = None) -> 'LWWElementSet':
+        delta = LWWElementSet(self.replica_id)
+        delta.adds[element] = (time.time_ns() if timestamp is None else timestamp, self.replica_id)
+        self.merge(delta)
+        return delta
+
+    def remove(self, element: Hashable, timestamp: int | None = None) -> 'LWWElementSet':
+        delta = LWWElementSet(self.replica_id)
+        delta.removes[element] = (time.time_ns() if timestamp is None else timestamp, self.replica_id)
+        self.merge(delta)
+        return delta
+
+    def __contains__(self, element: Hashable) -> bool:
+        add_stamp = self.adds.get(element)
+        remove_stamp = self.removes.get(element)
+        return add_stamp is not None and (remove_stamp is None or add_stamp[0] >= remove_stamp[0])
+
+    def merge(self, other: 'LWWElementSet') -> bool:
+        adds_changed = _merge_stamps(self.adds, other.adds)
+        removes_changed = _merge_stamps(self.removes, other.removes)
+        return adds_changed or removes_changed
+
+    def get_value(self) -> Set[Hashable]:
+        return {element for element in self.adds if element in self}
+
+    def copy(self) -> 'LWWElementSet':
+        element_set = LWWElementSet(self.replica_id)
+        element_set.adds = dict(self.adds)
+        element_set.removes = dict(self.removes)
+        return element_set
+
+
+class ORSet(CRDT):
+    """
+    Observed remove set, with add wins semantics. Every add is tagged with
+    a new dot, and a remove only removes the dots of the element it has
+    observed, so an add concurrent with a remove survives it. Instead of
+    tombstones, removed dots are simply absent while still being in the
+    causal 'context', a dotted version vector.
+    """
+
+    # Attributes
+    entries: Dict[Hashable, Set[Dot]]  # Element -> dots of its live adds
+    context: DottedVersionVector
+
+    def __init__(self, replica_id: ReplicaId):
+        super().__init__(replica_id)
+        self.entries = {}
+        self.context = DottedVersionVector()
+
+    def __contains__(self, element: Hashable) -> bool:
+        return element in self.entries
+
+    def add(self, element: Hashable) -> 'ORSet':
+        dot = self.context.next_dot(self.replica_id)
+        # The new dot replaces the ones observed so far
+        delta = self._build_delta(element)
+        delta.entries[element] = {dot}
+        delta.context.add(dot)
+        self.entries[element] = {dot}
+        return delta
+
+    def remove(self, element: Hashable) -> 'ORSet':
+        delta = self._build_delta(element)
+        self.entries.pop(element, None)
+        return delta
+
+    def merge(self, other: 'ORSet') -> bool:
+        changed = False
+        for element in self.entries.keys() | other.entries.keys():
+            dots = self.entries.get(element, set())
+            other_dots = other.entries.get(element, set())
+            if dots == other_dots:
+                continue
+            # Dots both replicas have, plus the ones the other replica never saw
+            merged_dots = (dots & other_dots) | {dot for dot in dots if dot not in other.context} | {
+                dot for dot in other_dots if dot not in self.context
+            }
+            if merged_dots != dots:
+                changed = True
+            if merged_dots:
+                self.entries[element] = merged_dots
+            else:
+                self.entries.pop(element, None)
+
+        context_changed = self.context.merge(other.context)
+        return changed or context_changed
+
+    def get_value(self) -> Set[Hashable]:
+        return set(self.entries)
+
+    def copy(self) -> 'ORSet':
+        element_set = ORSet(self.replica_id)
+        element_set.entries = {element: set(dots) for element, dots in self.entries.items()}
+        element_set.context = self.context.copy()
+        return element_set
+
+    def _build_delta(self, element: Hashable) -> 'ORSet':
+        """
+        Delta whose context holds the dots of 'element' observed so far, so
+        merging it removes them.
+        """
+        delta = ORSet(self.replica_id)
+        for dot in self.entries.get(element, set()):
+            delta.context.add(dot)
+        return delta
+
+
+class LWWMap(CRDT):
+    """
+    Map of last writer wins registers. Removed keys keep a tombstone
+    stamped like any write, so an older write arriving late cannot
+    bring them back.
+    """
+
+    # Attributes
+    entries: Dict[str, Tuple[LWWStamp, Any, bool]]  # Key -> (stamp, value, removed)
+
+    # Constants
+    KEYED = True
+
+    def __init__(self, replica_id: ReplicaId):
+        super().__init__(replica_id)
+        self.entries = {}
+
+    def __contains__(self, key: str) -> bool:
+        entry = self.entries.get(key)
+        return entry is not None and not entry[2]
+
+    def __len__(self) -> int:
+        return sum(1 for _, _, removed in self.entries.values() if not removed)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        return self.entries[key][1] if key in self else default
+
+    def set(self, key: str, value: Any, timestamp: int | None = None) -> 'LWWMap':
+        return self._write(key, value, False, timestamp)
+
+    def remove(self, key: str, timestamp: int | None = None) -> 'LWWMap':
+        return self._write(key, None, True, timestamp)
+
+    def merge(self, other: 'LWWMap') -> bool:
+        changed = False
+        for key, entry in other.entries.items():
+            current_entry = self.entries.get(key)
+            if current_entry is None or entry[0] > current_entry[0]:
+                self.entries[key] = entry
+                changed = True
+        return changed
+
+    def get_value(self) -> Dict[str, Any]:
+        return {key: value for key, (_, value, removed) in self.entries.items() if not removed}
+
+    def copy(self) -> 'LWWMap':
+        return self.get_slice(self.entries)
+
+    def get_keys(self) -> Iterable[str]:
+        return self.entries.keys()
+
+    def get_key_digest(self, key: str) -> int:
+        return zlib.crc32(repr(self.entries[key]).encode())
+
+    def get_slice(self, keys: Iterable[str]) -> 'LWWMap':
+        lww_map = LWWMap(self.replica_id)
+        lww_map.entries = {key: self.entries[key] for key in keys if key in self.entries}
+        return lww_map
+
+    def _write(self, key: str, value: Any, removed: bool, timestamp: int | None) -> 'LWWMap':
+        delta = LWWMap(self.replica_id)
+        delta.entries[key] = ((time.time_ns() if timestamp is None else timestamp, self.replica_id), value, removed)
+        self.merge(delta)
+        return delta
+
+
+def _merge_stamps(stamps: Dict[Hashable, LWWStamp], other_stamps: Dict[Hashable, LWWStamp]) -> bool:
+    changed = False
+    for element, stamp in other_stamps.items():
+        if element not in stamps or stamp > stamps[element]:
+            stamps[element] = stamp
+            changed = True
+    return changed
@@ -0,0 +1,156 @@
+# src/crdt/replication.py
+import pickle
+import zlib
+from typing import Callable, Dict, Hashable, Iterable, List
+
+from apps.gossip_protocol.gossip_protocol import Coordinator
+from apps.merkle_tree.merkle_tree import MerkleTree
+
+from .clocks import ReplicaId
+from .crdts import CRDT
+
+
+class GossipReplicator:
+    """
+    Replicates a CRDT on every node of a gossip 'Coordinator'. The delta
+    of a local update is pushed to 'fanout' random peers, and every peer
+    it changed forwards it in the next round, like a rumor, until it stops
+    teaching anyone anything. Rumors can die out before reaching every
+    node, so once they do, anti-entropy rounds have every node reconcile
+    with a random peer: keyed CRDTs only exchange the keys of the buckets
+    where their Merkle trees differ, the others their whole state.
+    """
+
+    # Attributes
+    coordinator: Coordinator
+    replicas: Dict[int, CRDT]  # Node uuid -> its replica
+    trees: Dict[int, MerkleTree]  # Node uuid -> digest of its replica's keys, for keyed CRDTs
+    pending_deltas: Dict[int, List[CRDT]]  # Node uuid -> deltas to push next round
+    key_names: Dict[str, Hashable]  # Merkle tree key -> CRDT key
+    total_messages: int
+    total_bytes: int  # Pickled size of every delta, slice or state sent
+
+    # Tunable Config
+    bucket_count: int
+
+    # Constants
+    DEFAULT_BUCKET_COUNT = 64
+
+    def __init__(
+        self,
+        coordinator: Coordinator,
+        crdt_factory: Callable[[ReplicaId], CRDT],
+        bucket_count: int = DEFAULT_BUCKET_COUNT,
+    ):
+        self.coordinator = coordinator
+        self.bucket_count = bucket_count
+        self.replicas = {node.uuid: crdt_factory(node.uuid) for node in coordinator.members}
+        self.trees = {}
+        if any(replica.KEYED for replica in self.replicas.values()):
+            self.trees = {uuid: MerkleTree(bucket_count, bucket_count) for uuid in self.replicas}
+        self.pending_deltas = {uuid: [] for uuid in self.replicas}
+        self.key_names = {}
+        self.total_messages = 0
+        self.total_bytes = 0
+
+    def update(self, uuid: int, mutator: Callable[[CRDT], CRDT]) -> CRDT:
+        """
+        Applies 'mutator', e.g. 'lambda replica: replica.increment()', to the
+        replica of node 'uuid' and queues the delta it returns.
+        """
+        replica = self.replicas[uuid]
+        delta = mutator(replica)
+        self._update_tree(uuid, delta)
+        self.pending_deltas[uuid].append(delta)
+        return delta
+
+    def gossip_round(self):
+        pending_deltas, self.pending_deltas = self.pending_deltas, {uuid: [] for uuid in self.replicas}
+        for node in self.coordinator.members:
+            deltas = pending_deltas.get(node.uuid)
+            if not node.alive or not deltas:
+                continue
+
+            delta = deltas[0].copy()
+            [delta.merge(other_delta) for other_delta in deltas[1:]]
+            for peer in self.coordinator.select_peers(node):
+                if peer.alive and self._send(peer.uuid, delta):
+                    self.pending_deltas[peer.uuid].append(delta)
+
+    def anti_entropy_round(self):
+        for node in self.coordinator.members:
+            peers = self.coordinator.select_peers(node)
+            if node.alive and peers and peers[0].alive:
+                self.reconcile(node.uuid, peers[0].uuid)
+
+    def reconcile(self, uuid: int, peer_uuid: int):
+        """
+        Push-pull of everything the two replicas may disagree on.
+        """
+        replica = self.replicas[uuid]
+        peer_replica = self.replicas[peer_uuid]
+        if not replica.KEYED:
+            peer_state = peer_replica.copy()
+            self._send(peer_uuid, replica.copy())
+            self._send(uuid, peer_state)
+            return
+
+        tree = self.trees[uuid]
+        peer_tree = self.trees[peer_uuid]
+        # Exchanging the tree hashes is a message of its own
+        self.total_messages += 1
+        buckets = tree.get_different_buckets(peer_tree)
+        if not buckets:
+            return
+
+        peer_slice = peer_replica.get_slice(self._get_bucket_keys(peer_tree, buckets))
+        self._send(peer_uuid, replica.get_slice(self._get_bucket_keys(tree, buckets)))
+        self._send(uuid, peer_slice)
+
+    def is_converged(self) -> bool:
+        values = [self.replicas[node.uuid].get_value() for node in self.coordinator.members if node.alive]
+        return all(value == values[0] for value in values)
+
+    def run(self, max_rounds: int = 100) -> Dict:
+        """
+        Gossips deltas while any is pending, then runs anti-entropy rounds until converged.
+        """
+        gossip_rounds = 0
+        anti_entropy_rounds = 0
+        while gossip_rounds + anti_entropy_rounds < max_rounds and not self.is_converged():
+            if any(self.pending_deltas.values()):
+                self.gossip_round()
+                gossip_rounds += 1
+            else:
+                self.anti_entropy_round()
+                anti_entropy_rounds += 1
+
+        return {
+            'gossip_rounds': gossip_rounds,
+            'anti_entropy_rounds': anti_entropy_rounds,
+            'converged': self.is_converged(),
+            'messages': self.total_messages,
+            'bytes': self.total_bytes,
+        }
+
+    def _send(self, uuid: int, state: CRDT) -> bool:
+        self.total_messages += 1
+        self.total_bytes += len(pickle.dumps(state, protocol=pickle.HIGHEST_PROTOCOL))
+        changed = self.replicas[uuid].merge(state)
+        if changed:
+            self._update_tree(uuid, state)
+        return changed
+
+    def _update_tree(self, uuid: int, state: CRDT):
+        if not state.KEYED:
+            return
+
+        replica = self.replicas[uuid]
+        tree = self.trees[uuid]
+        for key in state.get_keys():
+            key_name = str(key)
+            self.key_names[key_name] = key
+            tree.insert(zlib.crc32(key_name.encode()) % self.bucket_count, key_name, replica.get_key_digest(key))
+
+    def _get_bucket_keys(self, tree: MerkleTree, buckets: List[int]) -> Iterable[Hashable]:
+        return [self.key_names[key_name] for bucket in buckets for key_name in tree.bucket_list[bucket]]
@@ -0,0 +1,64 @@
+from django.test import TestCase
+
+from ..clocks import DottedVersionVector, VectorClock
+
+
+class TestSuite(TestCase):
+    def test_should_order_vector_clocks(self):
+        # Build test data
+        clock = VectorClock({'a': 1})
+        later_clock = VectorClock({'a': 2, 'b': 1})
+        concurrent_clock = VectorClock({'b': 2})
+
+        # Assert
+        assert clock.compare(later_clock) == VectorClock.BEFORE
+        assert later_clock.compare(clock) == VectorClock.AFTER
+        assert later_clock.compare(concurrent_clock) == VectorClock.CONCURRENT
+        assert clock == VectorClock({'a': 1, 'b': 0})
+
+    def test_should_merge_vector_clocks(self):
+        # Build test data
+        clock = VectorClock({'a': 2, 'b': 1})
+
+        # Do
+        changed = clock.merge(VectorClock({'a': 1, 'c': 3}))
+        unchanged = clock.merge(VectorClock({'a': 1}))
+
+        # Assert
+        assert changed and not unchanged
+        assert clock.counters == {'a': 2, 'b': 1, 'c': 3}
+
+    def test_should_compact_dots_once_contiguous(self):
+        # Build test data
+        dotted_version_vector = DottedVersionVector()
+        dotted_version_vector.add(('a', 1))
+
+        # Do, dots 3 and 4 arrive before 2
+        dotted_version_vector.add(('a', 3))
+        dotted_version_vector.add(('a', 4))
+        gap_length = len(dotted_version_vector)
+        dotted_version_vector.add(('a', 2))
+
+        # Assert
+        assert gap_length == 3
+        assert len(dotted_version_vector) == 1
+        assert dotted_version_vector.vector.counters == {'a': 4}
+        assert ('a', 3) in dotted_version_vector
+        assert ('a', 5) not in dotted_version_vector
+
+    def test_should_merge_dotted_version_vectors(self):
+        # Build test data
+        dotted_version_vector = DottedVersionVector()
+        other_dotted_version_vector = DottedVersionVector()
+        dotted_version_vector.next_dot('a')
+        dotted_version_vector.add(('b', 2))
+        other_dotted_version_vector.next_dot('b')
+
+        # Do
+        changed = dotted_version_vector.merge(other_dotted_version_vector)
+
+        # Assert
+        assert changed
+        assert dotted_version_vector.vector.counters == {'a': 1, 'b': 2}
+        assert dotted_version_vector.cloud == set()
+        assert not dotted_version_vector.merge(other_dotted_version_vector)
@@ -0,0 +1,122 @@
+import itertools
+
+import pytest
+from django.test import TestCase
+
+from ..benchmarks import benchmark_crdts
+from ..crdts import GCounter, LWWElementSet, LWWMap, ORSet, PNCounter
+
+
+# Test Utils
+def merge_all(replicas):
+    for replica, other_replica in itertools.permutations(replicas, 2):
+        replica.merge(other_replica)
+
+
+class TestSuite(TestCase):
+    def test_should_converge_counters(self):
+        # Build test data
+        counters = [PNCounter(replica_id) for replica_id in range(3)]
+        counters[0].increment(5)
+        counters[1].decrement(2)
+        counters[2].increment()
+
+        # Do
+        merge_all(counters)
+        merge_all(counters)
+
+        # Assert
+        assert [counter.get_value() for counter in counters] == [4, 4, 4]
+
+    def test_should_merge_deltas_instead_of_states(self):
+        # Build test data
+        counter = GCounter('a')
+        other_counter = GCounter('b')
+
+        # Do
+        deltas = [counter.increment(), counter.increment(3)]
+        changes = [other_counter.merge(delta) for delta in deltas + deltas]
+
+        # Assert
+        assert deltas[-1].counts == {'a': 4}
+        assert changes == [True, True, False, False]
+        assert other_counter.get_value() == 4
+        with pytest.raises(ValueError):
+            counter.increment(-1)
+
+    def test_should_keep_last_write_in_lww_element_set(self):
+        # Build test data
+        element_set = LWWElementSet('a')
+        other_element_set = LWWElementSet('b')
+        element_set.add('x', timestamp=1)
+        other_element_set.remove('x', timestamp=2)
+        other_element_set.add('y', timestamp=2)
+        element_set.remove('y', timestamp=2)
+
+        # Do
+        merge_all([element_set, other_element_set])
+
+        # Assert
+        assert element_set.get_value() == other_element_set.get_value() == {'y'}
+
+    def test_should_let_concurrent_add_win_in_or_set(self):
+        # Build test data
+        element_set = ORSet('a')
+        other_element_set = ORSet('b')
+        other_element_set.merge(element_set.add('x'))
+
+        # Do, 'b' removes the add it saw while 'a' adds 'x' again
+        remove_delta = other_element_set.remove('x')
+        add_delta = element_set.add('x')
+        element_set.merge(remove_delta)
+        other_element_set.merge(add_delta)
+
+        # Assert
+        assert element_set.get_value() == other_element_set.get_value() == {'x'}
+
+    def test_should_remove_observed_elements_in_or_set(self):
+        # Build test data
+        element_set = ORSet('a')
+        other_element_set = ORSet('b')
+        other_element_set.merge(element_set.add('x'))
+        other_element_set.merge(element_set.add('y'))
+
+        # Do
+        element_set.merge(other_element_set.remove('x'))
+        # States delivered again and out of order change nothing
+        changed = other_element_set.merge(element_set.copy())
+
+        # Assert
+        assert not changed
+        assert element_set.get_value() == other_element_set.get_value() == {'y'}
+        assert len(element_set.context) == 1
+
+    def test_should_keep_tombstones_in_lww_map(self):
+        # Build test data
+        lww_map = LWWMap('a')
+        other_lww_map = LWWMap('b')
+        lww_map.set('x', 1, timestamp=1)
+        other_lww_map.remove('x', timestamp=2)
+        other_lww_map.set('y', 2, timestamp=1)
+
+        # Do
+        merge_all([lww_map, other_lww_map])
+        lww_map.merge(LWWMap('c').set('x', 3, timestamp=1))
+
+        # Assert
+        assert lww_map.get_value() == other_lww_map.get_value() == {'y': 2}
+        assert 'x' not in lww_map
+        assert lww_map.get('y') == 2
+
+    def test_should_benchmark_crdts(self):
+        # Do
+        results = benchmark_crdts([2, 4], operation_count=5)
+
+        # Assert
+        assert set(results) == {
+            f'{name}_{replica_count}'
+            for name in ['g_counter', 'pn_counter', 'lww_element_set', 'or_set', 'lww_map']
+            for replica_count in [2, 4]
+        }
+        assert results['g_counter_4']['state_bytes'] > results['g_counter_2']['state_bytes']
+        assert results['or_set_4']['context_entries'] == 4
@@ -0,0 +1,70 @@
+from django.test import TestCase
+
+from apps.gossip_protocol.gossip_protocol import Coordinator
+
+from ..crdts import GCounter, LWWMap, ORSet
+from ..replication import GossipReplicator
+
+
+# Test Utils
+def build_coordinator(node_count: int) -> Coordinator:
+    coordinator = Coordinator(gossip_rate=0)
+    [coordinator.add() for _ in range(node_count)]
+    return coordinator
+
+
+class TestSuite(TestCase):
+    def test_should_converge_through_deltas_and_anti_entropy(self):
+        for crdt_factory in [GCounter, ORSet]:
+            # Build test data
+            coordinator = build_coordinator(32)
+            replicator = GossipReplicator(coordinator, crdt_factory)
+            for index, node in enumerate(coordinator.node_list[:8]):
+                if crdt_factory is GCounter:
+                    replicator.update(node.uuid, lambda replica: replica.increment())
+                else:
+                    replicator.update(node.uuid, lambda replica: replica.add(index))
+
+            # Do
+            result = replicator.run()
+
+            # Assert
+            assert result['converged']
+            for replica in replicator.replicas.values():
+                assert replica.get_value() == (8 if crdt_factory is GCounter else set(range(8)))
+
+    def test_should_only_exchange_different_buckets(self):
+        # Build test data
+        coordinator = build_coordinator(2)
+        node, peer_node = coordinator.node_list
+        replicator = GossipReplicator(coordinator, LWWMap, bucket_count=16)
+        for index in range(100):
+            replicator.update(node.uuid, lambda replica: replica.set(f'key-{index}', index, timestamp=1))
+        replicator.pending_deltas[node.uuid] = []
+        replicator.reconcile(node.uuid, peer_node.uuid)
+        replicator.update(node.uuid, lambda replica: replica.set('key-0', 'new', timestamp=2))
+
+        # Do
+        total_bytes = replicator.total_bytes
+        replicator.reconcile(node.uuid, peer_node.uuid)
+
+        # Assert
+        assert replicator.replicas[peer_node.uuid].get('key-0') == 'new'
+        assert replicator.trees[node.uuid] == replicator.trees[peer_node.uuid]
+        # Only the keys sharing the changed key's bucket, not the whole map
+        assert replicator.total_bytes - total_bytes < replicator.total_bytes / 4
+
+    def test_should_skip_crashed_nodes(self):
+        # Build test data
+        coordinator = build_coordinator(16)
+        crashed_node = coordinator.node_list[0]
+        coordinator.fail(crashed_node)
+        replicator = GossipReplicator(coordinator, GCounter)
+        replicator.update(coordinator.node_list[1].uuid, lambda replica: replica.increment(2))
+
+        # Do
+        result = replicator.run()
+
+        # Assert
+        assert result['converged']
+        assert replicator.replicas[crashed_node.uuid].get_value() == 0
@@ -0,0 +1,182 @@
+import math
+import random
+from typing import Dict, List
+
+from .membership import MembershipTable
+
+
+class PushSumAggregation:
+    """
+    Cluster wide aggregate computed by gossip alone, with push-sum as
+    described by Kempe, Dobra and Gehrke. Every node holds a sum and a
+    weight, and every round keeps an equal share of both and pushes one
+    share to each of 'fanout' random peers. The total of sums and weights
+    never changes, so every node's sum / weight converges to the total
+    sum / total weight in O(log N) rounds:
+    - avg: every node starts with (value, 1)
+    - sum: like avg, but only one node starts with a weight of 1
+    - count: like sum, but every value is 1
+    - min and max: no sums, every node keeps the extreme of its own and
+      of its peers' estimates, push and pull
+    A node considers the aggregate done once its estimate changed less
+    than 'precision', relative to it, for 'STABLE_ROUNDS' rounds in a row.
+    Only the nodes alive at the start take part.
+    """
+
+    # Attributes
+    members: MembershipTable
+    sums: Dict[int, float]
+    weights: Dict[int, float]
+    estimates: Dict[int, float]  # Uuid -> current estimate, NaN while a node has no weight
+    stable_rounds: Dict[int, int]  # Uuid -> consecutive rounds within 'precision'
+    rounds: List[Dict[str, float]]  # Convergence metrics of every round
+    total_messages: int
+
+    # Tunable Config
+    function: str
+    fanout: int
+    precision: float
+    max_rounds: int
+
+    # Constants
+    STABLE_ROUNDS = 3
+
+    # Functions
+    AVG = 'avg'
+    SUM = 'sum'
+    COUNT = 'count'
+    MIN = 'min'
+    MAX = 'max'
+    FUNCTIONS = (AVG, SUM, COUNT, MIN, MAX)
+
+    def __init__(
+        self,
+        members: MembershipTable,
+        values: Dict[int, float],
+        function: str = AVG,
+        fanout: int = 1,
+        precision: float = 1e-6,
+        max_rounds: int = 200,
+    ):
+        self.members = members
+        self.function = function
+        self.fanout = fanout
+        self.precision = precision
+        self.max_rounds = max_rounds
+        self._perform_validations(values)
+
+        uuids = [node.uuid for node in members if node.alive]
+        if function == self.COUNT:
+            values = dict.fromkeys(uuids, 1.0)
+        self.sums = {uuid: float(values[uuid]) for uuid in uuids}
+        self.weights = dict.fromkeys(uuids, 1.0)
+        if function in (self.SUM, self.COUNT):
+            # A single unit of weight in the whole cluster, so sum / weight is the total
+            self.weights = dict.fromkeys(uuids, 0.0)
+            self.weights[random.choice(uuids)] = 1.0
+
+        self.estimates = {uuid: self._get_estimate(uuid) for uuid in uuids}
+        self.stable_rounds = dict.fromkeys(uuids, 0)
+        self.rounds = []
+        self.total_messages = 0
+
+    def gossip_round(self):
+        if self.function in (self.MIN, self.MAX):
+            self._exchange_extremes()
+        else:
+            self._push_shares()
+
+        changes = []
+        for uuid, estimate in self.estimates.items():
+            new_estimate = self._get_estimate(uuid)
+            change = abs(new_estimate - estimate) / max(abs(new_estimate), 1e-12)
+            if math.isnan(change):
+                change = math.inf
+            self.stable_rounds[uuid] = self.stable_rounds[uuid] + 1 if change <= self.precision else 0
+            self.estimates[uuid] = new_estimate
+            changes.append(change)
+
+        known_estimates = [estimate for estimate in self.estimates.values() if not math.isnan(estimate)]
+        self.rounds.append({
+            'max_change': max(changes),
+            'spread': max(known_estimates) - min(known_estimates) if known_estimates else math.inf,
+            'stable_nodes': sum(1 for count in self.stable_rounds.values() if count >= self.STABLE_ROUNDS),
+        })
+
+    def is_converged(self) -> bool:
+        return all(count >= self.STABLE_ROUNDS for count in self.stable_rounds.values())
+
+    def run(self) -> Dict:
+        while len(self.rounds) < self.max_rounds and not self.is_converged():
+            self.gossip_round()
+
+        return {
+            'function': self.function,
+            'rounds': len(self.rounds),
+            'converged': self.is_converged(),
+            'estimates': dict(self.estimates),
+            'metrics': self.rounds,
+            'messages': self.total_messages,
+        }
+
+    def _push_shares(self):
+        sums = dict.fromkeys(self.sums, 0.0)
+        weights = dict.fromkeys(self.weights, 0.0)
+        for node in self._get_participants():
+            peers = [peer for peer in self.members.sample(self.fanout, exclude=node) if self._is_participant(peer)]
+            share_count = len(peers) + 1
+            sum_share = self.sums[node.uuid] / share_count
+            weight_share = self.weights[node.uuid] / share_count
+            # A share nobody could receive stays with the node, so no mass is lost
+            for uuid in [node.uuid, *(peer.uuid for peer in peers)]:
+                sums[uuid] += sum_share
+                weights[uuid] += weight_share
+            self.total_messages += len(peers)
+
+        self.sums = sums
+        self.weights = weights
+
+    def _exchange_extremes(self):
+        extreme = min if self.function == self.MIN else max
+        sums = dict(self.sums)
+        for node in self._get_participants():
+            for peer in self.members.sample(self.fanout, exclude=node):
+                if not self._is_participant(peer):
+                    continue
+                # Estimates of the start of the round, so nothing travels more than one hop per round
+                sums[node.uuid] = extreme(sums[node.uuid], self.sums[peer.uuid])
+                sums[peer.uuid] = extreme(sums[peer.uuid], self.sums[node.uuid])
+                self.total_messages += 2
+
+        self.sums = sums
+
+    def _get_participants(self) -> List:
+        return [node for node in self.members if self._is_participant(node)]
+
+    def _is_participant(self, node) -> bool:
+        return node.alive and node.uuid in self.sums
+
+    def _get_estimate(self, uuid: int) -> float:
+        if self.function in (self.MIN, self.MAX):
+            return self.sums[uuid]
+
+        weight = self.weights[uuid]
+        return self.sums[uuid] / weight if weight else math.nan
+
+    def _perform_validations(self, values: Dict[int, float]):
+        if self.function not in self.FUNCTIONS:
+            error_message = f'Unknown aggregate function: {self.function}. Use one of {self.FUNCTIONS}'
+            raise ValueError(error_message)
+
+        if self.precision <= 0:
+            error_message = f'Precision must be positive, got {self.precision}'
+            raise ValueError(error_message)
+
+        if not any(node.alive for node in self.members):
+            error_message = 'There are no alive nodes to aggregate over'
+            raise ValueError(error_message)
+
+        missing_count = sum(1 for node in self.members if node.alive and node.uuid not in values)
+        if self.function != self.COUNT and missing_count:
+            error_message = f'Missing values of {missing_count} nodes'
+            raise ValueError(error_message)
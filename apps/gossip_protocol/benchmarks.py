@@ -0,0 +1,62 @@
+# src/gossip_protocol/benchmarks.py
+import argparse
+import json
+import math
+from typing import Dict, Sequence
+
+from .gossip_protocol import Coordinator
+from .simulator import GossipSimulator
+from .transport import run_cluster
+
+DEFAULT_NODE_COUNTS = (1_000, 10_000, 100_000)
+DEFAULT_CLUSTER_SIZES = (4, 8, 16)
+
+
+def benchmark_simulator(node_counts: Sequence[int] = DEFAULT_NODE_COUNTS, seed: int = 0) -> Dict[str, Dict]:
+    """
+    Rounds, messages and wall time to converge in every gossip mode,
+    next to log2(N), the rounds an epidemic needs in theory.
+    """
+    results = {}
+    for node_count in node_counts:
+        for mode in Coordinator.MODES:
+            convergence = GossipSimulator(node_count, mode=mode, seed=seed).run()
+            results[f'{mode}_{node_count}'] = {
+                'rounds': convergence['rounds'],
+                'log2_nodes': math.log2(node_count),
+                'converged': convergence['converged'],
+                'simulated_seconds': convergence['seconds'],
+                'wall_seconds': convergence['wall_seconds'],
+                'messages_per_node': convergence['messages'] / node_count,
+            }
+    return results
+
+
+def benchmark_cluster(cluster_sizes: Sequence[int] = DEFAULT_CLUSTER_SIZES, duration: float = 3.0) -> Dict[str, Dict]:
+    """
+    Time to full membership and traffic of real localhost clusters,
+    one process per node.
+    """
+    results = {}
+    for node_count in cluster_sizes:
+        result = run_cluster(node_count, duration)
+        stats = result['stats']
+        results[f'cluster_{node_count}'] = {
+            'converged': result['converged'],
+            'membership_seconds': result['membership_seconds'],
+            'bytes_per_node_second': stats['bytes_sent'] / node_count / duration,
+            'messages_per_packet': stats['messages_sent'] / (stats['datagrams_sent'] + stats.get('frames_sent', 0)),
+        }
+    return results
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Gossip convergence benchmark, simulated and on localhost clusters.')
+    parser.add_argument('--nodes', type=int, nargs='+', default=DEFAULT_NODE_COUNTS)
+    parser.add_argument(
+        '--clusters', type=int, nargs='*', default=DEFAULT_CLUSTER_SIZES, help='Localhost cluster sizes'
+    )
+    arguments = parser.parse_args()
+
+    print(json.dumps(benchmark_simulator(arguments.nodes), indent=2))
+    print(json.dumps(benchmark_cluster(arguments.clusters), indent=2))
@@ -0,0 +1,125 @@
+import math
+from collections import deque
+from typing import Deque, Dict, List
+
+
+class PhiAccrualFailureDetector:
+    """
+    Phi accrual failure detector, as described by Hayashibara et al.
+    Instead of a fixed timeout, keeps the heartbeat inter-arrival times
+    of every peer and turns the time since its last heartbeat into 'phi',
+    a suspicion level on a log10 scale. A phi of 1 means a 10% chance
+    that the heartbeat is just late, 2 means 1%, 3 means 0.1% and so on.
+    """
+
+    # Attributes
+    arrivals: Dict[int, float]  # Peer -> time of its last heartbeat
+    intervals: Dict[int, Deque[float]]  # Peer -> last 'window_size' inter-arrival times
+    interval_sums: Dict[int, List[float]]  # Peer -> [sum, sum of squares] of its intervals
+    statuses: Dict[int, str]
+
+    # Tunable Config
+    window_size: int
+    min_std_seconds: float
+    acceptable_pause_seconds: float
+    first_heartbeat_seconds: float
+    suspect_threshold: float
+    dead_threshold: float
+
+    # Statuses
+    ALIVE = 'alive'
+    SUSPECT = 'suspect'
+    DEAD = 'dead'
+
+    def __init__(
+        self,
+        window_size: int = 100,
+        min_std_seconds: float = 0.5,
+        acceptable_pause_seconds: float = 0.0,
+        first_heartbeat_seconds: float = 1.0,
+        suspect_threshold: float = 5.0,
+        dead_threshold: float = 8.0,
+    ):
+        self.arrivals = {}
+        self.intervals = {}
+        self.interval_sums = {}
+        self.statuses = {}
+        self.window_size = window_size
+        # Floor of the standard deviation, so very regular heartbeats do not make phi explode
+        self.min_std_seconds = min_std_seconds
+        # Extra delay tolerated on top of the mean interval, e.g. for GC pauses
+        self.acceptable_pause_seconds = acceptable_pause_seconds
+        # Interval assumed before the second heartbeat of a peer arrives
+        self.first_heartbeat_seconds = first_heartbeat_seconds
+        self.suspect_threshold = suspect_threshold
+        self.dead_threshold = dead_threshold
+        self._perform_validations()
+
+    def heartbeat(self, uuid: int, now: float):
+        """
+        Records a sign of life of a peer, which revives it if it was dead.
+        """
+        last_arrival = self.arrivals.get(uuid)
+        if last_arrival is None:
+            self.intervals[uuid] = deque()
+            self.interval_sums[uuid] = [0.0, 0.0]
+            self._add_interval(uuid, self.first_heartbeat_seconds)
+        else:
+            self._add_interval(uuid, now - last_arrival)
+
+        self.arrivals[uuid] = now
+        self.statuses[uuid] = self.ALIVE
+
+    def get_phi(self, uuid: int, now: float) -> float:
+        last_arrival = self.arrivals.get(uuid)
+        if last_arrival is None:
+            return 0.0
+
+        interval_count = len(self.intervals[uuid])
+        interval_sum, interval_square_sum = self.interval_sums[uuid]
+        mean = interval_sum / interval_count + self.acceptable_pause_seconds
+        variance = max(interval_square_sum / interval_count - (interval_sum / interval_count) ** 2, 0.0)
+        std = max(math.sqrt(variance), self.min_std_seconds)
+
+        # Logistic approximation of the normal distribution's tail, as used by Akka and Cassandra
+        elapsed = now - last_arrival
+        y = (elapsed - mean) / std
+        e = math.exp(-y * (1.5976 + 0.070566 * y * y))
+        if elapsed > mean:
+            return -math.log10(e / (1.0 + e))
+        return -math.log10(1.0 - 1.0 / (1.0 + e))
+
+    def get_status(self, uuid: int, now: float) -> str:
+        status = self.statuses.get(uuid, self.ALIVE)
+        if status != self.DEAD and self.get_phi(uuid, now) >= self.suspect_threshold:
+            status = self.statuses[uuid] = self.SUSPECT
+        return status
+
+    def is_dead(self, uuid: int, now: float) -> bool:
+        return self.get_phi(uuid, now) >= self.dead_threshold
+
+    def mark_dead(self, uuid: int):
+        self.statuses[uuid] = self.DEAD
+
+    def _add_interval(self, uuid: int, interval: float):
+        intervals = self.intervals[uuid]
+        interval_sums = self.interval_sums[uuid]
+        if len(intervals) == self.window_size:
+            oldest_interval = intervals.popleft()
+            interval_sums[0] -= oldest_interval
+            interval_sums[1] -= oldest_interval ** 2
+
+        intervals.append(interval)
+        interval_sums[0] += interval
+        interval_sums[1] += interval ** 2
+
+    def _perform_validations(self):
+        if self.window_size < 1:
+            error_message = f'Window size must be at least 1, got {self.window_size}'
+            raise ValueError(error_message)
+
+        if not 0 < self.suspect_threshold <= self.dead_threshold:
+            error_message = (
+                f'Thresholds must satisfy 0 < suspect <= dead, got {self.suspect_threshold} and {self.dead_threshold}'
+            )
+            raise ValueError(error_message)
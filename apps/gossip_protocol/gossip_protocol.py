@@ -1,8 +1,16 @@
 import asyncio
 import math
 import random
+import struct
+import time
+from collections import deque
 from datetime import datetime
-from typing import Dict, Tuple, List
+from typing import Callable, Deque, Dict, Tuple, List
+from uuid import uuid4
+
+from .aggregates import PushSumAggregation
+from .failure_detectors import PhiAccrualFailureDetector
+from .membership import MembershipTable
 
 
 class Node:
@@ -13,13 +21,18 @@ class Node:
     # Attributes
     uuid: int
     registry: Dict[int, Tuple[int, datetime]]
+    detector: PhiAccrualFailureDetector
+    alive: bool  # False once crashed, a crashed node neither heartbeats nor gossips
 
     # Tunable Config
     heartbeat_rate: int
 
-    def __init__(self):
-        self.uuid = hash(self)
+    def __init__(self, detector: PhiAccrualFailureDetector | None = None, uuid: int | None = None):
+        # Random 63 bits, unique across processes and packable as a signed 64 bit integer
+        self.uuid = uuid4().int >> 65 if uuid is None else uuid
         self.registry = {}
+        self.detector = detector or PhiAccrualFailureDetector()
+        self.alive = True
         self.heartbeat_rate = random.randint(self.HEARTBEAT_RATE_MIN_SECONDS, self.HEARTBEAT_RATE_MAX_SECONDS)
         self.registry[self.uuid] = (0, datetime.utcnow())
 
@@ -32,97 +45,357 @@ class Node:
     def heartbeat(self):
         self.registry[self.uuid] = (self.registry[self.uuid][0] + 1, datetime.utcnow())
 
+    def get_digest(self) -> Dict[int, int]:
+        """
+        Summary of the registry, the heartbeat counter known for every node.
+        """
+        return {uuid: counter for uuid, (counter, _) in self.registry.items()}
+
+    def get_delta(self, digest: Dict[int, int]) -> Dict[int, Tuple[int, datetime]]:
+        """
+        Entries newer than the ones in a peer's 'digest'.
+        """
+        return {uuid: entry for uuid, entry in self.registry.items() if entry[0] > digest.get(uuid, -1)}
+
+    def merge(self, entries: Dict[int, Tuple[int, datetime]], now: float | None = None) -> int:
+        """
+        Keeps the entry with the highest heartbeat counter of every node,
+        a higher counter is a heartbeat for the failure detector.
+        Returns how many entries were updated.
+        """
+        now = time.monotonic() if now is None else now
+        updated_count = 0
+        for uuid, entry in entries.items():
+            current_entry = self.registry.get(uuid)
+            if current_entry is None or entry[0] > current_entry[0]:
+                self.registry[uuid] = entry
+                updated_count += 1
+                if uuid != self.uuid:
+                    self.detector.heartbeat(uuid, now)
+        return updated_count
+
 
 class Coordinator:
+    """
+    Round based epidemic gossip. Every round, all nodes gossip at the
+    same time with 'fanout' random peers, pushing their registry, pulling
+    the peer's one or both. Membership spreads in O(log N) rounds.
+    With 'delta', the receiving side first sends a digest of the
+    counters it knows and only newer entries are sent back, instead of
+    the whole registry.
+    Every node runs its own failure detector over the heartbeats it
+    learns about. A suspect peer is probed directly and through
+    'probe_count' random peers, SWIM style, and declared dead only if
+    no ack comes back, so no central monitor is needed.
+    """
+
     # Attributes
-    node_list: List[Node]
-    node_map: Dict[int, Node]
-    node_queue: asyncio.Queue
+    members: MembershipTable
     subset_amount: int
     total_gossips: int
-    gossip_history = []
+    total_rounds: int
+    total_bytes: int  # Payload of every digest and entry sent
+    total_probes: int
+    convergence: Dict  # Rounds, wall time and per round coverage of the last run
+    failure_times: Dict[int, float]  # Crashed node -> time of the crash
+    detections: List[Tuple[int, int, float]]  # (Observer, declared dead node, time of the declaration)
+    gossip_history: Deque[Tuple[int, int]]  # (Gossiper, receiver) uuids of the last 'HISTORY_LIMIT' gossips
+
+    # Tunable Config
+    fanout: int
+    mode: str
+    gossip_rate: float
+    max_rounds: int
+    delta: bool
+    probe_count: int
+    message_loss: float
+    detector_factory: Callable[[], PhiAccrualFailureDetector]
 
     # Constants
     SUBSET_STEP = 5
     GOSSIP_LIMIT = 25
     GOSSIP_RATE = 1
-    DEFAULT_QUEUE_SIZE = 50
+    DEFAULT_FANOUT = 2
+    DEFAULT_PROBE_COUNT = 3
+    HISTORY_LIMIT = 1000
+    DIGEST_ENTRY_BYTES = struct.calcsize('!qQ')  # uuid, counter
+    REGISTRY_ENTRY_BYTES = struct.calcsize('!qQd')  # uuid, counter, timestamp
+
+    # Modes
+    PUSH = 'push'
+    PULL = 'pull'
+    PUSH_PULL = 'push_pull'
+    MODES = (PUSH, PULL, PUSH_PULL)
 
-    def __init__(self, queue_size=DEFAULT_QUEUE_SIZE):
-        self.node_list = []
-        self.node_map = {}
-        self.node_queue = asyncio.Queue(maxsize=queue_size)
+    def __init__(
+        self,
+        fanout: int = DEFAULT_FANOUT,
+        mode: str = PUSH_PULL,
+        gossip_rate: float = GOSSIP_RATE,
+        max_rounds: int = GOSSIP_LIMIT,
+        delta: bool = True,
+        probe_count: int = DEFAULT_PROBE_COUNT,
+        message_loss: float = 0.0,
+        detector_factory: Callable[[], PhiAccrualFailureDetector] = PhiAccrualFailureDetector,
+    ):
+        self.members = MembershipTable()
+        self.gossip_history = deque(maxlen=self.HISTORY_LIMIT)
         self.subset_amount = 1
         self.total_gossips = 0
+        self.total_rounds = 0
+        self.total_bytes = 0
+        self.total_probes = 0
+        self.convergence = {}
+        self.failure_times = {}
+        self.detections = []
+        self.fanout = fanout
+        self.mode = mode
+        # Seconds between rounds
+        self.gossip_rate = gossip_rate
+        self.max_rounds = max_rounds
+        self.delta = delta
+        self.probe_count = probe_count
+        # Chance of every gossip or probe message being dropped
+        self.message_loss = message_loss
+        self.detector_factory = detector_factory
+        self._perform_validations()
 
-    def add(self):
-        node = Node()
-        self.node_list.append(node)
-        self.node_map[node.uuid] = node
+    @property
+    def node_list(self) -> List[Node]:
+        return self.members.nodes
+
+    def add(self) -> Node:
+        node = Node(self.detector_factory())
+        self.members.add(node)
         # Update node count that each node holds in their registry
-        self.subset_amount = math.ceil(len(self.node_list) / self.SUBSET_STEP)
+        self.subset_amount = math.ceil(len(self.members) / self.SUBSET_STEP)
+        return node
 
-    def remove(self, node):
-        self.node_list.remove(node)
-        self.node_map.pop(node)
+    def remove(self, node: Node):
+        self.members.remove(node.uuid)
         # Update node count that each node holds in their registry
-        self.subset_amount = math.ceil(len(self.node_list) / self.SUBSET_STEP)
+        self.subset_amount = math.ceil(len(self.members) / self.SUBSET_STEP)
+
+    def fail(self, node: Node):
+        """
+        Crashes a node, the rest of the cluster has to find out by itself.
+        """
+        node.alive = False
+        self.failure_times[node.uuid] = time.monotonic()
+
+    def select_peers(self, node: Node) -> List[Node]:
+        return self.members.sample(self.fanout, exclude=node)
+
+    def get_coverage(self) -> float:
+        """
+        Fraction of the membership known by the average node.
+        """
+        node_count = len(self.members)
+        if not node_count:
+            return 1.0
+        known_count = sum(
+            sum(1 for uuid in node.registry if uuid in self.members) for node in self.members
+        )
+        return known_count / node_count ** 2
+
+    def is_converged(self) -> bool:
+        member_uuids = self.members.positions.keys()
+        return all(len(node.registry.keys() & member_uuids) == len(member_uuids) for node in self.members)
 
     async def heartbeat_task(self, node):
         while True:
-            node.heartbeat()
+            if node.alive:
+                node.heartbeat()
             print(f' [Heartbeater {node}] Sleeping {node.heartbeat_rate} seconds')
             await asyncio.sleep(node.heartbeat_rate)
 
-    async def gossip_worker(self):
-        while True:
-            gossiper_node = self.gossip_history[-1]
-            receiver_node = await self.node_queue.get()
+    async def gossip(self, gossiper_node: Node, receiver_node: Node, merges: List[Tuple[Node, Dict]]):
+        """
+        Exchanges registries, queueing the entries every node receives in
+        'merges' instead of merging them right away.
+        """
+        self.total_gossips += 1
+        self.gossip_history.append((gossiper_node.uuid, receiver_node.uuid))
+        if not receiver_node.alive:
+            return
 
-            print(f' [Gossiper {gossiper_node}] Gossiping {len(gossiper_node.registry)} nodes info to {receiver_node}...')
+        if self.mode in (self.PUSH, self.PUSH_PULL):
+            merges.append((receiver_node, self.send(gossiper_node, receiver_node)))
+        if self.mode in (self.PULL, self.PUSH_PULL):
+            merges.append((gossiper_node, self.send(receiver_node, gossiper_node)))
 
-            # Gossip
-            self.total_gossips += 1
-            receiver_node.registry.update(gossiper_node.registry)
+    def send(self, sender_node: Node, receiver_node: Node) -> Dict[int, Tuple[int, datetime]]:
+        """
+        The entries the receiver is missing, or the whole registry
+        without 'delta', nothing if the message is lost.
+        """
+        if self.is_lost():
+            return {}
 
-            # Delay
-            await asyncio.sleep(self.GOSSIP_RATE)
+        digest = {}
+        if self.delta:
+            digest = receiver_node.get_digest()
+            self.total_bytes += len(digest) * self.DIGEST_ENTRY_BYTES
 
-            # Receiver becomes gossiper
-            self.gossip_history.append(receiver_node)
+        entries = sender_node.get_delta(digest)
+        self.total_bytes += len(entries) * self.REGISTRY_ENTRY_BYTES
+        return entries
 
-            # Choose next receiver
-            if self.total_gossips < self.GOSSIP_LIMIT:
-                exclude_list = [gossiper_node, receiver_node]
-                self.node_queue.put_nowait(
-                    random.choice([node for node in self.node_list if node not in exclude_list])
-                )
+    def is_lost(self) -> bool:
+        return self.message_loss > 0 and random.random() < self.message_loss
 
-            # Signal for next task
-            self.node_queue.task_done()
+    def probe(self, node: Node, target_uuid: int) -> bool:
+        """
+        Pings a suspect node directly, then asks 'probe_count' random
+        peers to ping it on the node's behalf. True if any ack comes back.
+        """
+        self.total_probes += 1
+        target_node = self.members.get(target_uuid)
+        if target_node is None or not target_node.alive:
+            return False
 
-    async def process(self):
-        # Select the initial node that will gossip
-        initial_gossiper_node = random.choice(self.node_list)
-        self.gossip_history.append(initial_gossiper_node)
+        # Ping and ack
+        if not any(self.is_lost() for _ in range(2)):
+            return True
 
-        # Select the initial node that will receive the gossip
-        initial_receiver_node = random.choice([node for node in self.node_list if node != initial_gossiper_node])
+        helper_uuids = [uuid for uuid in node.registry if uuid not in (node.uuid, target_uuid) and uuid in self.members]
+        for helper_uuid in random.sample(helper_uuids, min(self.probe_count, len(helper_uuids))):
+            # Ping request, ping, ack and ack forward
+            if self.members.get(helper_uuid).alive and not any(self.is_lost() for _ in range(4)):
+                return True
+        return False
 
-        # Use the asyncio.Queue to handle adding next receiver node dynamically
-        self.node_queue.put_nowait(initial_receiver_node)
+    def check_peers(self, node: Node, now: float):
+        """
+        Probes the peers the node's failure detector suspects. An ack
+        counts as a heartbeat, without one a peer whose phi reached the
+        dead threshold is declared dead.
+        """
+        detector = node.detector
+        for uuid in node.registry:
+            if uuid == node.uuid or detector.get_status(uuid, now) != detector.SUSPECT:
+                continue
 
-        # Schedule one gossiper task and a heartbeat task per node
-        tasks = [asyncio.create_task(self.gossip_worker())]
-        for node in self.node_list:
-            tasks.append(asyncio.create_task(self.heartbeat_task(node)))
+            if self.probe(node, uuid):
+                detector.heartbeat(uuid, now)
+            elif detector.is_dead(uuid, now):
+                detector.mark_dead(uuid)
+                self.detections.append((node.uuid, uuid, now))
 
-        # Once the queue is processed, cancel all running tasks
-        await self.node_queue.join()
-        for task in tasks:
+    def aggregate(
+        self, values: Dict[int, float], function: str = PushSumAggregation.AVG, precision: float = 1e-6
+    ) -> Dict:
+        """
+        Computes 'function' of the nodes' 'values', keyed by uuid, by
+        push-sum gossip between the nodes, see 'PushSumAggregation'.
+        """
+        return PushSumAggregation(self.members, values, function, fanout=self.fanout, precision=precision).run()
+
+    def get_failure_report(self) -> Dict:
+        """
+        Detection times of the crashed nodes, from the crash to the first
+        and to the last live node declaring it dead, and the false positives.
+        """
+        detection_seconds = {}
+        false_positive_count = 0
+        for _, uuid, detection_time in self.detections:
+            if uuid in self.failure_times:
+                detection_seconds.setdefault(uuid, []).append(detection_time - self.failure_times[uuid])
+            else:
+                false_positive_count += 1
+
+        live_count = sum(1 for node in self.members if node.alive)
+        first_seconds = [min(seconds) for seconds in detection_seconds.values()]
+        last_seconds = [max(seconds) for uuid, seconds in detection_seconds.items() if len(seconds) >= live_count]
+        return {
+            'failures': len(self.failure_times),
+            'detected': len(detection_seconds),
+            'fully_detected': len(last_seconds),
+            'first_detection_seconds': max(first_seconds, default=None),
+            'full_detection_seconds': max(last_seconds, default=None),
+            'false_positives': false_positive_count,
+            'false_positive_rate': false_positive_count / len(self.detections) if self.detections else 0.0,
+            'probes': self.total_probes,
+        }
+
+    async def gossip_round(self):
+        # Every node gossips at the same time, so exchanges read the registries
+        # of the start of the round and merges wait until all of them are done
+        merges = []
+        gossips = [
+            self.gossip(gossiper_node, receiver_node, merges)
+            for gossiper_node in self.members
+            if gossiper_node.alive
+            for receiver_node in self.select_peers(gossiper_node)
+        ]
+        await asyncio.gather(*gossips)
+        self.total_rounds += 1
+
+        now = time.monotonic()
+        for node, entries in merges:
+            node.merge(entries, now)
+        for node in self.members:
+            if node.alive:
+                self.check_peers(node, now)
+
+    async def gossip_worker(self, duration: float | None = None):
+        """
+        Gossips until converged or, with a 'duration' in seconds, until it elapses.
+        The coverage and bytes of every round are kept in 'convergence'.
+        """
+        start_time = time.perf_counter()
+        coverage = [self.get_coverage()]
+        round_bytes = []
+
+        rounds = 0
+        while rounds < self.max_rounds:
+            if duration is None and self.is_converged():
+                break
+            if duration is not None and time.perf_counter() - start_time >= duration:
+                break
+
+            total_bytes = self.total_bytes
+            await self.gossip_round()
+            rounds += 1
+            coverage.append(self.get_coverage())
+            round_bytes.append(self.total_bytes - total_bytes)
+
+            # Delay
+            await asyncio.sleep(self.gossip_rate)
+
+        self.convergence = {
+            'rounds': rounds,
+            'seconds': time.perf_counter() - start_time,
+            'converged': self.is_converged(),
+            'coverage': coverage,
+            'bytes': round_bytes,
+        }
+        return self.convergence
+
+    async def process(self, duration: float | None = None):
+        # Schedule the gossip rounds and a heartbeat task per node
+        heartbeat_tasks = [asyncio.create_task(self.heartbeat_task(node)) for node in self.members]
+
+        # Once converged, cancel all running tasks
+        convergence = await self.gossip_worker(duration)
+        for task in heartbeat_tasks:
             task.cancel()
 
-        await asyncio.gather(*tasks, return_exceptions=True)
+        await asyncio.gather(*heartbeat_tasks, return_exceptions=True)
+        return convergence
+
+    def run(self, duration: float | None = None):
+        return asyncio.run(self.process(duration))
+
+    def _perform_validations(self):
+        if self.mode not in self.MODES:
+            error_message = f'Unknown gossip mode: {self.mode}. Use one of {self.MODES}'
+            raise ValueError(error_message)
+
+        if self.fanout < 1:
+            error_message = f'Fanout must be at least 1, got {self.fanout}'
+            raise ValueError(error_message)
 
-    def run(self):
-        asyncio.run(self.process())
+        if not 0 <= self.message_loss < 1:
+            error_message = f'Message loss must be in [0, 1), got {self.message_loss}'
+            raise ValueError(error_message)
@@ -0,0 +1,69 @@
+import random
+from typing import TYPE_CHECKING, Dict, Iterator, List
+
+if TYPE_CHECKING:
+    from .gossip_protocol import Node
+
+
+class MembershipTable:
+    """
+    Nodes of the cluster in an array, plus the position of every uuid in
+    it, so adding, removing and sampling a node are all O(1). Removing a
+    node moves the last one into its slot instead of shifting the array.
+    """
+
+    # Attributes
+    nodes: List['Node']
+    positions: Dict[int, int]  # Uuid -> index in 'nodes'
+
+    def __init__(self):
+        self.nodes = []
+        self.positions = {}
+
+    def __len__(self) -> int:
+        return len(self.nodes)
+
+    def __iter__(self) -> Iterator['Node']:
+        return iter(self.nodes)
+
+    def __contains__(self, uuid: int) -> bool:
+        return uuid in self.positions
+
+    def get(self, uuid: int) -> 'Node | None':
+        position = self.positions.get(uuid)
+        return None if position is None else self.nodes[position]
+
+    def add(self, node: 'Node'):
+        if node.uuid in self.positions:
+            error_message = f'Node {node.uuid} is already a member'
+            raise ValueError(error_message)
+
+        self.positions[node.uuid] = len(self.nodes)
+        self.nodes.append(node)
+
+    def remove(self, uuid: int) -> 'Node':
+        position = self.positions.pop(uuid)
+        node = self.nodes[position]
+        last_node = self.nodes.pop()
+        if last_node is not node:
+            self.nodes[position] = last_node
+            self.positions[last_node.uuid] = position
+        return node
+
+    def sample(self, count: int, exclude: 'Node | None' = None) -> List['Node']:
+        """
+        Up to 'count' distinct random nodes, never 'exclude'. Draws random
+        positions until enough distinct nodes are picked, which takes
+        O(count) draws while 'count' is at most half of the members.
+        """
+        available_count = len(self.nodes) - (1 if exclude is not None and exclude.uuid in self.positions else 0)
+        count = min(count, available_count)
+        if 2 * count > available_count:
+            return random.sample([node for node in self.nodes if node is not exclude], count)
+
+        picked_nodes = {}
+        while len(picked_nodes) < count:
+            node = self.nodes[random.randrange(len(self.nodes))]
+            if node is not exclude:
+                picked_nodes[node.uuid] = node
+        return list(picked_nodes.values())
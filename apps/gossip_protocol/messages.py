@@ -0,0 +1,78 @@
+import socket
+import struct
+from datetime import datetime
+from typing import Dict, List, NamedTuple, Tuple
+
+Address = Tuple[str, int]
+
+# Message types of a digest exchange, as in Cassandra's gossip
+SYN = 1  # Digest of the sender
+ACK = 2  # Entries newer than the SYN's digest, plus the sender's digest
+ACK2 = 3  # Entries newer than the ACK's digest
+
+# Type, sender uuid, sender IPv4 and port, digest and delta entry counts
+HEADER = struct.Struct('!Bq4sHHH')
+# Uuid, heartbeat counter
+DIGEST_ENTRY = struct.Struct('!qQ')
+# Uuid, heartbeat counter, timestamp, IPv4 and port of the node
+DELTA_ENTRY = struct.Struct('!qQd4sH')
+
+
+class Message(NamedTuple):
+    type: int
+    sender_uuid: int
+    sender_address: Address
+    digest: Dict[int, int]
+    delta: Dict[int, Tuple[int, datetime]]
+    addresses: Dict[int, Address]  # Address of every node in 'delta'
+
+
+def encode_message(
+    message_type: int,
+    sender_uuid: int,
+    sender_address: Address,
+    digest: Dict[int, int],
+    delta: Dict[int, Tuple[int, datetime]],
+    addresses: Dict[int, Address],
+) -> bytes:
+    """
+    Packs a message into fixed size big endian fields, 19 bytes of header,
+    16 bytes per digest entry and 30 bytes per delta entry.
+    """
+    host, port = sender_address
+    parts = [HEADER.pack(message_type, sender_uuid, socket.inet_aton(host), port, len(digest), len(delta))]
+    parts.extend(DIGEST_ENTRY.pack(uuid, counter) for uuid, counter in digest.items())
+    for uuid, (counter, timestamp) in delta.items():
+        host, port = addresses[uuid]
+        parts.append(DELTA_ENTRY.pack(uuid, counter, timestamp.timestamp(), socket.inet_aton(host), port))
+    return b''.join(parts)
+
+
+def decode_messages(data: bytes) -> List[Message]:
+    """
+    Unpacks every message of a batch, messages are simply concatenated.
+    """
+    messages = []
+    offset = 0
+    while offset < len(data):
+        header = HEADER.unpack_from(data, offset)
+        message_type, sender_uuid, sender_host, sender_port, digest_count, delta_count = header
+        offset += HEADER.size
+
+        digest = {}
+        for uuid, counter in DIGEST_ENTRY.iter_unpack(data[offset:offset + digest_count * DIGEST_ENTRY.size]):
+            digest[uuid] = counter
+        offset += digest_count * DIGEST_ENTRY.size
+
+        delta = {}
+        addresses = {}
+        for uuid, counter, timestamp, host, port in DELTA_ENTRY.iter_unpack(
+            data[offset:offset + delta_count * DELTA_ENTRY.size]
+        ):
+            delta[uuid] = (counter, datetime.fromtimestamp(timestamp))
+            addresses[uuid] = (socket.inet_ntoa(host), port)
+        offset += delta_count * DELTA_ENTRY.size
+
+        sender_address = (socket.inet_ntoa(sender_host), sender_port)
+        messages.append(Message(message_type, sender_uuid, sender_address, digest, delta, addresses))
+    return messages
@@ -0,0 +1,192 @@
+import heapq
+import itertools
+import time
+from typing import Callable, Dict, List, Sequence, Tuple
+
+import numpy as np
+
+from .gossip_protocol import Coordinator
+
+# Set bits of every byte value, to count the rumors known by a node
+POPCOUNT_TABLE = np.array([bin(value).count('1') for value in range(256)], dtype=np.uint8)
+
+
+def popcount(values: np.ndarray) -> int:
+    return int(POPCOUNT_TABLE[values.view(np.uint8)].sum(dtype=np.int64))
+
+
+class GossipSimulator:
+    """
+    Gossip simulation on a virtual clock, for clusters far larger than
+    'Coordinator' can handle. Instead of a registry per node, 'known'
+    holds one bit per tracked rumor, e.g. a membership update started by
+    'rumor_count' random nodes, so every round is a few array operations
+    and no time is spent sleeping. With at most 64 nodes every node's own
+    entry is tracked, which is exactly membership convergence.
+    Crashes are scheduled events, applied when the clock reaches them.
+    """
+
+    # Attributes
+    clock: float  # Virtual seconds
+    rounds: int
+    known: np.ndarray  # Bitmask of the rumors known by every node
+    alive: np.ndarray
+    total_messages: int
+    convergence: Dict  # Rounds, virtual and wall time and per round coverage of the last run
+    _events: List[Tuple[float, int, Callable[[], None]]]  # Heap of (time, sequence, action)
+
+    # Tunable Config
+    node_count: int
+    fanout: int
+    mode: str
+    gossip_rate: float
+    max_rounds: int
+    message_loss: float
+    rumor_count: int
+
+    # Constants
+    MAX_RUMORS = 64
+
+    def __init__(
+        self,
+        node_count: int,
+        fanout: int = Coordinator.DEFAULT_FANOUT,
+        mode: str = Coordinator.PUSH_PULL,
+        gossip_rate: float = Coordinator.GOSSIP_RATE,
+        max_rounds: int = 100,
+        message_loss: float = 0.0,
+        rumor_count: int = MAX_RUMORS,
+        seed: int | None = None,
+    ):
+        self.node_count = node_count
+        self.fanout = fanout
+        self.mode = mode
+        self.gossip_rate = gossip_rate
+        self.max_rounds = max_rounds
+        # Chance of every message being dropped
+        self.message_loss = message_loss
+        self.rumor_count = min(rumor_count, node_count)
+        self._perform_validations()
+
+        self.clock = 0.0
+        self.rounds = 0
+        self.total_messages = 0
+        self.convergence = {}
+        self._events = []
+        self._event_sequence = itertools.count()
+        self._random = np.random.default_rng(seed)
+
+        self.alive = np.ones(node_count, dtype=bool)
+        self.known = np.zeros(node_count, dtype=np.uint64)
+        origins = self._random.choice(node_count, self.rumor_count, replace=False)
+        self.known[origins] = np.left_shift(np.uint64(1), np.arange(self.rumor_count, dtype=np.uint64))
+
+    def schedule(self, at: float, action: Callable[[], None]):
+        """
+        Runs 'action' once the virtual clock reaches 'at' seconds.
+        """
+        heapq.heappush(self._events, (at, next(self._event_sequence), action))
+
+    def crash(self, node_indexes: Sequence[int], at: float = 0.0):
+        node_indexes = np.asarray(node_indexes)
+
+        def crash_nodes():
+            self.alive[node_indexes] = False
+
+        self.schedule(at, crash_nodes)
+
+    def sample_peers(self, node_indexes: np.ndarray) -> np.ndarray:
+        """
+        'fanout' random peers of every node, never the node itself. Peers
+        are drawn with replacement, each one in O(1) by drawing among the
+        other N - 1 nodes and skipping over the node's own index.
+        """
+        peers = self._random.integers(0, self.node_count - 1, size=(len(node_indexes), self.fanout))
+        peers += peers >= node_indexes[:, None]
+        return peers.reshape(-1)
+
+    def gossip_round(self):
+        # Every message carries the state of the start of the round
+        known = self.known.copy()
+        gossipers = np.repeat(np.flatnonzero(self.alive), self.fanout)
+        receivers = self.sample_peers(gossipers[::self.fanout])
+        delivered = self.alive[receivers]
+
+        if self.mode in (Coordinator.PUSH, Coordinator.PUSH_PULL):
+            pushed = delivered & self._get_arrived(len(receivers))
+            np.bitwise_or.at(self.known, receivers[pushed], known[gossipers[pushed]])
+            self.total_messages += len(receivers)
+        if self.mode in (Coordinator.PULL, Coordinator.PUSH_PULL):
+            # Request and response, both have to arrive
+            pulled = delivered & self._get_arrived(len(receivers)) & self._get_arrived(len(receivers))
+            np.bitwise_or.at(self.known, gossipers[pulled], known[receivers[pulled]])
+            self.total_messages += len(receivers) + int(delivered.sum())
+
+        self.rounds += 1
+        self.clock += self.gossip_rate
+
+    def get_coverage(self) -> float:
+        """
+        Fraction of the rumors still held by a live node that the
+        average live node knows.
+        """
+        known = self.known[self.alive]
+        spreadable_count = popcount(np.bitwise_or.reduce(known, keepdims=True)) if len(known) else 0
+        if not spreadable_count:
+            return 1.0
+        return popcount(known) / (len(known) * spreadable_count)
+
+    def is_converged(self) -> bool:
+        known = self.known[self.alive]
+        return not len(known) or bool(np.all(known == np.bitwise_or.reduce(known)))
+
+    def run(self) -> Dict:
+        start_time = time.perf_counter()
+        self._run_due_events()
+        coverage = [self.get_coverage()]
+
+        while self.rounds < self.max_rounds and not self.is_converged():
+            self.gossip_round()
+            self._run_due_events()
+            coverage.append(self.get_coverage())
+
+        self.convergence = {
+            'rounds': self.rounds,
+            'seconds': self.clock,
+            'wall_seconds': time.perf_counter() - start_time,
+            'converged': self.is_converged(),
+            'coverage': coverage,
+            'messages': self.total_messages,
+        }
+        return self.convergence
+
+    def _get_arrived(self, message_count: int) -> np.ndarray:
+        if not self.message_loss:
+            return np.ones(message_count, dtype=bool)
+        return self._random.random(message_count) >= self.message_loss
+
+    def _run_due_events(self):
+        while self._events and self._events[0][0] <= self.clock:
+            _, _, action = heapq.heappop(self._events)
+            action()
+
+    def _perform_validations(self):
+        if self.node_count < 2:
+            error_message = f'Node count must be at least 2, got {self.node_count}'
+            raise ValueError(error_message)
+
+        if self.mode not in Coordinator.MODES:
+            error_message = f'Unknown gossip mode: {self.mode}. Use one of {Coordinator.MODES}'
+            raise ValueError(error_message)
+
+        if self.fanout < 1:
+            error_message = f'Fanout must be at least 1, got {self.fanout}'
+            raise ValueError(error_message)
+
+        if not 0 <= self.message_loss < 1:
+            error_message = f'Message loss must be in [0, 1), got {self.message_loss}'
+            raise ValueError(error_message)
+
+        if not 1 <= self.rumor_count <= self.MAX_RUMORS:
+            error_message = f'Rumor count must be between 1 and {self.MAX_RUMORS}, got {self.rumor_count}'
+            raise ValueError(error_message)
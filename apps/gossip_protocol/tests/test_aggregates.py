@@ -0,0 +1,96 @@
+import math
+import random
+import statistics
+
+import pytest
+from django.test import TestCase
+
+from ..aggregates import PushSumAggregation
+from ..gossip_protocol import Coordinator
+
+
+# Test Utils
+def build_coordinator(node_count: int) -> Coordinator:
+    coordinator = Coordinator(gossip_rate=0)
+    [coordinator.add() for _ in range(node_count)]
+    return coordinator
+
+
+class TestSuite(TestCase):
+    def test_should_compute_aggregates_within_precision(self):
+        # Build test data
+        node_count = 256
+        coordinator = build_coordinator(node_count)
+        values = {node.uuid: random.uniform(0, 100) for node in coordinator.node_list}
+        expected_results = {
+            PushSumAggregation.AVG: statistics.mean(values.values()),
+            PushSumAggregation.SUM: sum(values.values()),
+            PushSumAggregation.COUNT: node_count,
+            PushSumAggregation.MIN: min(values.values()),
+            PushSumAggregation.MAX: max(values.values()),
+        }
+
+        for function, expected_result in expected_results.items():
+            # Do
+            result = coordinator.aggregate(values, function, precision=1e-6)
+
+            # Assert
+            assert result['converged']
+            assert result['rounds'] <= 10 * math.ceil(math.log2(node_count))
+            for estimate in result['estimates'].values():
+                assert estimate == pytest.approx(expected_result, rel=1e-4)
+
+    def test_should_report_metrics_per_round(self):
+        # Build test data
+        coordinator = build_coordinator(64)
+        values = {node.uuid: float(index) for index, node in enumerate(coordinator.node_list)}
+
+        # Do
+        result = coordinator.aggregate(values, precision=1e-3)
+
+        # Assert
+        spreads = [metrics['spread'] for metrics in result['metrics']]
+        assert len(spreads) == result['rounds']
+        assert spreads[-1] < spreads[0]
+        assert result['metrics'][-1]['stable_nodes'] == 64
+        assert result['messages'] == result['rounds'] * 64 * coordinator.fanout
+
+    def test_should_leave_crashed_nodes_out(self):
+        # Build test data
+        coordinator = build_coordinator(32)
+        crashed_node = coordinator.node_list[0]
+        coordinator.fail(crashed_node)
+
+        # Do
+        result = coordinator.aggregate({}, PushSumAggregation.COUNT)
+
+        # Assert
+        assert crashed_node.uuid not in result['estimates']
+        for estimate in result['estimates'].values():
+            assert estimate == pytest.approx(31, rel=1e-4)
+
+    def test_should_not_allow_invalid_config(self):
+        # Build test data
+        coordinator = build_coordinator(2)
+
+        # Assert
+        with pytest.raises(ValueError):
+            coordinator.aggregate({}, 'median')
+
+        with pytest.raises(ValueError):
+            coordinator.aggregate({}, PushSumAggregation.AVG)
+
+        with pytest.raises(ValueError):
+            coordinator.aggregate({}, PushSumAggregation.COUNT, precision=0)
+
+    def test_should_not_allow_empty_cluster(self):
+        # Build test data
+        coordinator = build_coordinator(1)
+        coordinator.fail(coordinator.node_list[0])
+
+        # Assert
+        with pytest.raises(ValueError):
+            coordinator.aggregate({}, PushSumAggregation.COUNT)
+
+        with pytest.raises(ValueError):
+            build_coordinator(0).aggregate({}, PushSumAggregation.MAX)
@@ -0,0 +1,53 @@
+import pytest
+from django.test import TestCase
+
+from ..failure_detectors import PhiAccrualFailureDetector
+
+
+class TestSuite(TestCase):
+    def test_should_grow_phi_with_missed_heartbeats(self):
+        # Build test data
+        detector = PhiAccrualFailureDetector(min_std_seconds=0.1)
+        for second in range(10):
+            detector.heartbeat(1, second)
+
+        # Do
+        phis = [detector.get_phi(1, 9 + elapsed) for elapsed in [0.5, 1, 2, 3]]
+
+        # Assert
+        assert phis == sorted(phis)
+        assert phis[1] < 1
+        assert phis[-1] >= detector.dead_threshold
+
+    def test_should_suspect_and_revive_peer(self):
+        # Build test data
+        detector = PhiAccrualFailureDetector(min_std_seconds=0.1)
+        for second in range(10):
+            detector.heartbeat(1, second)
+
+        # Assert
+        assert detector.get_status(1, 9.5) == detector.ALIVE
+        assert detector.get_status(1, 12) == detector.SUSPECT
+        detector.mark_dead(1)
+        assert detector.get_status(1, 12) == detector.DEAD
+        detector.heartbeat(1, 13)
+        assert detector.get_status(1, 13) == detector.ALIVE
+
+    def test_should_only_keep_window_of_intervals(self):
+        # Build test data
+        detector = PhiAccrualFailureDetector(window_size=3)
+
+        # Do
+        for second in [0, 10, 11, 12, 13]:
+            detector.heartbeat(1, second)
+
+        # Assert
+        assert list(detector.intervals[1]) == [1, 1, 1]
+        assert detector.interval_sums[1] == [3, 3]
+
+    def test_should_not_allow_invalid_config(self):
+        with pytest.raises(ValueError):
+            PhiAccrualFailureDetector(window_size=0)
+
+        with pytest.raises(ValueError):
+            PhiAccrualFailureDetector(suspect_threshold=8, dead_threshold=5)
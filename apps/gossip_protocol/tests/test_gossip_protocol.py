@@ -0,0 +1,179 @@
+import asyncio
+import functools
+import math
+
+import pytest
+from django.test import TestCase
+
+from ..failure_detectors import PhiAccrualFailureDetector
+from ..gossip_protocol import Coordinator
+
+
+# Test Utils
+def build_coordinator(node_count: int, **kwargs) -> Coordinator:
+    coordinator = Coordinator(gossip_rate=0, **kwargs)
+    [coordinator.add() for _ in range(node_count)]
+    return coordinator
+
+
+class TestSuite(TestCase):
+    def test_should_converge_in_logarithmic_rounds(self):
+        for mode in Coordinator.MODES:
+            # Build test data
+            node_count = 128
+            coordinator = build_coordinator(node_count, mode=mode, max_rounds=50)
+
+            # Do
+            convergence = coordinator.run()
+
+            # Assert
+            assert convergence['converged']
+            assert convergence['rounds'] <= 3 * math.ceil(math.log2(node_count))
+            assert convergence['coverage'][0] == 1 / node_count
+            assert convergence['coverage'][-1] == 1.0
+            assert coordinator.total_gossips == convergence['rounds'] * node_count * coordinator.fanout
+
+    def test_should_stop_after_max_rounds(self):
+        # Build test data
+        coordinator = build_coordinator(64, fanout=1, mode=Coordinator.PUSH, max_rounds=1)
+
+        # Do
+        convergence = coordinator.run()
+
+        # Assert
+        assert convergence['rounds'] == 1
+        assert not convergence['converged']
+
+    def test_should_spread_one_hop_per_round(self):
+        # Build test data
+        node_count = 64
+        coordinator = build_coordinator(node_count, fanout=1, mode=Coordinator.PUSH, max_rounds=1)
+
+        # Do
+        coordinator.run()
+
+        # Assert, nodes only learn about the nodes that pushed to them
+        assert sum(len(node.registry) for node in coordinator.node_list) <= 2 * node_count
+
+    def test_should_select_distinct_peers(self):
+        # Build test data
+        coordinator = build_coordinator(10, fanout=3)
+
+        for node in coordinator.node_list:
+            # Do
+            peers = coordinator.select_peers(node)
+
+            # Assert
+            assert len(peers) == 3
+            assert node not in peers
+            assert len(set(peers)) == 3
+
+    def test_should_remove_node(self):
+        # Build test data
+        coordinator = build_coordinator(3)
+        removed_node = coordinator.node_list[0]
+
+        # Do
+        coordinator.remove(removed_node)
+
+        # Assert
+        assert removed_node not in coordinator.node_list
+        assert removed_node.uuid not in coordinator.members
+        assert coordinator.run()['converged']
+
+    def test_should_bound_history_per_coordinator(self):
+        # Build test data
+        coordinator = build_coordinator(256, fanout=4, max_rounds=10)
+        other_coordinator = build_coordinator(2)
+
+        # Do
+        coordinator.run()
+
+        # Assert
+        assert coordinator.total_gossips > Coordinator.HISTORY_LIMIT
+        assert len(coordinator.gossip_history) == Coordinator.HISTORY_LIMIT
+        assert len(other_coordinator.gossip_history) == 0
+
+    def test_should_keep_highest_heartbeat_on_merge(self):
+        # Build test data
+        coordinator = build_coordinator(2)
+        old_node, new_node = coordinator.node_list
+        new_node.registry[old_node.uuid] = (0, old_node.registry[old_node.uuid][1])
+        old_node.heartbeat()
+
+        # Do
+        updated_count = old_node.merge(new_node.registry)
+
+        # Assert
+        assert updated_count == 1
+        assert old_node.registry[new_node.uuid] == new_node.registry[new_node.uuid]
+        # A stale counter never overwrites a newer one
+        assert old_node.registry[old_node.uuid][0] == 1
+
+    def test_should_only_send_newer_entries(self):
+        # Build test data
+        coordinator = build_coordinator(3)
+        sender_node, receiver_node, other_node = coordinator.node_list
+        sender_node.merge(other_node.registry)
+        receiver_node.merge(other_node.registry)
+
+        # Do
+        delta = sender_node.get_delta(receiver_node.get_digest())
+
+        # Assert
+        assert delta == {sender_node.uuid: sender_node.registry[sender_node.uuid]}
+
+    def test_should_send_less_bytes_with_delta(self):
+        round_bytes = {}
+        for delta in [True, False]:
+            # Build test data
+            coordinator = build_coordinator(64, delta=delta, max_rounds=50)
+            coordinator.run()
+
+            # Do, a round once every node knows every other one
+            total_bytes = coordinator.total_bytes
+            asyncio.run(coordinator.gossip_round())
+            round_bytes[delta] = coordinator.total_bytes - total_bytes
+
+            # Assert
+            assert coordinator.convergence['converged']
+            assert len(coordinator.convergence['bytes']) == coordinator.convergence['rounds']
+
+        assert round_bytes[True] < round_bytes[False]
+
+    def test_should_detect_crashed_node(self):
+        for message_loss in [0.0, 0.1]:
+            # Build test data
+            detector_factory = functools.partial(
+                PhiAccrualFailureDetector, min_std_seconds=0.01, first_heartbeat_seconds=0.01
+            )
+            coordinator = build_coordinator(
+                16, max_rounds=1000, message_loss=message_loss, detector_factory=detector_factory
+            )
+            coordinator.gossip_rate = 0.005
+            for node in coordinator.node_list:
+                node.heartbeat_rate = 0.01
+            crashed_node = coordinator.node_list[0]
+
+            # Do
+            coordinator.run()
+            coordinator.fail(crashed_node)
+            coordinator.run(duration=0.5)
+            report = coordinator.get_failure_report()
+
+            # Assert
+            assert report['fully_detected'] == 1
+            assert report['full_detection_seconds'] < 0.5
+            assert report['false_positive_rate'] == 0.0
+            for node in coordinator.node_list[1:]:
+                assert node.detector.statuses[crashed_node.uuid] == PhiAccrualFailureDetector.DEAD
+
+    def test_should_not_allow_invalid_config(self):
+        with pytest.raises(ValueError):
+            Coordinator(mode='broadcast')
+
+        with pytest.raises(ValueError):
+            Coordinator(fanout=0)
+
+        with pytest.raises(ValueError):
+            Coordinator(message_loss=1)
@@ -0,0 +1,65 @@
+import pytest
+from django.test import TestCase
+
+from ..gossip_protocol import Node
+from ..membership import MembershipTable
+
+
+# Test Utils
+def build_table(node_count: int) -> MembershipTable:
+    table = MembershipTable()
+    [table.add(Node()) for _ in range(node_count)]
+    return table
+
+
+class TestSuite(TestCase):
+    def test_should_swap_last_node_into_removed_slot(self):
+        # Build test data
+        table = build_table(4)
+        first_node, _, _, last_node = table.nodes
+
+        # Do
+        removed_node = table.remove(first_node.uuid)
+
+        # Assert
+        assert removed_node is first_node
+        assert first_node.uuid not in table
+        assert table.nodes[0] is last_node
+        assert table.get(last_node.uuid) is last_node
+        assert all(table.nodes[position].uuid == uuid for uuid, position in table.positions.items())
+
+    def test_should_remove_last_node(self):
+        # Build test data
+        table = build_table(2)
+
+        # Do
+        [table.remove(node.uuid) for node in list(table)]
+
+        # Assert
+        assert len(table) == 0
+        assert table.positions == {}
+
+    def test_should_sample_distinct_nodes_without_excluded_one(self):
+        for count in [1, 3, 9, 20]:
+            # Build test data
+            table = build_table(10)
+            excluded_node = table.nodes[0]
+
+            # Do
+            sample = table.sample(count, exclude=excluded_node)
+
+            # Assert
+            assert len(sample) == min(count, 9)
+            assert len({node.uuid for node in sample}) == len(sample)
+            assert excluded_node not in sample
+
+    def test_should_not_allow_duplicate_or_unknown_nodes(self):
+        # Build test data
+        table = build_table(1)
+
+        # Assert
+        with pytest.raises(ValueError):
+            table.add(table.nodes[0])
+
+        with pytest.raises(KeyError):
+            table.remove(Node().uuid)
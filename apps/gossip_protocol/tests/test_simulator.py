@@ -0,0 +1,106 @@
+import math
+import random
+import statistics
+
+import numpy as np
+import pytest
+from django.test import TestCase
+
+from ..benchmarks import benchmark_simulator
+from ..gossip_protocol import Coordinator
+from ..simulator import GossipSimulator
+
+
+class TestSuite(TestCase):
+    def test_should_converge_in_logarithmic_rounds(self):
+        for mode in Coordinator.MODES:
+            # Build test data
+            node_count = 10_000
+            simulator = GossipSimulator(node_count, mode=mode, seed=0)
+
+            # Do
+            convergence = simulator.run()
+
+            # Assert
+            assert convergence['converged']
+            assert convergence['rounds'] <= 3 * math.ceil(math.log2(node_count))
+            assert convergence['seconds'] == convergence['rounds'] * simulator.gossip_rate
+            assert convergence['coverage'][-1] == 1.0
+            assert convergence['coverage'] == sorted(convergence['coverage'])
+
+    def test_should_track_every_node_in_small_clusters(self):
+        # Build test data
+        simulator = GossipSimulator(16, seed=0)
+
+        # Assert
+        assert simulator.rumor_count == 16
+        assert sorted(simulator.known.tolist()) == [1 << index for index in range(16)]
+
+    def test_should_converge_in_as_many_rounds_as_coordinator(self):
+        for mode in Coordinator.MODES:
+            # Build test data
+            coordinator_rounds = []
+            simulator_rounds = []
+            for seed in range(10):
+                random.seed(seed)
+                coordinator = Coordinator(fanout=1, mode=mode, gossip_rate=0, max_rounds=60)
+                [coordinator.add() for _ in range(64)]
+                simulator = GossipSimulator(64, fanout=1, mode=mode, max_rounds=60, seed=seed)
+
+                # Do
+                coordinator_rounds.append(coordinator.run()['rounds'])
+                simulator_rounds.append(simulator.run()['rounds'])
+
+            # Assert, both run synchronous rounds so updates travel one hop per round
+            assert abs(statistics.mean(coordinator_rounds) - statistics.mean(simulator_rounds)) <= 1.5
+
+    def test_should_be_deterministic_with_seed(self):
+        # Do
+        convergences = [GossipSimulator(1_000, message_loss=0.1, seed=7).run() for _ in range(2)]
+
+        # Assert
+        assert convergences[0]['coverage'] == convergences[1]['coverage']
+        assert convergences[0]['messages'] == convergences[1]['messages']
+
+    def test_should_never_sample_node_itself(self):
+        # Build test data
+        simulator = GossipSimulator(3, fanout=4, seed=0)
+        node_indexes = np.arange(3).repeat(100)
+
+        # Do
+        peers = simulator.sample_peers(node_indexes)
+
+        # Assert
+        assert not np.any(peers == node_indexes.repeat(4))
+        assert set(peers.tolist()) == {0, 1, 2}
+
+    def test_should_converge_among_live_nodes_after_crashes(self):
+        # Build test data
+        simulator = GossipSimulator(1_000, message_loss=0.2, seed=0)
+        simulator.crash(range(100), at=2)
+
+        # Do
+        convergence = simulator.run()
+
+        # Assert
+        assert convergence['converged']
+        assert simulator.alive.sum() == 900
+        assert len(set(simulator.known[100:].tolist())) == 1
+
+    def test_should_benchmark_simulator(self):
+        # Do
+        results = benchmark_simulator([100])
+
+        # Assert
+        assert set(results) == {f'{mode}_100' for mode in Coordinator.MODES}
+        assert all(result['converged'] for result in results.values())
+
+    def test_should_not_allow_invalid_config(self):
+        with pytest.raises(ValueError):
+            GossipSimulator(1)
+
+        with pytest.raises(ValueError):
+            GossipSimulator(10, mode='broadcast')
+
+        with pytest.raises(ValueError):
+            GossipSimulator(10, message_loss=1)
@@ -0,0 +1,82 @@
+import asyncio
+from datetime import datetime
+
+import pytest
+from django.test import TestCase
+
+from ..messages import ACK, SYN, decode_messages, encode_message
+from ..transport import NetworkNode, run_cluster
+
+
+# Test Utils
+async def run_nodes(node_count: int, duration: float):
+    # Nodes bind free ports themselves, the seed is started first to know its own
+    seed_node = NetworkNode(0, gossip_rate=0.02)
+    await seed_node.start()
+    network_nodes = [seed_node] + [NetworkNode(0, [seed_node.address], gossip_rate=0.02) for _ in range(node_count - 1)]
+    return await asyncio.gather(*[network_node.run(duration) for network_node in network_nodes])
+
+
+class TestSuite(TestCase):
+    def test_should_decode_batch_of_messages(self):
+        # Build test data
+        timestamp = datetime(2020, 1, 1, 8, 0, 1)
+        addresses = {1: ('127.0.0.1', 9000), -2: ('10.0.0.2', 9001)}
+        syn = encode_message(SYN, 1, addresses[1], {1: 3, -2: 5}, {}, addresses)
+        ack = encode_message(ACK, -2, addresses[-2], {}, {-2: (6, timestamp)}, addresses)
+
+        # Do
+        messages = decode_messages(syn + ack)
+
+        # Assert
+        assert len(syn) == 19 + 2 * 16
+        assert len(ack) == 19 + 30
+        assert [message.type for message in messages] == [SYN, ACK]
+        assert messages[0].digest == {1: 3, -2: 5}
+        assert messages[1].sender_address == ('10.0.0.2', 9001)
+        assert messages[1].delta == {-2: (6, timestamp)}
+        assert messages[1].addresses == {-2: ('10.0.0.2', 9001)}
+
+    def test_should_bind_free_port(self):
+        async def start_nodes():
+            network_nodes = [NetworkNode(0) for _ in range(2)]
+            for network_node in network_nodes:
+                await network_node.start()
+            addresses = [network_node.addresses[network_node.node.uuid] for network_node in network_nodes]
+            for network_node in network_nodes:
+                await network_node.stop()
+            return addresses
+
+        # Do
+        addresses = asyncio.run(start_nodes())
+
+        # Assert
+        assert all(port > 0 for _, port in addresses)
+        assert addresses[0] != addresses[1]
+
+    def test_should_converge_over_udp_and_tcp(self):
+        # Build test data
+        node_count = 48
+
+        # Do
+        reports = asyncio.run(run_nodes(node_count, duration=2.0))
+
+        # Assert
+        assert all(report['members'] == node_count for report in reports)
+        stats = [report['stats'] for report in reports]
+        assert sum(stat['datagrams_sent'] for stat in stats) > 0
+        # Full deltas do not fit in a datagram, they go through reused TCP connections
+        frame_count = sum(stat.get('frames_sent', 0) for stat in stats)
+        assert frame_count > sum(stat.get('connections_opened', 0) for stat in stats)
+
+    def test_should_run_cluster_of_processes(self):
+        # Do
+        result = run_cluster(3, duration=1.0, gossip_rate=0.05)
+
+        # Assert
+        assert result['converged']
+        assert result['stats']['messages_received'] > 0
+
+    def test_should_terminate_cluster_that_does_not_report(self):
+        with pytest.raises(TimeoutError):
+            run_cluster(2, duration=30.0, timeout=0.0)
@@ -0,0 +1,292 @@
+import argparse
+import asyncio
+import json
+import multiprocessing
+import queue
+import random
+import struct
+import time
+from collections import Counter
+from typing import Dict, List, Sequence
+
+from .gossip_protocol import Coordinator, Node
+from .messages import ACK, ACK2, SYN, Address, Message, decode_messages, encode_message
+
+# Length prefix of every batch sent over TCP
+FRAME_HEADER = struct.Struct('!I')
+
+
+class DatagramEndpoint(asyncio.DatagramProtocol):
+    def __init__(self, network_node: 'NetworkNode'):
+        self.network_node = network_node
+
+    def datagram_received(self, data: bytes, address: Address):
+        self.network_node.receive(data)
+
+
+class NetworkNode:
+    """
+    Gossip node running as an asyncio endpoint, exchanging digests and
+    deltas with its peers over the network instead of in memory.
+    Every round it sends its digest to 'fanout' known peers (SYN), which
+    answer with what the node is missing plus their own digest (ACK), and
+    the node sends back what they are missing (ACK2).
+    Messages to the same peer are batched until the event loop is free,
+    then sent as one UDP datagram, or as one frame over a reused TCP
+    connection when larger than 'MAX_DATAGRAM_BYTES'.
+    The UDP and TCP endpoints share the same port number. With port 0
+    the node binds a free one itself, its address is known once started.
+    """
+
+    # Attributes
+    node: Node
+    addresses: Dict[int, Address]  # Uuid -> address of every known node
+    join_times: Dict[int, float]  # Uuid -> seconds since start when the node was first known
+    stats: Counter
+
+    # Tunable Config
+    host: str
+    port: int
+    seeds: List[Address]
+    fanout: int
+    gossip_rate: float
+
+    # Constants
+    MAX_DATAGRAM_BYTES = 1400  # Fits an Ethernet MTU, no IP fragmentation
+    BIND_ATTEMPTS = 5
+
+    def __init__(
+        self,
+        port: int,
+        seeds: Sequence[Address] = (),
+        host: str = '127.0.0.1',
+        fanout: int = Coordinator.DEFAULT_FANOUT,
+        gossip_rate: float = Coordinator.GOSSIP_RATE,
+    ):
+        self.node = Node()
+        self.host = host
+        self.port = port
+        self.seeds = [tuple(seed) for seed in seeds if tuple(seed) != (host, port)]
+        self.fanout = fanout
+        self.gossip_rate = gossip_rate
+        self.addresses = {self.node.uuid: (host, port)}
+        self.join_times = {self.node.uuid: 0.0}
+        self.stats = Counter()
+        self._start_time = time.perf_counter()
+        self._outbox: Dict[Address, List[bytes]] = {}
+        self._connections: Dict[Address, asyncio.Future] = {}
+        self._server_writers: List[asyncio.StreamWriter] = []
+        self._send_tasks = set()
+        self._transport = None
+        self._server = None
+
+    @property
+    def address(self) -> Address:
+        return self.host, self.port
+
+    async def start(self):
+        loop = asyncio.get_running_loop()
+        for attempt in range(self.BIND_ATTEMPTS):
+            self._server = await asyncio.start_server(self._handle_stream, self.host, self.port)
+            port = self._server.sockets[0].getsockname()[1]
+            try:
+                self._transport, _ = await loop.create_datagram_endpoint(
+                    lambda: DatagramEndpoint(self), local_addr=(self.host, port)
+                )
+                break
+            except OSError:
+                self._server.close()
+                await self._server.wait_closed()
+                # A given port is final, port 0 retries when UDP already uses the free TCP port
+                if self.port or attempt == self.BIND_ATTEMPTS - 1:
+                    raise
+
+        self.port = port
+        self.addresses[self.node.uuid] = self.address
+        self._start_time = time.perf_counter()
+
+    async def stop(self):
+        self.flush()
+        if self._send_tasks:
+            await asyncio.gather(*self._send_tasks, return_exceptions=True)
+
+        for connection in self._connections.values():
+            if connection.done() and self._is_open(connection):
+                connection.result()[1].close()
+        for writer in self._server_writers:
+            writer.close()
+        self._server.close()
+        await self._server.wait_closed()
+        self._transport.close()
+
+    async def run(self, duration: float) -> Dict:
+        if self._server is None:
+            await self.start()
+        try:
+            while time.perf_counter() - self._start_time < duration:
+                self.node.heartbeat()
+                self.gossip()
+                await asyncio.sleep(self.gossip_rate)
+        finally:
+            await self.stop()
+        return self.get_report()
+
+    def gossip(self):
+        peer_addresses = [address for uuid, address in self.addresses.items() if uuid != self.node.uuid]
+        # Keep talking to the seeds until some peer is known
+        candidates = peer_addresses or self.seeds
+        for address in random.sample(candidates, min(self.fanout, len(candidates))):
+            self.send(address, SYN, self.node.get_digest(), {})
+
+    def send(self, address: Address, message_type: int, digest: Dict, delta: Dict):
+        message = encode_message(message_type, self.node.uuid, self.address, digest, delta, self.addresses)
+        self.stats['messages_sent'] += 1
+        if not self._outbox:
+            asyncio.get_running_loop().call_soon(self.flush)
+        self._outbox.setdefault(address, []).append(message)
+
+    def flush(self):
+        outbox, self._outbox = self._outbox, {}
+        for address, messages in outbox.items():
+            batch = b''.join(messages)
+            self.stats['bytes_sent'] += len(batch)
+            if len(batch) <= self.MAX_DATAGRAM_BYTES:
+                self.stats['datagrams_sent'] += 1
+                self._transport.sendto(batch, address)
+            else:
+                self.stats['frames_sent'] += 1
+                task = asyncio.ensure_future(self._send_frame(address, batch))
+                self._send_tasks.add(task)
+                task.add_done_callback(self._send_tasks.discard)
+
+    def receive(self, data: bytes):
+        self.stats['bytes_received'] += len(data)
+        for message in decode_messages(data):
+            self.stats['messages_received'] += 1
+            self.handle(message)
+
+    def handle(self, message: Message):
+        self.addresses.setdefault(message.sender_uuid, message.sender_address)
+        for uuid, address in message.addresses.items():
+            self.addresses.setdefault(uuid, address)
+        self.node.merge(message.delta)
+        for uuid in self.addresses.keys() - self.join_times.keys():
+            self.join_times[uuid] = time.perf_counter() - self._start_time
+
+        if message.type == SYN:
+            delta = self.node.get_delta(message.digest)
+            self.send(message.sender_address, ACK, self.node.get_digest(), delta)
+        elif message.type == ACK:
+            delta = self.node.get_delta(message.digest)
+            if delta:
+                self.send(message.sender_address, ACK2, {}, delta)
+
+    def get_report(self) -> Dict:
+        return {
+            'address': self.address,
+            'members': len(self.node.registry),
+            'membership_seconds': max(self.join_times.values()),
+            'stats': dict(self.stats),
+        }
+
+    async def _send_frame(self, address: Address, batch: bytes):
+        # One connection per peer, opened on first use and reused afterwards
+        connection = self._connections.get(address)
+        if connection is None or (connection.done() and not self._is_open(connection)):
+            connection = self._connections[address] = asyncio.ensure_future(asyncio.open_connection(*address))
+            self.stats['connections_opened'] += 1
+
+        try:
+            _, writer = await connection
+            writer.write(FRAME_HEADER.pack(len(batch)) + batch)
+            await writer.drain()
+        except OSError:
+            self.stats['frames_failed'] += 1
+
+    @staticmethod
+    def _is_open(connection: asyncio.Future) -> bool:
+        return not connection.exception() and not connection.result()[1].is_closing()
+
+    async def _handle_stream(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self._server_writers.append(writer)
+        try:
+            while True:
+                (size,) = FRAME_HEADER.unpack(await reader.readexactly(FRAME_HEADER.size))
+                self.receive(await reader.readexactly(size))
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+
+def run_node(seeds: Sequence[Address], duration: float, gossip_rate: float, results, ports=None) -> None:
+    """
+    Entry point of a node process, puts its report on the 'results' queue
+    and, given a 'ports' queue, the port it bound once started.
+    """
+    network_node = NetworkNode(0, seeds, gossip_rate=gossip_rate)
+
+    async def run():
+        await network_node.start()
+        if ports is not None:
+            ports.put(network_node.port)
+        return await network_node.run(duration)
+
+    results.put(asyncio.run(run()))
+
+
+def run_cluster(node_count: int, duration: float = 5.0, gossip_rate: float = 0.1, timeout: float = 10.0) -> Dict:
+    """
+    Runs 'node_count' nodes as separate processes on localhost, all
+    seeded with the first one, and gathers their reports.
+    Processes still running 'timeout' seconds past 'duration' are terminated.
+    """
+    ports = multiprocessing.Queue()
+    results = multiprocessing.Queue()
+    processes = [multiprocessing.Process(target=run_node, args=([], duration, gossip_rate, results, ports))]
+    processes[0].start()
+    try:
+        seeds = [('127.0.0.1', ports.get(timeout=timeout))]
+        processes += [
+            multiprocessing.Process(target=run_node, args=(seeds, duration, gossip_rate, results))
+            for _ in range(node_count - 1)
+        ]
+        for process in processes[1:]:
+            process.start()
+        reports = [results.get(timeout=duration + timeout) for _ in processes]
+    except queue.Empty:
+        error_message = f'Cluster nodes did not report within {duration + timeout} seconds'
+        raise TimeoutError(error_message)
+    finally:
+        for process in processes:
+            process.join(timeout)
+            if process.is_alive():
+                process.terminate()
+                process.join()
+
+    stats = Counter()
+    for report in reports:
+        stats.update(report['stats'])
+    return {
+        'nodes': node_count,
+        'converged': all(report['members'] == node_count for report in reports),
+        'membership_seconds': max(report['membership_seconds'] for report in reports),
+        'stats': dict(stats),
+    }
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Runs a gossip node, or a whole cluster on localhost.')
+    parser.add_argument('--port', type=int, default=None, help='Run a single node on this port')
+    parser.add_argument('--seeds', nargs='*', default=[], help='Seed addresses of a single node, as host:port')
+    parser.add_argument('--nodes', type=int, default=8, help='Nodes of the localhost cluster')
+    parser.add_argument('--duration', type=float, default=5.0)
+    parser.add_argument('--gossip-rate', type=float, default=0.1)
+    arguments = parser.parse_args()
+
+    if arguments.port is None:
+        print(json.dumps(run_cluster(arguments.nodes, arguments.duration, arguments.gossip_rate), indent=2))
+    else:
+        seed_addresses = [(seed.split(':')[0], int(seed.split(':')[1])) for seed in arguments.seeds]
+        network_node = NetworkNode(arguments.port, seed_addresses, gossip_rate=arguments.gossip_rate)
+        print(json.dumps(asyncio.run(network_node.run(arguments.duration)), indent=2))
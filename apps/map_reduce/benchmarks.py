@@ -0,0 +1,152 @@
+# src/map_reduce/benchmarks.py
+import argparse
+import json
+import os
+import pickle
+import tempfile
+import time
+import tracemalloc
+from collections import Counter
+from pathlib import Path
+from typing import Any, Dict, List
+
+from .executors import INLINE, PROCESSES, THREADS
+from .map_reduce import MapReduce
+from .parsers import LogLineParser, StrptimeLogLineParser
+from .store import LogTable
+
+SAMPLE_LOG_PATH = Path(__file__).resolve().parent / 'tests' / 'sample.log'
+DEFAULT_TARGET_BYTES = 2 * 1024 ** 3
+
+
+def replicate_log(target_path: str | Path, target_bytes: int, source_path: str | Path = SAMPLE_LOG_PATH) -> int:
+    """
+    Appends copies of the source log to 'target_path' until it is at
+    least 'target_bytes' long. Returns the final size.
+    """
+    content = Path(source_path).read_bytes()
+    if not content.endswith(b'\n'):
+        content += b'\n'
+
+    written_bytes = 0
+    with open(target_path, 'wb') as file:
+        while written_bytes < target_bytes:
+            file.write(content)
+            written_bytes += len(content)
+    return written_bytes
+
+
+def benchmark_scaling(
+    file_path: str | Path,
+    backends: List[str] = (THREADS, PROCESSES),
+    max_mappers: int | None = None,
+    split_size: int = MapReduce.DEFAULT_SPLIT_SIZE,
+) -> Dict[str, List[Dict[str, Any]]]:
+    """
+    Processes the whole log with 1 to 'max_mappers' workers on every
+    backend, reporting wall time, throughput, speedup over one worker
+    and the run's per phase stats.
+    """
+    max_mappers = max_mappers or os.cpu_count()
+    file_bytes = os.path.getsize(file_path)
+
+    results = {}
+    for backend in backends:
+        results[backend] = []
+        for mappers in range(1, max_mappers + 1):
+            mapreduce = MapReduce(mappers, mappers, backend=backend)
+            start_time = time.perf_counter()
+            mapreduce.process_log(file_path, split_size=split_size)
+            elapsed_time = time.perf_counter() - start_time
+
+            results[backend].append({
+                'mappers': mappers,
+                'seconds': elapsed_time,
+                'megabytes_per_second': file_bytes / elapsed_time / 1024 ** 2,
+                'speedup': results[backend][0]['seconds'] / elapsed_time if results[backend] else 1.0,
+                'stats': mapreduce.stats.to_dict(),
+            })
+
+    return results
+
+
+def benchmark_parsers(file_path: str | Path = SAMPLE_LOG_PATH, repeat: int = 20) -> Dict[str, Dict[str, float]]:
+    """
+    Compares the 'strptime' reference parser against the fast parser,
+    line by line and through the batch path, with and without validation.
+    """
+    log_chunk = Path(file_path).read_text() * repeat
+    log_lines = log_chunk.splitlines()
+    parsers = {
+        'strptime': StrptimeLogLineParser(),
+        'fast': LogLineParser(),
+        'fast_unvalidated': LogLineParser(validate=False),
+    }
+
+    def parse_lines(parser):
+        record_counts = Counter()
+        for log_line in log_lines:
+            try:
+                record_counts[parser.parse(log_line)] += 1
+            except ValueError:
+                pass
+        return record_counts
+
+    results = {}
+    for name, parser in parsers.items():
+        for path, parse in [('per_line', parse_lines), ('batch', lambda parser: parser.parse_chunk(log_chunk))]:
+            start_time = time.perf_counter()
+            parse(parser)
+            elapsed_time = time.perf_counter() - start_time
+            results[f'{name}_{path}'] = {'seconds': elapsed_time, 'lines_per_second': len(log_lines) / elapsed_time}
+
+    baseline_seconds = results['strptime_per_line']['seconds']
+    for result in results.values():
+        result['speedup'] = baseline_seconds / result['seconds']
+    return results
+
+
+def benchmark_result_store(file_path: str | Path = SAMPLE_LOG_PATH) -> Dict[str, int]:
+    """
+    Compares the memory and serialized size of the nested
+    'processed_log' dicts against the columnar 'LogTable'.
+    """
+    mapreduce = MapReduce(1, 1, backend=INLINE)
+    mapreduce.process_log(file_path)
+
+    with tempfile.TemporaryDirectory() as directory:
+        table_path = Path(directory) / 'table.npz'
+        mapreduce.table.save(table_path)
+
+        tracemalloc.start()
+        LogTable.load(table_path)
+        table_bytes, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        tracemalloc.start()
+        processed_log = mapreduce._build_processed_log(mapreduce.table)
+        nested_bytes, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        return {
+            'rows': len(mapreduce.table),
+            'nested_memory_bytes': nested_bytes,
+            'table_memory_bytes': table_bytes,
+            'nested_pickle_bytes': len(pickle.dumps(processed_log, protocol=pickle.HIGHEST_PROTOCOL)),
+            'table_file_bytes': table_path.stat().st_size,
+        }
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='MapReduce scaling benchmark over a replicated sample log.')
+    parser.add_argument('--bytes', type=int, default=DEFAULT_TARGET_BYTES)
+    parser.add_argument('--max-mappers', type=int, default=None)
+    arguments = parser.parse_args()
+
+    print(json.dumps(benchmark_parsers(), indent=2))
+    print(json.dumps(benchmark_result_store(), indent=2))
+
+    with tempfile.TemporaryDirectory() as directory:
+        log_path = Path(directory) / 'replicated.log'
+        replicate_log(log_path, arguments.bytes)
+        print(json.dumps(benchmark_scaling(log_path, max_mappers=arguments.max_mappers), indent=2))
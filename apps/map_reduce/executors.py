@@ -0,0 +1,40 @@
+# src/map_reduce/executors.py
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+
+# Backends
+THREADS = 'threads'
+PROCESSES = 'processes'
+INLINE = 'inline'
+BACKENDS = (THREADS, PROCESSES, INLINE)
+
+
+class InlineExecutor(Executor):
+    """
+    Runs every task synchronously as it is submitted.
+    Single core baseline, and easier to debug than a pool.
+    """
+
+    def submit(self, fn, /, *args, **kwargs) -> Future:
+        future = Future()
+        try:
+            future.set_result(fn(*args, **kwargs))
+        except Exception as error:
+            future.set_exception(error)
+        return future
+
+
+def create_executor(backend: str, max_workers: int) -> Executor:
+    """
+    Threads share memory but are bound by the GIL, processes run
+    pure Python tasks in parallel at the cost of pickling their
+    payloads and results.
+    """
+    if backend == THREADS:
+        return ThreadPoolExecutor(max_workers=max_workers)
+    if backend == PROCESSES:
+        return ProcessPoolExecutor(max_workers=max_workers)
+    if backend == INLINE:
+        return InlineExecutor()
+
+    error_message = f'Unknown executor backend: {backend}. Use one of {BACKENDS}'
+    raise ValueError(error_message)
@@ -0,0 +1,61 @@
+# src/map_reduce/jobs.py
+from typing import Any, Callable, Iterable, Iterator, List, Tuple
+
+from .partitioners import hash_partition
+from .splits import read_split
+from .stats import TaskStats
+
+
+class InputFormat:
+    """
+    Turns a byte range split of the input file into records,
+    reporting its timings and counters to the task's 'stats'.
+    """
+
+    def read(self, file_path: str, split_start: int, split_end: int, stats: TaskStats) -> Iterable:
+        raise NotImplementedError
+
+
+class TextInputFormat(InputFormat):
+    """
+    Every line of the split is a record.
+    """
+
+    # Tunable Config
+    encoding: str
+
+    def __init__(self, encoding: str = 'utf-8') -> None:
+        self.encoding = encoding
+
+    def read(self, file_path: str, split_start: int, split_end: int, stats: TaskStats) -> Iterable[str]:
+        with stats.measure('read'):
+            text_chunk = read_split(file_path, split_start, split_end)
+        stats.count('bytes_read', len(text_chunk))
+
+        with stats.measure('parse'):
+            return text_chunk.decode(self.encoding).splitlines()
+
+
+class Job:
+    """
+    A MapReduce job. 'map' turns every record read by 'input_format'
+    into '(key, value)' pairs, 'combine' optionally folds the values of
+    a key within a split, and 'reduce' folds all values of a key into
+    its result. 'partition' picks the reducer of each key.
+    Jobs are pickled to the workers on the 'processes' backend.
+    """
+
+    # Attributes
+    input_format: InputFormat = TextInputFormat()
+
+    # Optional combiner, 'combine(key, values) -> value'
+    combine: Callable[[Any, List], Any] | None = None
+
+    def map(self, record) -> Iterator[Tuple[Any, Any]]:
+        raise NotImplementedError
+
+    def reduce(self, key, values: List) -> Any:
+        raise NotImplementedError
+
+    def partition(self, key, partition_count: int) -> int:
+        return hash_partition(repr(key), partition_count)
@@ -1,152 +1,228 @@
-from datetime import datetime
-from concurrent.futures import ThreadPoolExecutor, as_completed
-from typing import Dict
+import os
+from typing import Dict, Iterable, Iterator, List, Tuple
+
+from .executors import THREADS
+from .jobs import InputFormat, Job
+from .parsers import LogLineParser, Record
+from .partitioners import hash_partition
+from .runner import JobRunner
+from .splits import find_last_line_end, read_split
+from .stats import JobStats, TaskStats
+from .store import RECORD_COLUMNS, LogTable
+
+
+class LogInputFormat(InputFormat):
+    """
+    Parses the split in one batch. Identical records are counted
+    first, most lines repeat the same values, so records come out
+    as '(record, count)' pairs, or '((window, record), count)'
+    pairs with a 'window_size'.
+    """
+
+    # Constants
+    LOG_ENCODING = 'utf-8'
+
+    # Attributes
+    parser: LogLineParser
+    window_size: int | None
+
+    def __init__(self, parser: LogLineParser, window_size: int | None = None) -> None:
+        self.parser = parser
+        self.window_size = window_size
+
+    def read(
+        self, file_path: str, split_start: int, split_end: int, stats: TaskStats
+    ) -> Iterable[Tuple[Record, int]]:
+        with stats.measure('read'):
+            log_chunk = read_split(file_path, split_start, split_end)
+        stats.count('bytes_read', len(log_chunk))
+
+        with stats.measure('parse'):
+            log_text = log_chunk.decode(self.LOG_ENCODING)
+            record_counts, skipped_lines = self.parser.parse_chunk(log_text, self.window_size)
+        stats.count('lines', sum(record_counts.values()) + len(skipped_lines))
+        stats.count('skipped_lines', len(skipped_lines))
+
+        return record_counts.items()
+
+
+class RecordCountJob(Job):
+    """
+    Counts every distinct record, prefixed by the start of its tumbling
+    window with a 'window_size'. Every aggregation of the log can be
+    derived from these counts.
+    """
+
+    # Attributes
+    window_size: int | None  # Seconds
+
+    def __init__(self, parser: LogLineParser, window_size: int | None = None) -> None:
+        self.window_size = window_size
+        self.input_format = LogInputFormat(parser, window_size)
+
+    def map(self, record: Tuple[Record, int]) -> Iterator[Tuple[Tuple[str, ...], int]]:
+        parsed_record, count = record
+        if self.window_size is not None:
+            window_start, parsed_record = parsed_record
+            parsed_record = (window_start, *parsed_record)
+        yield parsed_record, count
+
+    def combine(self, key: Tuple[str, ...], values: List[int]) -> int:
+        return sum(values)
+
+    def reduce(self, key: Tuple[str, ...], values: List[int]) -> int:
+        return sum(values)
+
+    def partition(self, key: Tuple[str, ...], partition_count: int) -> int:
+        # The uid has the most distinct values
+        return hash_partition(key[-1], partition_count)
 
 
 class MapReduce:
+    """
+    Log analysis, counts every distinct record of the log into a
+    columnar 'LogTable' and derives the counts nested by dimension
+    from it. Every file's processed offset is checkpointed, so
+    processing a growing log again only reads the appended bytes and
+    adds their counts to the existing ones. With a 'window_size',
+    counts are also kept per tumbling window.
+    """
+
     # Constants
-    DATE_FORMAT_LENGTH = 19
-    INPUT_DATE_FORMAT = "%Y-%m-%d %H:%M:%S"
-    OUTPUT_DATE_FORMAT = "%Y-%m-%d"
-    LOG_DELIMITER = ' | '
-    LOG_TIMESTAMP_POSITION = 0
-    LOG_UUID_POSITION = 2
-    LOG_PATH_POSITION = 3
-    LOG_CODE_POSITION = 4
+    DEFAULT_SPLIT_SIZE = JobRunner.DEFAULT_SPLIT_SIZE
+    FIELDS = ('timestamps', 'paths', 'codes', 'uids')  # Order of the fields in a parsed record
+    FIELD_COLUMNS = dict(zip(FIELDS, RECORD_COLUMNS))  # Nested field -> table column
+    # Aggregations, dimension -> (grouping field, counted fields)
+    DIMENSIONS = {
+        'by_code': ('codes', ('timestamps', 'paths')),
+        'by_timestamp': ('timestamps', ('codes', 'paths')),
+        'by_path': ('paths', ('timestamps', 'codes')),
+        'by_uid': ('uids', ('timestamps', 'codes', 'paths')),
+    }
+    WINDOW_COLUMN = 'window'
 
     # Attributes
     mappers: int
     reducers: int
-    processed_log: Dict = {
-        'by_code': {},
-        'by_timestamp': {},
-        'by_path': {},
-        'by_uid': {},
-    }
-
-    def __init__(self, mappers: int, reducers: int) -> None:
+    backend: str
+    parser: LogLineParser
+    runner: JobRunner
+    table: LogTable
+    offsets: Dict[str, int]  # File path -> bytes processed so far
+
+    # Tunable Config
+    window_size: int | None  # Seconds
+
+    def __init__(
+        self,
+        mappers: int,
+        reducers: int,
+        backend: str = THREADS,
+        parser: LogLineParser | None = None,
+        spill_threshold: int | None = None,
+        window_size: int | None = None,
+    ) -> None:
         self.mappers = mappers
         self.reducers = reducers
+        # One of 'threads', 'processes' or 'inline'
+        self.backend = backend
+        self.parser = parser if parser is not None else LogLineParser()
+        self.window_size = window_size
+        self.runner = JobRunner(mappers, reducers, backend=backend, spill_threshold=spill_threshold)
+        self.table = LogTable(self._get_columns())
+        self.offsets = {}
+        self._processed_log = None
+        self._perform_validations()
+
+    @property
+    def processed_log(self) -> Dict:
+        """
+        Counts nested by dimension, grouping value, counted field and
+        value. Built from the table on first access after processing.
+        """
+        if self._processed_log is None:
+            self._processed_log = self._build_processed_log(self.table)
+        return self._processed_log
+
+    @property
+    def windows(self) -> Dict[str, Dict]:
+        """
+        Window start -> counts nested like 'processed_log'.
+        """
+        if self.window_size is None:
+            return {}
+
+        return {
+            window_start: self._build_processed_log(self.table.filter(**{self.WINDOW_COLUMN: window_start}))
+            for window_start in sorted(self.table.group_by(self.WINDOW_COLUMN))
+        }
 
-    def process_log(self, file_path: str, lines_per_chunk: int = 200, log_line_limit: int = 5000):
-        # MapReduce: Dividing and Mapping Phase
-        mapped_by_code = {}
-        mapped_by_timestamp = {}
-        mapped_by_path = {}
-        mapped_by_uid = {}
-
-        with ThreadPoolExecutor(max_workers=self.mappers) as mapper_executor:
-            mapping_futures_list = []
-
-            try:
-                with open(file_path, 'r') as file:
-                    total_lines_count = 0
-                    lines_count = 0
-                    chunk = []
-                    # Read one line at a time in case log is too large
-                    for line in file:
-                        chunk.append(line)
-                        lines_count += 1
-                        total_lines_count += 1
-                        if lines_count > lines_per_chunk:
-                            mapping_futures_list.append(mapper_executor.submit(self._mapping_task, chunk))
-                            lines_count = 0
-                            chunk = []
-                        if total_lines_count > log_line_limit:
-                            print(f'Reached file processing limit ({log_line_limit} lines).')
-                            break
-
-            except FileNotFoundError:
-                print(f'File not found: {file_path}')
-            except ValueError as error:
-                print(f'Error while processing the file: {error}')
-
-            # MapReduce: Shuffling and Merging Phase
-            for mapping_task_future in as_completed(mapping_futures_list):
-                mapped_result = mapping_task_future.result()
-
-                for key, val in mapped_result['by_code'].items():
-                    mapped_by_code.setdefault(key, []).extend(val)
-
-                for key, val in mapped_result['by_timestamp'].items():
-                    mapped_by_timestamp.setdefault(key, []).extend(val)
-
-                for key, val in mapped_result['by_path'].items():
-                    mapped_by_path.setdefault(key, []).extend(val)
-
-                for key, val in mapped_result['by_uid'].items():
-                    mapped_by_uid.setdefault(key, []).extend(val)
-
-        # MapReduce: Reducing Phase
-        with ThreadPoolExecutor(max_workers=self.reducers) as reducer_executor:
-            reducers_futures_dict = {
-                reducer_executor.submit(self._reducing_task, mapped_by_code): 'by_code',
-                reducer_executor.submit(self._reducing_task, mapped_by_timestamp): 'by_timestamp',
-                reducer_executor.submit(self._reducing_task, mapped_by_path): 'by_path',
-                reducer_executor.submit(self._reducing_task, mapped_by_uid): 'by_uid',
-            }
-
-            for reducer_future in as_completed(reducers_futures_dict):
-                self.processed_log[reducers_futures_dict[reducer_future]] = reducer_future.result()
+    @property
+    def stats(self) -> JobStats | None:
+        """
+        Timings and counters of the last 'process_log' call.
+        """
+        return self.runner.stats
+
+    def process_log(
+        self,
+        file_path: str,
+        split_size: int = DEFAULT_SPLIT_SIZE,
+        max_in_flight: int | None = None,
+        trace_path: str | None = None,
+        tail: bool = False,
+    ):
+        """
+        Processes the log from its last checkpoint, see 'JobRunner.run'.
+        A file smaller than its checkpoint was rotated or truncated,
+        so it is read again from the start. The end of the file ends the
+        last line, unless 'tail' is set for a log still being written:
+        then a last line without its newline is left for the next call.
+        """
+        checkpoint_path = os.path.abspath(file_path)
+        try:
+            file_size = os.path.getsize(file_path)
+        except FileNotFoundError:
+            print(f'File not found: {file_path}')
+            return True
+
+        start_offset = self.offsets.get(checkpoint_path, 0)
+        if file_size < start_offset:
+            start_offset = 0
+
+        end_offset = file_size
+        if tail:
+            end_offset = find_last_line_end(file_path, start_offset, file_size)
+        job = RecordCountJob(self.parser, self.window_size)
+        # Results go straight into the table, with a spill threshold they are read back from disk one at a time
+        results = self.runner.iter_results(
+            job, file_path, split_size, max_in_flight, start_offset, end_offset, trace_path
+        )
+        self.table = self.table.merge(LogTable.from_items(self._get_columns(), results))
+        self.offsets[checkpoint_path] = end_offset
+        self._processed_log = None
 
         return True
 
-    def _mapping_task(self, log_chunk):
-        output = {
-            'by_code': {},
-            'by_timestamp': {},
-            'by_path': {},
-            'by_uid': {},
-        }
-
-        for log_line in log_chunk:
-            try:
-                # Clean and extract
-                log_line = log_line.replace('\n', '')
-                split_line = log_line.split(self.LOG_DELIMITER)
-                uid = split_line[self.LOG_UUID_POSITION]
-                path = split_line[self.LOG_PATH_POSITION]
-                code = split_line[self.LOG_CODE_POSITION]
-                timestamp = datetime.strptime(log_line[:self.DATE_FORMAT_LENGTH], self.INPUT_DATE_FORMAT)
-                timestamp = timestamp.strftime(self.OUTPUT_DATE_FORMAT)
-
-                # Do mapping
-                output['by_code'].setdefault(code, []).append({'timestamp': timestamp, 'path': path})
-                output['by_timestamp'].setdefault(timestamp, []).append({'code': code, 'path': path})
-                output['by_path'].setdefault(path, []).append({'timestamp': timestamp, 'code': code})
-                output['by_uid'].setdefault(uid, []).append({'timestamp': timestamp, 'code': code, 'path': path})
-            except Exception as err:
-                print(f'Skipping log line: {log_line}. Error: {err}')
-
-        return output
-
-    def _reducing_task(self, mapped_output):
-        output = {}
-        for key in mapped_output:
-            data = {
-                'timestamps': {},
-                'paths': {},
-                'codes': {},
-                'uids': {},
-            }
-            for entry in mapped_output[key]:
-
-                timestamp = entry.get('timestamp')
-                if timestamp is not None:
-                    data['timestamps'][timestamp] = data['timestamps'].setdefault(timestamp, 0) + 1
-
-                path = entry.get('path')
-                if path is not None:
-                    data['paths'][path] = data['paths'].setdefault(path, 0) + 1
-
-                code = entry.get('code')
-                if code is not None:
-                    data['codes'][code] = data['codes'].setdefault(code, 0) + 1
-
-                uid = entry.get('uid')
-                if uid is not None:
-                    data['uids'][uid] = data['uids'].setdefault(uid, 0) + 1
-
-            output[key] = data
-
-        return output
+    def _get_columns(self) -> Tuple[str, ...]:
+        if self.window_size is None:
+            return RECORD_COLUMNS
+        return (self.WINDOW_COLUMN, *RECORD_COLUMNS)
+
+    def _build_processed_log(self, table: LogTable) -> Dict:
+        processed_log = {dimension: {} for dimension in self.DIMENSIONS}
+        for dimension, (group_field, counted_fields) in self.DIMENSIONS.items():
+            groups = processed_log[dimension]
+            for counted_field in counted_fields:
+                group_counts = table.group_by(self.FIELD_COLUMNS[group_field], self.FIELD_COLUMNS[counted_field])
+                for (group, value), count in group_counts.items():
+                    data = groups.get(group)
+                    if data is None:
+                        data = groups[group] = {field: {} for field in self.FIELDS}
+                    data[counted_field][value] = count
+        return processed_log
+
+    def _perform_validations(self) -> None:
+        if self.window_size is not None and self.window_size < 1:
+            error_message = f'Window size must be at least one second, got {self.window_size}'
+            raise ValueError(error_message)
@@ -0,0 +1,113 @@
+# src/map_reduce/parsers.py
+import re
+from collections import Counter
+from datetime import datetime, timedelta
+from typing import Iterable, List, Tuple
+
+# Parsed record, in the order of 'MapReduce.FIELDS'
+Record = Tuple[str, str, str, str]  # (date, path, code, uid)
+
+EPOCH = datetime(1970, 1, 1)
+
+
+class LogLineParser:
+    """
+    Parses '<YYYY-MM-DD HH:MM:SS> | <message> | <uid> | <path> | <code>'
+    lines. The date is a fixed width prefix, so it is sliced instead of
+    going through 'strptime', and fields come from a single bounded split.
+    Validation of the timestamp is optional and uses a precompiled pattern.
+    """
+
+    # Constants
+    DATE_LENGTH = 10
+    TIMESTAMP_LENGTH = 19
+    LOG_DELIMITER = ' | '
+    LOG_FIELD_COUNT = 5
+    TIMESTAMP_PATTERN = re.compile(r'\d{4}-(0[1-9]|1[0-2])-(0[1-9]|[12]\d|3[01]) ([01]\d|2[0-3]):[0-5]\d:[0-5]\d$')
+
+    # Tunable Config
+    validate: bool
+
+    def __init__(self, validate: bool = True) -> None:
+        self.validate = validate
+
+    def parse(self, log_line: str) -> Record:
+        """
+        Parses a single line.
+        Raises 'ValueError' if the line is malformed.
+        """
+        split_line = log_line.split(self.LOG_DELIMITER, self.LOG_FIELD_COUNT - 1)
+        if len(split_line) != self.LOG_FIELD_COUNT:
+            error_message = f'Expected {self.LOG_FIELD_COUNT} fields, got {len(split_line)}'
+            raise ValueError(error_message)
+
+        timestamp, _, uid, path, code = split_line
+        if self.validate and not self.TIMESTAMP_PATTERN.match(timestamp):
+            error_message = f'Invalid timestamp: {timestamp}'
+            raise ValueError(error_message)
+
+        return timestamp[:self.DATE_LENGTH], path, code, uid
+
+    def get_window(self, log_line: str, window_size: int) -> str:
+        """
+        Start of the tumbling window of 'window_size' seconds the line
+        falls in, formatted like the log's timestamps.
+        Raises 'ValueError' if the timestamp is malformed.
+        """
+        timestamp = datetime.fromisoformat(log_line[:self.TIMESTAMP_LENGTH])
+        seconds = (timestamp - EPOCH) // timedelta(seconds=1)
+        return str(EPOCH + timedelta(seconds=seconds - seconds % window_size))
+
+    def parse_chunk(self, log_chunk: str, window_size: int | None = None) -> Tuple[Counter, List[str]]:
+        """
+        Batch path, parses a whole chunk at once. Log lines repeat a lot,
+        so identical lines are counted first by 'Counter' in C and every
+        distinct line is parsed only once.
+        Returns the record counts, keyed by '(window, record)' when
+        'window_size' is given, and the skipped lines.
+        """
+        return self._count_records(Counter(log_chunk.splitlines()).items(), window_size)
+
+    def _count_records(
+        self, line_counts: Iterable[Tuple[str, int]], window_size: int | None
+    ) -> Tuple[Counter, List[str]]:
+        record_counts = Counter()
+        skipped_lines = []
+        for log_line, line_count in line_counts:
+            try:
+                record = self.parse(log_line)
+                if window_size is not None:
+                    record = (self.get_window(log_line, window_size), record)
+                record_counts[record] += line_count
+            except ValueError:
+                skipped_lines.extend([log_line] * line_count)
+        return record_counts, skipped_lines
+
+
+class StrptimeLogLineParser(LogLineParser):
+    """
+    Reference parser, fully parses and reformats every timestamp
+    with 'datetime'. Slower, kept to compare against.
+    """
+
+    # Constants
+    DATE_FORMAT_LENGTH = 19
+    INPUT_DATE_FORMAT = "%Y-%m-%d %H:%M:%S"
+    OUTPUT_DATE_FORMAT = "%Y-%m-%d"
+    LOG_UUID_POSITION = 2
+    LOG_PATH_POSITION = 3
+    LOG_CODE_POSITION = 4
+
+    def parse(self, log_line: str) -> Record:
+        split_line = log_line.split(self.LOG_DELIMITER)
+        try:
+            uid = split_line[self.LOG_UUID_POSITION]
+            path = split_line[self.LOG_PATH_POSITION]
+            code = split_line[self.LOG_CODE_POSITION]
+        except IndexError as error:
+            raise ValueError(error)
+        timestamp = datetime.strptime(log_line[:self.DATE_FORMAT_LENGTH], self.INPUT_DATE_FORMAT)
+        return timestamp.strftime(self.OUTPUT_DATE_FORMAT), path, code, uid
+
+    def parse_chunk(self, log_chunk: str, window_size: int | None = None) -> Tuple[Counter, List[str]]:
+        return self._count_records(((log_line, 1) for log_line in log_chunk.splitlines()), window_size)
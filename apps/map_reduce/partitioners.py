@@ -0,0 +1,11 @@
+# src/map_reduce/partitioners.py
+import zlib
+
+
+def hash_partition(key: str, partition_count: int) -> int:
+    """
+    Maps a key to a reducer partition in '[0, partition_count)'.
+    Uses CRC32 instead of 'hash', which is salted per process, so every
+    mapper places a key in the same partition on any backend.
+    """
+    return zlib.crc32(key.encode()) % partition_count
@@ -0,0 +1,244 @@
+# src/map_reduce/runner.py
+import contextlib
+import os
+import tempfile
+from concurrent.futures import FIRST_COMPLETED, as_completed, wait
+from typing import Any, Dict, Iterator, List, Tuple
+
+from .executors import BACKENDS, THREADS, create_executor
+from .jobs import Job
+from .spill import Partition, PartitionBuffer, read_run, write_run
+from .splits import compute_splits
+from .stats import JobStats, TaskStats
+
+
+class JobRunner:
+    """
+    Runs any 'Job' over a file. The file is divided in byte range splits
+    that mappers read on their own, while the driver only keeps up to
+    'max_in_flight' splits queued. Mappers combine and hash partition
+    their output in one partition per reducer, and every partition is
+    merged and reduced by its own task.
+    With a 'spill_threshold', buffered partitions are spilled to sorted
+    run files whenever the driver holds more keys than that, and reducers
+    stream them back through a k-way merge. Reducers then write their
+    results to a run as well, which 'iter_results' reads back one key at
+    a time. The driver holds at most 'spill_threshold' keys plus the
+    output of one mapper, and so does a reducer besides one item per run,
+    whatever the number of distinct keys.
+    The 'stats' of the last run hold per phase timings and counters.
+    """
+
+    # Constants
+    DEFAULT_SPLIT_SIZE = 4 * 1024 * 1024
+    IN_FLIGHT_SPLITS_PER_MAPPER = 2
+
+    # Attributes
+    mappers: int
+    reducers: int
+    backend: str
+    stats: JobStats | None
+
+    # Tunable Config
+    spill_threshold: int | None  # Keys buffered by the driver before spilling, unbounded when 'None'
+    spill_directory: str | None  # Where run files are written, the system's temporary directory by default
+
+    def __init__(
+        self,
+        mappers: int,
+        reducers: int,
+        backend: str = THREADS,
+        spill_threshold: int | None = None,
+        spill_directory: str | None = None,
+    ) -> None:
+        self.mappers = mappers
+        self.reducers = reducers
+        # One of 'threads', 'processes' or 'inline'
+        self.backend = backend
+        self.spill_threshold = spill_threshold
+        self.spill_directory = spill_directory
+        self.stats = None
+        self._perform_validations()
+
+    def run(
+        self,
+        job: Job,
+        file_path: str,
+        split_size: int = DEFAULT_SPLIT_SIZE,
+        max_in_flight: int | None = None,
+        start_offset: int = 0,
+        end_offset: int | None = None,
+        trace_path: str | None = None,
+    ) -> Dict[Any, Any]:
+        """
+        Returns the reduced result of every key, see 'iter_results'.
+        """
+        return dict(self.iter_results(job, file_path, split_size, max_in_flight, start_offset, end_offset, trace_path))
+
+    def iter_results(
+        self,
+        job: Job,
+        file_path: str,
+        split_size: int = DEFAULT_SPLIT_SIZE,
+        max_in_flight: int | None = None,
+        start_offset: int = 0,
+        end_offset: int | None = None,
+        trace_path: str | None = None,
+    ) -> Iterator[Tuple[Any, Any]]:
+        """
+        Yields the reduced result of every key once all reducers are done,
+        only reading the lines that start within '[start_offset, end_offset)'
+        when given. With a 'spill_threshold', results are streamed from the
+        reducers' run files, removed once everything was yielded.
+        Every task is also written to 'trace_path' when given, see
+        'JobStats.write_trace'.
+        Raises 'FileNotFoundError' if the file does not exist.
+        """
+        max_in_flight = max_in_flight or self.mappers * self.IN_FLIGHT_SPLITS_PER_MAPPER
+        self.stats = JobStats()
+        with self.stats.measure('split'):
+            splits = compute_splits(file_path, split_size, start_offset, end_offset)
+
+        # Run files are removed once reduced and read back
+        spill_context = contextlib.nullcontext()
+        if self.spill_threshold is not None:
+            spill_context = tempfile.TemporaryDirectory(dir=self.spill_directory)
+
+        with spill_context as spill_directory:
+            # MapReduce: Dividing and Mapping Phase
+            # Partition -> output of every mapper, merged by the reducers
+            shuffled_partitions = [PartitionBuffer() for _ in range(self.reducers)]
+
+            with create_executor(self.backend, self.mappers) as mapper_executor:
+                mapping_futures = set()
+                for split_start, split_end in splits:
+                    # Backpressure, wait for a split to finish before queueing more
+                    if len(mapping_futures) >= max_in_flight:
+                        done_futures, mapping_futures = wait(mapping_futures, return_when=FIRST_COMPLETED)
+                        self._shuffle_mapped_results(done_futures, shuffled_partitions, spill_directory)
+
+                    mapping_futures.add(
+                        mapper_executor.submit(
+                            self._mapping_task, job, file_path, split_start, split_end, self.reducers
+                        )
+                    )
+                    self.stats.sample_queue_depth(len(mapping_futures))
+
+                self._shuffle_mapped_results(as_completed(mapping_futures), shuffled_partitions, spill_directory)
+
+            # MapReduce: Merging and Reducing Phase
+            # Reducer outputs, results in memory or the path of their run when spilling
+            reduced_outputs = []
+            with create_executor(self.backend, self.reducers) as reducer_executor:
+                reducer_futures = []
+                for index, buffer in enumerate(shuffled_partitions):
+                    output_path = None
+                    if spill_directory is not None:
+                        output_path = os.path.join(spill_directory, f'reduced-{index}.pickle')
+                    reducer_futures.append(reducer_executor.submit(self._reducing_task, job, buffer, output_path))
+
+                for reducer_future in as_completed(reducer_futures):
+                    reduced_output, task_stats = reducer_future.result()
+                    self.stats.add_task(task_stats)
+                    reduced_outputs.append(reduced_output)
+
+            self.stats.count('spilled_runs', sum(len(buffer.run_paths) for buffer in shuffled_partitions))
+            self.stats.finish()
+            if trace_path is not None:
+                self.stats.write_trace(trace_path)
+
+            # Partitions hold disjoint keys
+            for reduced_output in reduced_outputs:
+                if spill_directory is None:
+                    yield from reduced_output.items()
+                else:
+                    yield from read_run(reduced_output)
+
+    def _shuffle_mapped_results(
+        self, mapping_futures, shuffled_partitions: List[PartitionBuffer], spill_directory: str | None
+    ) -> None:
+        # MapReduce: Shuffling Phase
+        # Partitions are only routed to their reducer, merging them is left to the reducers
+        for mapping_task_future in mapping_futures:
+            partitions, task_stats = mapping_task_future.result()
+            self.stats.add_task(task_stats)
+
+            with self.stats.measure('shuffle'):
+                for index, partition in enumerate(partitions):
+                    if partition:
+                        shuffled_partitions[index].add(partition)
+
+            if spill_directory is not None:
+                buffered_keys = sum(buffer.buffered_keys for buffer in shuffled_partitions)
+                if buffered_keys > self.spill_threshold:
+                    with self.stats.measure('spill'):
+                        for buffer in shuffled_partitions:
+                            buffer.spill(spill_directory)
+
+    @staticmethod
+    def _mapping_task(
+        job: Job, file_path: str, split_start: int, split_end: int, reducers: int
+    ) -> Tuple[List[Partition], TaskStats]:
+        # Each mapper reads its own split, workers get the job, the path and the split's offsets, not the runner
+        stats = TaskStats(f'map {split_start}-{split_end}')
+        records = job.input_format.read(file_path, split_start, split_end, stats)
+
+        mapped_values: Partition = {}
+        record_count = 0
+        with stats.measure('map'):
+            for record in records:
+                record_count += 1
+                for key, value in job.map(record):
+                    values = mapped_values.get(key)
+                    if values is None:
+                        mapped_values[key] = [value]
+                    else:
+                        values.append(value)
+        stats.count('splits')
+        stats.count('records', record_count)
+
+        # Combiner, only one value per key leaves the mapper
+        if job.combine is not None:
+            with stats.measure('combine'):
+                mapped_values = {key: [job.combine(key, values)] for key, values in mapped_values.items()}
+        stats.count('mapped_keys', len(mapped_values))
+
+        if reducers == 1:
+            return [mapped_values], stats.finish()
+
+        with stats.measure('partition'):
+            partitions: List[Partition] = [{} for _ in range(reducers)]
+            for key, values in mapped_values.items():
+                partitions[job.partition(key, reducers)][key] = values
+        return partitions, stats.finish()
+
+    @staticmethod
+    def _reducing_task(
+        job: Job, partition_buffer: PartitionBuffer, output_path: str | None
+    ) -> Tuple[Dict[Any, Any] | str, TaskStats]:
+        # MapReduce: Merging Phase, done per partition
+        # Results are streamed to a run at 'output_path' when given, instead of kept in memory
+        stats = TaskStats('reduce')
+        reduced_items = ((key, job.reduce(key, values)) for key, values in partition_buffer.iter_values())
+        with stats.measure('reduce'):
+            if output_path is None:
+                reduced_output = dict(reduced_items)
+                reduced_count = len(reduced_output)
+            else:
+                reduced_output = output_path
+                reduced_count = write_run(output_path, reduced_items)
+        stats.count('reduced_keys', reduced_count)
+        return reduced_output, stats.finish()
+
+    def _perform_validations(self) -> None:
+        if self.backend not in BACKENDS:
+            error_message = f'Unknown executor backend: {self.backend}. Use one of {BACKENDS}'
+            raise ValueError(error_message)
+
+        if self.reducers < 1:
+            error_message = f'At least one reducer is needed, got {self.reducers}'
+            raise ValueError(error_message)
+
+        if self.spill_threshold is not None and self.spill_threshold < 0:
+            error_message = f'Spill threshold must not be negative, got {self.spill_threshold}'
+            raise ValueError(error_message)
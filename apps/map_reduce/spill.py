@@ -0,0 +1,107 @@
+# src/map_reduce/spill.py
+import heapq
+import os
+import pickle
+from itertools import groupby
+from operator import itemgetter
+from typing import Any, Dict, Iterable, Iterator, List, Tuple
+
+# Key -> values of a key, as emitted by mappers and merged by reducers
+Partition = Dict[Any, List]
+
+
+def write_run(file_path: str, items: Iterable[Tuple[Any, Any]]) -> int:
+    """
+    Writes '(key, values)' items as a run of consecutive pickle frames
+    so it can be read back one item at a time. Runs to merge must be
+    sorted by key. Returns how many items were written.
+    """
+    item_count = 0
+    with open(file_path, 'wb') as file:
+        pickler = pickle.Pickler(file, protocol=pickle.HIGHEST_PROTOCOL)
+        for item in items:
+            pickler.dump(item)
+            # Frames are independent, the memo would keep every item alive
+            pickler.clear_memo()
+            item_count += 1
+    return item_count
+
+
+def read_run(file_path: str) -> Iterator[Tuple[Any, List]]:
+    with open(file_path, 'rb') as file:
+        unpickler = pickle.Unpickler(file)
+        while True:
+            try:
+                yield unpickler.load()
+            except EOFError:
+                return
+
+
+def merge_runs(runs: List[Iterable[Tuple[Any, List]]]) -> Iterator[Tuple[Any, List]]:
+    """
+    K-way streaming merge of sorted runs, only one item of each run is
+    held in memory. The values of a key found in several runs are joined.
+    """
+    for key, items in groupby(heapq.merge(*runs, key=itemgetter(0)), key=itemgetter(0)):
+        values = []
+        for _, run_values in items:
+            values.extend(run_values)
+        yield key, values
+
+
+class PartitionBuffer:
+    """
+    Mapper outputs of one reducer partition. They stay in memory until
+    'spill' merges them into a sorted run file, then reducers stream
+    the runs and what is left in memory through a k-way merge.
+    Keys must be sortable once anything is spilled.
+    """
+
+    # Attributes
+    partitions: List[Partition]
+    buffered_keys: int
+    run_paths: List[str]
+
+    def __init__(self) -> None:
+        self.partitions = []
+        self.buffered_keys = 0
+        self.run_paths = []
+
+    def add(self, partition: Partition) -> None:
+        self.partitions.append(partition)
+        self.buffered_keys += len(partition)
+
+    def spill(self, directory: str) -> None:
+        if not self.partitions:
+            return
+
+        run_path = os.path.join(directory, f'run-{id(self)}-{len(self.run_paths)}.pickle')
+        write_run(run_path, sorted(self._merge_partitions().items(), key=itemgetter(0)))
+        self.run_paths.append(run_path)
+        self.partitions = []
+        self.buffered_keys = 0
+
+    def iter_values(self) -> Iterator[Tuple[Any, List]]:
+        """
+        Yields every key with all of its values. Without runs, the
+        buffered partitions are merged in memory without sorting.
+        """
+        merged_values = self._merge_partitions()
+        if not self.run_paths:
+            yield from merged_values.items()
+            return
+
+        runs = [read_run(run_path) for run_path in self.run_paths]
+        runs.append(sorted(merged_values.items(), key=itemgetter(0)))
+        yield from merge_runs(runs)
+
+    def _merge_partitions(self) -> Partition:
+        merged_values: Partition = {}
+        for partition in self.partitions:
+            for key, values in partition.items():
+                merged = merged_values.get(key)
+                if merged is None:
+                    merged_values[key] = list(values)
+                else:
+                    merged.extend(values)
+        return merged_values
@@ -0,0 +1,66 @@
+# src/map_reduce/splits.py
+import mmap
+import os
+from typing import List, Tuple
+
+NEWLINE = ord('\n')
+
+
+def compute_splits(
+    file_path: str, split_size: int, start_offset: int = 0, end_offset: int | None = None
+) -> List[Tuple[int, int]]:
+    """
+    Divides a file, or its '[start_offset, end_offset)' range, into
+    '[start, end)' byte ranges of 'split_size' bytes.
+    Ranges ignore line boundaries, each reader aligns its own range.
+    """
+    file_size = os.path.getsize(file_path)
+    if end_offset is not None:
+        file_size = min(file_size, end_offset)
+    return [
+        (start, min(start + split_size, file_size))
+        for start in range(start_offset, file_size, split_size)
+    ]
+
+
+def read_split(file_path: str, start: int, end: int) -> bytes:
+    """
+    Returns every line that starts within '[start, end)'. A line crossing
+    'start' belongs to the previous split and a line crossing 'end' is
+    read until its newline, so consecutive splits never overlap or miss
+    lines. The file is memory mapped, only the pages in range are read.
+    """
+    with open(file_path, 'rb') as file:
+        file_size = os.fstat(file.fileno()).st_size
+        if start >= file_size:
+            return b''
+
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped_file:
+            # Skip the partial first line unless the range starts right after a newline
+            if start > 0 and mapped_file[start - 1] != NEWLINE:
+                newline_index = mapped_file.find(b'\n', start)
+                start = newline_index + 1 if newline_index >= 0 else file_size
+
+            # Finish the last line, which may run past the range
+            stop = file_size
+            if end < file_size:
+                newline_index = mapped_file.find(b'\n', end - 1)
+                stop = newline_index + 1 if newline_index >= 0 else file_size
+
+            if start >= stop:
+                return b''
+            return mapped_file[start:stop]
+
+
+def find_last_line_end(file_path: str, start: int, end: int) -> int:
+    """
+    Offset right after the last newline within '[start, end)', or 'start'
+    if no line in the range is complete yet, e.g. while it is written.
+    """
+    if start >= end:
+        return start
+
+    with open(file_path, 'rb') as file:
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped_file:
+            newline_index = mapped_file.rfind(b'\n', start, end)
+    return newline_index + 1 if newline_index >= 0 else start
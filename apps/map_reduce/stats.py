@@ -0,0 +1,188 @@
+# src/map_reduce/stats.py
+import contextlib
+import json
+import os
+import resource
+import sys
+import threading
+import time
+from collections import Counter
+from typing import Dict, Iterator, List
+
+
+def get_peak_memory_bytes() -> int:
+    """
+    Peak resident memory of this process and of its finished
+    children, as reported by 'getrusage'.
+    """
+    # Linux reports kilobytes, macOS bytes
+    unit = 1 if sys.platform == 'darwin' else 1024
+    return unit * max(
+        resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+        resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss,
+    )
+
+
+class TaskStats:
+    """
+    Timings and counters of a single map or reduce task. Small enough
+    to travel back to the driver with the task's result.
+    """
+
+    # Attributes
+    name: str
+    phases: Dict[str, List[float]]  # Phase -> [wall seconds, CPU seconds]
+    counters: Counter
+    start_time: float
+    end_time: float
+    process_id: int
+    thread_id: int
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self.phases = {}
+        self.counters = Counter()
+        self.start_time = time.perf_counter()
+        self.end_time = self.start_time
+        self.process_id = os.getpid()
+        self.thread_id = threading.get_ident()
+
+    @contextlib.contextmanager
+    def measure(self, phase: str) -> Iterator[None]:
+        # 'thread_time' only counts this worker's CPU, even next to other threads
+        start_wall, start_cpu = time.perf_counter(), time.thread_time()
+        try:
+            yield
+        finally:
+            timings = self.phases.setdefault(phase, [0.0, 0.0])
+            timings[0] += time.perf_counter() - start_wall
+            timings[1] += time.thread_time() - start_cpu
+
+    def count(self, counter: str, amount: int = 1) -> None:
+        self.counters[counter] += amount
+
+    def finish(self) -> 'TaskStats':
+        self.end_time = time.perf_counter()
+        return self
+
+    def get_seconds(self) -> float:
+        return self.end_time - self.start_time
+
+
+class JobStats:
+    """
+    Per phase wall and CPU time, counters and latencies of a job run,
+    merged from the stats of every task plus the driver's own phases.
+    """
+
+    # Attributes
+    phases: Dict[str, List[float]]  # Phase -> [wall seconds, CPU seconds], summed over tasks
+    counters: Counter
+    tasks: List[TaskStats]
+    queue_depths: List[int]  # Mapping tasks in flight, sampled at every submission
+    start_time: float
+    end_time: float
+    peak_memory_bytes: int
+
+    # Constants
+    LATENCY_BUCKETS_MS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000)
+
+    def __init__(self) -> None:
+        self.phases = {}
+        self.counters = Counter()
+        self.tasks = []
+        self.queue_depths = []
+        self.start_time = time.perf_counter()
+        self.end_time = self.start_time
+        self.peak_memory_bytes = 0
+        self._driver = TaskStats('driver')
+
+    def measure(self, phase: str):
+        """
+        Times a phase run by the driver itself.
+        """
+        return self._driver.measure(phase)
+
+    def add_task(self, task_stats: TaskStats) -> None:
+        self.tasks.append(task_stats)
+        self._add_phases(task_stats.phases)
+        self.counters.update(task_stats.counters)
+
+    def count(self, counter: str, amount: int = 1) -> None:
+        self.counters[counter] += amount
+
+    def sample_queue_depth(self, depth: int) -> None:
+        self.queue_depths.append(depth)
+
+    def finish(self) -> 'JobStats':
+        self.end_time = time.perf_counter()
+        self._driver.finish()
+        self._add_phases(self._driver.phases)
+        self.peak_memory_bytes = get_peak_memory_bytes()
+        return self
+
+    def get_seconds(self) -> float:
+        return self.end_time - self.start_time
+
+    def get_latency_histogram(self, prefix: str) -> Dict[str, int]:
+        """
+        Counts the latencies of the tasks named 'prefix...' per
+        bucket, keyed by the bucket's upper bound in milliseconds.
+        """
+        histogram = {f'<={bucket}ms': 0 for bucket in self.LATENCY_BUCKETS_MS}
+        histogram['>5000ms'] = 0
+        for task_stats in self.tasks:
+            if not task_stats.name.startswith(prefix):
+                continue
+            latency_ms = task_stats.get_seconds() * 1000
+            bucket = next((bucket for bucket in self.LATENCY_BUCKETS_MS if latency_ms <= bucket), None)
+            histogram[f'<={bucket}ms' if bucket is not None else '>5000ms'] += 1
+        return histogram
+
+    def to_dict(self) -> Dict:
+        seconds = self.get_seconds()
+        return {
+            'seconds': seconds,
+            'phases': {
+                phase: {'wall_seconds': wall_seconds, 'cpu_seconds': cpu_seconds}
+                for phase, (wall_seconds, cpu_seconds) in self.phases.items()
+            },
+            'counters': dict(self.counters),
+            'records_per_second': self.counters['records'] / seconds if seconds else 0.0,
+            'bytes_per_second': self.counters['bytes_read'] / seconds if seconds else 0.0,
+            'split_latency_histogram': self.get_latency_histogram('map'),
+            'queue_depth': {
+                'max': max(self.queue_depths, default=0),
+                'mean': sum(self.queue_depths) / len(self.queue_depths) if self.queue_depths else 0.0,
+            },
+            'peak_memory_bytes': self.peak_memory_bytes,
+        }
+
+    def write_trace(self, file_path: str) -> None:
+        """
+        Writes every task as a complete event of the Trace Event Format,
+        which 'chrome://tracing' and Perfetto can open.
+        """
+        events = [
+            {
+                'name': task_stats.name,
+                'ph': 'X',
+                'ts': (task_stats.start_time - self.start_time) * 1e6,
+                'dur': task_stats.get_seconds() * 1e6,
+                'pid': task_stats.process_id,
+                'tid': task_stats.thread_id,
+                'args': {
+                    'phases': {phase: wall_seconds for phase, (wall_seconds, _) in task_stats.phases.items()},
+                    'counters': dict(task_stats.counters),
+                },
+            }
+            for task_stats in self.tasks
+        ]
+        with open(file_path, 'w') as file:
+            json.dump({'traceEvents': events, 'otherData': self.to_dict()}, file)
+
+    def _add_phases(self, phases: Dict[str, List[float]]) -> None:
+        for phase, (wall_seconds, cpu_seconds) in phases.items():
+            timings = self.phases.setdefault(phase, [0.0, 0.0])
+            timings[0] += wall_seconds
+            timings[1] += cpu_seconds
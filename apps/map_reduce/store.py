@@ -0,0 +1,236 @@
+# src/map_reduce/store.py
+from typing import Dict, Iterable, List, Mapping, Sequence, Tuple
+
+import numpy as np
+
+# Columns of a parsed record, in the order of 'Record'
+RECORD_COLUMNS = ('date', 'path', 'code', 'uid')
+
+
+def encode_strings(values: List[str]) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Packs strings as their concatenated UTF-8 bytes and the offset
+    where each one ends, instead of a fixed width array padded to
+    the longest one.
+    """
+    encoded_values = [value.encode() for value in values]
+    offsets = np.cumsum([len(value) for value in encoded_values], dtype=np.int64)
+    return np.frombuffer(b''.join(encoded_values), dtype=np.uint8), offsets
+
+
+def decode_strings(data: np.ndarray, offsets: np.ndarray) -> List[str]:
+    content = data.tobytes()
+    starts = [0, *offsets[:-1].tolist()]
+    return [content[start:end].decode() for start, end in zip(starts, offsets.tolist())]
+
+
+class LogTable:
+    """
+    Columnar table of distinct records and how many times each was seen.
+    Strings are dictionary encoded, every column is an array of indexes
+    into its own dictionary, so each distinct value is stored once and
+    counts are stored once per record instead of once per dimension.
+    """
+
+    # Attributes
+    columns: Tuple[str, ...]
+    dictionaries: Dict[str, List[str]]  # Column -> distinct values, indexed by their code
+    codes: Dict[str, np.ndarray]  # Column -> value code of every row
+    counts: np.ndarray
+
+    # Constants
+    CODE_TYPE = np.int32
+    COUNT_TYPE = np.int64
+
+    def __init__(self, columns: Sequence[str] = RECORD_COLUMNS) -> None:
+        self.columns = tuple(columns)
+        self.dictionaries = {column: [] for column in self.columns}
+        self.codes = {column: np.empty(0, dtype=self.CODE_TYPE) for column in self.columns}
+        self.counts = np.empty(0, dtype=self.COUNT_TYPE)
+
+    def __len__(self) -> int:
+        return len(self.counts)
+
+    @classmethod
+    def from_counts(cls, columns: Sequence[str], record_counts: Mapping[Tuple[str, ...], int]) -> 'LogTable':
+        """
+        Builds a table from distinct records, in the order of 'columns'.
+        """
+        return cls.from_items(columns, record_counts.items())
+
+    @classmethod
+    def from_items(cls, columns: Sequence[str], record_counts: Iterable[Tuple[Tuple[str, ...], int]]) -> 'LogTable':
+        """
+        Builds a table from '(record, count)' pairs of distinct records,
+        reading them once, so they can be streamed.
+        """
+        table = cls(columns)
+        encodings = [{} for _ in table.columns]
+        rows = []
+        counts = []
+        for record, count in record_counts:
+            rows.append([encoding.setdefault(value, len(encoding)) for encoding, value in zip(encodings, record)])
+            counts.append(count)
+
+        row_codes = np.array(rows, dtype=cls.CODE_TYPE).reshape(len(rows), len(table.columns))
+        for index, column in enumerate(table.columns):
+            table.dictionaries[column] = list(encodings[index])
+            table.codes[column] = np.ascontiguousarray(row_codes[:, index])
+        table.counts = np.array(counts, dtype=cls.COUNT_TYPE)
+        return table
+
+    def merge(self, other: 'LogTable') -> 'LogTable':
+        """
+        Returns a new table with the rows of both, adding up
+        the counts of records found in both.
+        """
+        self._perform_merge_validations(other)
+
+        table = LogTable(self.columns)
+        for column in self.columns:
+            dictionary = list(self.dictionaries[column])
+            encoding = {value: code for code, value in enumerate(dictionary)}
+            # Translate the other table's codes into this dictionary
+            translation = np.array(
+                [encoding.setdefault(value, len(encoding)) for value in other.dictionaries[column]],
+                dtype=self.CODE_TYPE,
+            )
+            dictionary.extend(list(encoding)[len(dictionary):])
+
+            table.dictionaries[column] = dictionary
+            table.codes[column] = np.concatenate([self.codes[column], translation[other.codes[column]]])
+        table.counts = np.concatenate([self.counts, other.counts])
+        return table._aggregate(self.columns)
+
+    def filter(self, **conditions: str | Iterable[str]) -> 'LogTable':
+        """
+        Keeps the rows whose columns match a value, or any of a
+        collection of values. E.g. 'filter(code='503', path=['/a', '/b'])'.
+        """
+        mask = np.ones(len(self), dtype=bool)
+        for column, values in conditions.items():
+            self._perform_column_validations([column])
+            values = [values] if isinstance(values, str) else values
+            encoding = {value: code for code, value in enumerate(self.dictionaries[column])}
+            wanted_codes = [encoding[value] for value in values if value in encoding]
+            mask &= np.isin(self.codes[column], wanted_codes)
+
+        table = LogTable(self.columns)
+        # Dictionaries are shared, filtering never changes them
+        table.dictionaries = self.dictionaries
+        table.codes = {column: codes[mask] for column, codes in self.codes.items()}
+        table.counts = self.counts[mask]
+        return table
+
+    def group_by(self, *columns: str) -> Dict[str | Tuple[str, ...], int]:
+        """
+        Sums the counts of every combination of values of 'columns'.
+        Keys are plain values when grouping by a single column.
+        """
+        table = self._aggregate(columns)
+        dictionaries = [table.dictionaries[column] for column in columns]
+        code_columns = [table.codes[column].tolist() for column in columns]
+        counts = table.counts.tolist()
+
+        if len(columns) == 1:
+            dictionary = dictionaries[0]
+            return {dictionary[code]: count for code, count in zip(code_columns[0], counts)}
+
+        return {
+            tuple(dictionary[code] for dictionary, code in zip(dictionaries, row_codes)): count
+            for *row_codes, count in zip(*code_columns, counts)
+        }
+
+    def top_k(self, k: int, *columns: str) -> List[Tuple[str | Tuple[str, ...], int]]:
+        """
+        The 'k' most frequent combinations of values of 'columns',
+        most frequent first.
+        """
+        groups = self.group_by(*columns)
+        counts = np.fromiter(groups.values(), dtype=self.COUNT_TYPE, count=len(groups))
+        if k < len(counts):
+            top_indexes = np.argpartition(-counts, k)[:k]
+        else:
+            top_indexes = np.arange(len(counts))
+        top_indexes = top_indexes[np.argsort(-counts[top_indexes], kind='stable')]
+
+        keys = list(groups)
+        return [(keys[index], int(counts[index])) for index in top_indexes]
+
+    def get_total(self) -> int:
+        return int(self.counts.sum())
+
+    def get_memory_bytes(self) -> int:
+        """
+        Size of the arrays plus the size of the dictionaries' strings.
+        """
+        array_bytes = self.counts.nbytes + sum(codes.nbytes for codes in self.codes.values())
+        string_bytes = sum(len(value) for dictionary in self.dictionaries.values() for value in dictionary)
+        return array_bytes + string_bytes
+
+    def save(self, file_path: str) -> None:
+        """
+        Writes the table as an uncompressed '.npz' archive, without pickles.
+        Codes and counts are narrowed to the smallest type that fits them.
+        """
+        column_data, column_offsets = encode_strings(list(self.columns))
+        max_count = int(self.counts.max()) if len(self) else 0
+        arrays = {
+            'column_data': column_data,
+            'column_offsets': column_offsets,
+            'counts': self.counts.astype(np.min_scalar_type(max_count)),
+        }
+        for index, column in enumerate(self.columns):
+            arrays[f'dictionary_data_{index}'], arrays[f'dictionary_offsets_{index}'] = encode_strings(
+                self.dictionaries[column]
+            )
+            arrays[f'codes_{index}'] = self.codes[column].astype(np.min_scalar_type(len(self.dictionaries[column])))
+
+        with open(file_path, 'wb') as file:
+            np.savez(file, **arrays)
+
+    @classmethod
+    def load(cls, file_path: str) -> 'LogTable':
+        with np.load(file_path, allow_pickle=False) as arrays:
+            table = cls(decode_strings(arrays['column_data'], arrays['column_offsets']))
+            for index, column in enumerate(table.columns):
+                table.dictionaries[column] = decode_strings(
+                    arrays[f'dictionary_data_{index}'], arrays[f'dictionary_offsets_{index}']
+                )
+                table.codes[column] = arrays[f'codes_{index}'].astype(cls.CODE_TYPE)
+            table.counts = arrays['counts'].astype(cls.COUNT_TYPE)
+        return table
+
+    def _aggregate(self, columns: Sequence[str]) -> 'LogTable':
+        """
+        Table of the distinct combinations of 'columns' and their summed
+        counts, empty combinations left out.
+        """
+        self._perform_column_validations(columns)
+
+        table = LogTable(columns)
+        table.dictionaries = {column: self.dictionaries[column] for column in columns}
+        if not len(self):
+            return table
+
+        row_codes = np.stack([self.codes[column] for column in columns], axis=1)
+        unique_codes, inverse = np.unique(row_codes, axis=0, return_inverse=True)
+        counts = np.zeros(len(unique_codes), dtype=self.COUNT_TYPE)
+        np.add.at(counts, inverse.reshape(-1), self.counts)
+
+        non_empty = counts > 0
+        for index, column in enumerate(columns):
+            table.codes[column] = np.ascontiguousarray(unique_codes[non_empty, index])
+        table.counts = counts[non_empty]
+        return table
+
+    def _perform_column_validations(self, columns: Sequence[str]) -> None:
+        for column in columns:
+            if column not in self.dictionaries:
+                error_message = f'Unknown column: {column}. Use one of {self.columns}'
+                raise KeyError(error_message)
+
+    def _perform_merge_validations(self, other: 'LogTable') -> None:
+        if other.columns != self.columns:
+            error_message = f'Cannot merge tables with columns {self.columns} and {other.columns}'
+            raise ValueError(error_message)
@@ -0,0 +1,61 @@
+import pickle
+import tempfile
+from collections import Counter
+from pathlib import Path
+from unittest import TestCase
+
+import pytest
+
+from ..jobs import Job
+from ..runner import JobRunner
+
+
+class WordCountJob(Job):
+    def map(self, record):
+        for word in record.split():
+            yield word, 1
+
+    def reduce(self, key, values):
+        return sum(values)
+
+
+class CombinedWordCountJob(WordCountJob):
+    def combine(self, key, values):
+        return sum(values)
+
+
+class TestSuite(TestCase):
+    def test_should_run_word_count_job(self):
+        with tempfile.TemporaryDirectory() as directory:
+            # Build data
+            file_path = Path(directory) / 'words.txt'
+            text = 'the quick brown fox\njumps over the lazy dog\nthe end\n' * 100
+            file_path.write_text(text)
+
+            for job in [WordCountJob(), CombinedWordCountJob()]:
+                for backend in ['inline', 'threads', 'processes']:
+                    # Do
+                    results = JobRunner(2, 3, backend=backend).run(job, file_path, split_size=256)
+
+                    # Assert
+                    assert results == Counter(text.split())
+
+    def test_should_map_split_without_runner(self):
+        with tempfile.TemporaryDirectory() as directory:
+            # Build data
+            file_path = Path(directory) / 'words.txt'
+            file_path.write_text('the quick brown fox\nthe lazy dog\n')
+
+            # Do, the task is what workers receive, it must not need the runner or its stats
+            task = pickle.loads(pickle.dumps(JobRunner(1, 2)._mapping_task))
+            partitions, task_stats = task(CombinedWordCountJob(), file_path, 0, file_path.stat().st_size, 2)
+
+        # Assert
+        word_counts = {key: values for partition in partitions for key, values in partition.items()}
+        assert len(partitions) == 2
+        assert word_counts == {'the': [2], 'quick': [1], 'brown': [1], 'fox': [1], 'lazy': [1], 'dog': [1]}
+        assert task_stats.counters['records'] == 2
+
+    def test_should_fail_running_job_on_missing_file(self):
+        with pytest.raises(FileNotFoundError):
+            JobRunner(1, 1).run(WordCountJob(), 'missing.log')
@@ -1,7 +1,14 @@
+import copy
+import tempfile
+from pathlib import Path
 from unittest import TestCase
+
+import pytest
 from django.conf import settings
 
+from ..benchmarks import benchmark_scaling, replicate_log
 from ..map_reduce import MapReduce
+from ..partitioners import hash_partition
 
 
 class TestSuite(TestCase):
@@ -38,3 +45,220 @@ class TestSuite(TestCase):
         assert mapreduce.processed_log['by_timestamp']['2023-03-14']['codes']['503'] == 2
         assert mapreduce.processed_log['by_path']['/settings']['codes']['200'] == 244
         assert mapreduce.processed_log['by_uid']['5xGm3HsW']['paths']['/about'] == 236
+
+    def test_should_process_sample_log_with_processes(self):
+        # Build data
+        mapreduce = MapReduce(2, 2, backend='processes')
+
+        # Do
+        mapreduce.process_log(self.FILE_PATH)
+
+        # Assert
+        assert mapreduce.processed_log['by_code']['422']['paths']['/process'] == 4
+        assert mapreduce.processed_log['by_path']['/settings']['codes']['200'] == 244
+        assert mapreduce.processed_log['by_uid']['5xGm3HsW']['paths']['/about'] == 236
+
+    def test_should_process_sample_log_inline(self):
+        # Build data
+        mapreduce = MapReduce(1, 1, backend='inline')
+
+        # Do
+        mapreduce.process_log(self.FILE_PATH)
+
+        # Assert
+        assert mapreduce.processed_log['by_timestamp']['2023-03-14']['codes']['503'] == 2
+        assert mapreduce.processed_log['by_path']['/login']['timestamps']['2023-02-20'] == 1
+
+    def test_should_process_last_partial_chunk(self):
+        # Build data
+        mapreduce = MapReduce(1, 1, backend='inline')
+        with tempfile.TemporaryDirectory() as directory:
+            file_path = Path(directory) / 'short.log'
+            file_path.write_text(
+                '2024-01-01 10:00:00 | INFO: Page loaded | abc123 | /home | 200\n'
+                '2024-01-01 11:00:00 | INFO: Page loaded | abc123 | /home | 200\n'
+            )
+
+            # Do
+            mapreduce.process_log(file_path)
+
+        # Assert
+        assert mapreduce.processed_log['by_uid']['abc123']['paths']['/home'] == 2
+
+    def test_should_not_allow_unknown_backend(self):
+        with pytest.raises(ValueError):
+            MapReduce(1, 1, backend='gpu')
+
+    def test_should_benchmark_scaling(self):
+        with tempfile.TemporaryDirectory() as directory:
+            file_path = Path(directory) / 'replicated.log'
+            file_bytes = replicate_log(file_path, 2 * self.FILE_PATH.stat().st_size)
+
+            results = benchmark_scaling(file_path, backends=['inline'], max_mappers=2, split_size=50000)
+
+        assert file_bytes >= 2 * self.FILE_PATH.stat().st_size
+        assert [result['mappers'] for result in results['inline']] == [1, 2]
+        assert results['inline'][0]['speedup'] == 1.0
+
+    def test_should_combine_repeated_lines_into_counts(self):
+        # Build data
+        mapreduce = MapReduce(2, 2)
+        with tempfile.TemporaryDirectory() as directory:
+            file_path = Path(directory) / 'repeated.log'
+            file_path.write_text(
+                '2024-01-01 10:00:00 | INFO: Page loaded | abc123 | /home | 200\n' * 1000
+                + '2024-01-02 10:00:00 | ERROR: Not found | def456 | /home | 404\n' * 10
+            )
+
+            # Do
+            mapreduce.process_log(file_path, split_size=1000)
+
+        # Assert
+        assert mapreduce.processed_log['by_path']['/home']['codes'] == {'200': 1000, '404': 10}
+        assert mapreduce.processed_log['by_code']['404']['timestamps'] == {'2024-01-02': 10}
+        assert mapreduce.processed_log['by_uid']['abc123']['uids'] == {}
+
+    def test_should_process_same_counts_with_small_splits(self):
+        # Build data
+        mapreduce = MapReduce(3, 4)
+        mapreduce.process_log(self.FILE_PATH)
+        expected_processed_log = copy.deepcopy(mapreduce.processed_log)
+
+        # Do
+        split_mapreduce = MapReduce(3, 4)
+        split_mapreduce.process_log(self.FILE_PATH, split_size=1024, max_in_flight=2)
+
+        # Assert
+        assert split_mapreduce.processed_log == expected_processed_log
+
+    def test_should_process_same_counts_with_many_reducers(self):
+        # Build data
+        mapreduce = MapReduce(2, 1)
+        mapreduce.process_log(self.FILE_PATH)
+        expected_processed_log = copy.deepcopy(mapreduce.processed_log)
+
+        for backend in ['threads', 'processes']:
+            # Do
+            partitioned_mapreduce = MapReduce(2, 7, backend=backend)
+            partitioned_mapreduce.process_log(self.FILE_PATH, split_size=4096)
+
+            # Assert
+            assert partitioned_mapreduce.processed_log == expected_processed_log
+
+    def test_should_not_allow_zero_reducers(self):
+        with pytest.raises(ValueError):
+            MapReduce(1, 0)
+
+    def test_should_partition_keys_consistently(self):
+        # Do
+        partitions = [hash_partition(f'key{index}', 8) for index in range(1000)]
+
+        # Assert
+        assert partitions == [hash_partition(f'key{index}', 8) for index in range(1000)]
+        assert set(partitions) == set(range(8))
+
+    def test_should_keep_results_per_instance(self):
+        # Build data
+        mapreduce = MapReduce(1, 1)
+        other_mapreduce = MapReduce(1, 1)
+
+        # Do
+        mapreduce.process_log(self.FILE_PATH)
+
+        # Assert
+        assert mapreduce.processed_log['by_path']['/settings']['codes']['200'] == 244
+        assert other_mapreduce.processed_log == {'by_code': {}, 'by_timestamp': {}, 'by_path': {}, 'by_uid': {}}
+
+    def test_should_only_process_appended_lines(self):
+        # Build data
+        mapreduce = MapReduce(2, 2)
+        log_line = '2024-01-01 10:00:00 | INFO: Page loaded | abc123 | /home | 200\n'
+        with tempfile.TemporaryDirectory() as directory:
+            file_path = Path(directory) / 'growing.log'
+            file_path.write_text(log_line * 10)
+
+            # Do
+            mapreduce.process_log(file_path)
+            with open(file_path, 'a') as file:
+                file.write(log_line * 5 + '2024-01-02 10:00:00 | ERROR: Not found | abc123 | /home | 404\n')
+            mapreduce.process_log(file_path, split_size=100)
+            mapreduce.process_log(file_path)
+
+            # Assert
+            assert mapreduce.offsets[str(file_path.resolve())] == file_path.stat().st_size
+
+        assert mapreduce.processed_log['by_path']['/home']['codes'] == {'200': 15, '404': 1}
+        assert mapreduce.processed_log['by_uid']['abc123']['timestamps'] == {'2024-01-01': 15, '2024-01-02': 1}
+
+    def test_should_wait_for_lines_being_written(self):
+        # Build data
+        mapreduce = MapReduce(1, 1)
+        log_line = '2024-01-01 10:00:00 | INFO: Page loaded | abc123 | /home | 200\n'
+        with tempfile.TemporaryDirectory() as directory:
+            file_path = Path(directory) / 'growing.log'
+            file_path.write_text(log_line * 3 + log_line[:30])
+
+            # Do
+            mapreduce.process_log(file_path, tail=True)
+            first_counts = dict(mapreduce.processed_log['by_code']['200']['paths'])
+            with open(file_path, 'a') as file:
+                file.write(log_line[30:] + log_line)
+            mapreduce.process_log(file_path, tail=True)
+
+        # Assert
+        assert first_counts == {'/home': 3}
+        assert mapreduce.processed_log['by_code']['200']['paths'] == {'/home': 5}
+
+    def test_should_count_last_line_without_newline(self):
+        # Build data
+        mapreduce = MapReduce(1, 1)
+        log_line = '2024-01-01 10:00:00 | INFO: Page loaded | abc123 | /home | 200'
+        with tempfile.TemporaryDirectory() as directory:
+            file_path = Path(directory) / 'complete.log'
+            file_path.write_text(log_line)
+
+            # Do
+            mapreduce.process_log(file_path)
+
+        # Assert
+        assert mapreduce.processed_log['by_code']['200']['paths'] == {'/home': 1}
+
+    def test_should_process_rotated_log_from_start(self):
+        # Build data
+        mapreduce = MapReduce(1, 1)
+        log_line = '2024-01-01 10:00:00 | INFO: Page loaded | abc123 | /home | 200\n'
+        with tempfile.TemporaryDirectory() as directory:
+            file_path = Path(directory) / 'rotated.log'
+            file_path.write_text(log_line * 10)
+            mapreduce.process_log(file_path)
+
+            # Do
+            file_path.write_text(log_line * 3)
+            mapreduce.process_log(file_path)
+
+        # Assert
+        assert mapreduce.processed_log['by_code']['200']['paths'] == {'/home': 13}
+
+    def test_should_count_tumbling_windows(self):
+        # Build data
+        mapreduce = MapReduce(2, 2, window_size=60)
+        with tempfile.TemporaryDirectory() as directory:
+            file_path = Path(directory) / 'windows.log'
+            file_path.write_text(
+                '2024-01-01 10:00:10 | INFO: Page loaded | abc123 | /home | 200\n'
+                '2024-01-01 10:00:50 | INFO: Page loaded | abc123 | /home | 200\n'
+                '2024-01-01 10:01:30 | ERROR: Not found | def456 | /home | 404\n'
+            )
+
+            # Do
+            mapreduce.process_log(file_path)
+
+        # Assert
+        assert set(mapreduce.windows) == {'2024-01-01 10:00:00', '2024-01-01 10:01:00'}
+        assert mapreduce.windows['2024-01-01 10:00:00']['by_path']['/home']['codes'] == {'200': 2}
+        assert mapreduce.windows['2024-01-01 10:01:00']['by_path']['/home']['codes'] == {'404': 1}
+        assert mapreduce.processed_log['by_path']['/home']['codes'] == {'200': 2, '404': 1}
+
+    def test_should_not_allow_empty_windows(self):
+        with pytest.raises(ValueError):
+            MapReduce(1, 1, window_size=0)
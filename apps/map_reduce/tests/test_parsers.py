@@ -0,0 +1,76 @@
+from unittest import TestCase
+
+import pytest
+from django.conf import settings
+
+from ..benchmarks import benchmark_parsers
+from ..parsers import LogLineParser, StrptimeLogLineParser
+
+
+class TestSuite(TestCase):
+    FILE_PATH = settings.APPS_DIR / 'map_reduce/tests/sample.log'
+
+    def test_should_parse_line(self):
+        # Build data
+        parser = LogLineParser()
+
+        # Do
+        record = parser.parse('2020-01-01 08:00:01 | INFO: User logged in | 8x43MqNy | /login | 200')
+
+        # Assert
+        assert record == ('2020-01-01', '/login', '200', '8x43MqNy')
+
+    def test_should_fail_parsing_malformed_lines(self):
+        # Build data
+        parser = LogLineParser()
+
+        # Assert
+        for log_line in [
+            '2020-07-11 16:29:',
+            '2020-01-01 08:00:01 | INFO | 8x43MqNy | /login',
+            '2020-13-01 08:00:01 | INFO | 8x43MqNy | /login | 200',
+        ]:
+            with pytest.raises(ValueError):
+                parser.parse(log_line)
+
+    def test_should_skip_timestamp_validation(self):
+        # Build data
+        parser = LogLineParser(validate=False)
+
+        # Do
+        record = parser.parse('2020-13-01 08:00:01 | INFO | 8x43MqNy | /login | 200')
+
+        # Assert
+        assert record == ('2020-13-01', '/login', '200', '8x43MqNy')
+
+    def test_should_parse_chunk_like_strptime_parser(self):
+        # Build data
+        log_chunk = self.FILE_PATH.read_text()
+
+        # Do
+        record_counts, skipped_lines = LogLineParser().parse_chunk(log_chunk)
+        expected_counts, expected_skipped_lines = StrptimeLogLineParser().parse_chunk(log_chunk)
+
+        # Assert
+        assert record_counts == expected_counts
+        assert sorted(skipped_lines) == sorted(expected_skipped_lines)
+
+    def test_should_benchmark_parsers(self):
+        # Do
+        results = benchmark_parsers(self.FILE_PATH, repeat=1)
+
+        # Assert
+        assert results['strptime_per_line']['speedup'] == 1.0
+        assert set(results) == {
+            f'{name}_{path}' for name in ['strptime', 'fast', 'fast_unvalidated'] for path in ['per_line', 'batch']
+        }
+
+    def test_should_get_tumbling_window(self):
+        # Build data
+        parser = LogLineParser()
+        log_line = '2020-01-01 08:47:01 | INFO: User logged in | 8x43MqNy | /login | 200'
+
+        # Assert
+        assert parser.get_window(log_line, 60) == '2020-01-01 08:47:00'
+        assert parser.get_window(log_line, 15 * 60) == '2020-01-01 08:45:00'
+        assert parser.get_window(log_line, 24 * 60 * 60) == '2020-01-01 00:00:00'
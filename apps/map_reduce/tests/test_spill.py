@@ -0,0 +1,113 @@
+import copy
+import os
+import tempfile
+from collections import Counter
+from pathlib import Path
+from unittest import TestCase
+
+import pytest
+from django.conf import settings
+
+from ..map_reduce import MapReduce
+from ..runner import JobRunner
+from ..spill import PartitionBuffer, merge_runs, read_run, write_run
+from .test_jobs import CombinedWordCountJob
+
+
+class TestSuite(TestCase):
+    FILE_PATH = settings.APPS_DIR / 'map_reduce/tests/sample.log'
+
+    def test_should_write_and_read_run(self):
+        with tempfile.TemporaryDirectory() as directory:
+            # Build data
+            run_path = os.path.join(directory, 'run.pickle')
+            items = [(('a', 1), [1, 2]), (('b', 0), [3])]
+
+            # Do
+            write_run(run_path, items)
+
+            # Assert
+            assert list(read_run(run_path)) == items
+
+    def test_should_merge_runs_joining_values(self):
+        # Build data
+        runs = [[('a', [1]), ('c', [2])], [('a', [3]), ('b', [4])], [('c', [5])]]
+
+        # Do
+        merged = list(merge_runs(runs))
+
+        # Assert
+        assert merged == [('a', [1, 3]), ('b', [4]), ('c', [2, 5])]
+
+    def test_should_stream_spilled_and_buffered_partitions(self):
+        with tempfile.TemporaryDirectory() as directory:
+            # Build data
+            buffer = PartitionBuffer()
+            buffer.add({'b': [1], 'a': [2]})
+            buffer.spill(directory)
+            buffer.add({'a': [3], 'c': [4]})
+
+            # Do
+            merged = list(buffer.iter_values())
+
+        # Assert
+        assert len(buffer.run_paths) == 1
+        assert buffer.buffered_keys == 2
+        assert merged == [('a', [2, 3]), ('b', [1]), ('c', [4])]
+
+    def test_should_run_job_with_spills(self):
+        with tempfile.TemporaryDirectory() as directory:
+            # Build data
+            file_path = Path(directory) / 'words.txt'
+            text = ''.join(f'word{index % 97} word{index % 13}\n' for index in range(5000))
+            file_path.write_text(text)
+            spill_directory = Path(directory) / 'spills'
+            spill_directory.mkdir()
+
+            for backend in ['inline', 'processes']:
+                # Do
+                runner = JobRunner(2, 3, backend=backend, spill_threshold=10, spill_directory=spill_directory)
+                results = runner.run(CombinedWordCountJob(), file_path, split_size=1024)
+
+                # Assert
+                assert results == Counter(text.split())
+                assert list(spill_directory.iterdir()) == []
+
+    def test_should_stream_results_from_reducer_runs(self):
+        with tempfile.TemporaryDirectory() as directory:
+            # Build data
+            file_path = Path(directory) / 'words.txt'
+            text = ''.join(f'word{index % 97} word{index % 13}\n' for index in range(5000))
+            file_path.write_text(text)
+            spill_directory = Path(directory) / 'spills'
+            spill_directory.mkdir()
+            runner = JobRunner(2, 3, spill_threshold=10, spill_directory=spill_directory)
+
+            # Do
+            results = runner.iter_results(CombinedWordCountJob(), file_path, split_size=1024)
+            first_result = next(results)
+            run_names = sorted(path.name for path in next(spill_directory.iterdir()).glob('reduced-*'))
+            results = dict([first_result, *results])
+
+            # Assert, reducers only hand their runs to the driver, which reads them back one key at a time
+            assert results == Counter(text.split())
+            assert run_names == ['reduced-0.pickle', 'reduced-1.pickle', 'reduced-2.pickle']
+            assert sum(task.counters['reduced_keys'] for task in runner.stats.tasks) == len(results)
+            assert list(spill_directory.iterdir()) == []
+
+    def test_should_process_same_counts_with_spills(self):
+        # Build data
+        mapreduce = MapReduce(2, 2)
+        mapreduce.process_log(self.FILE_PATH)
+        expected_processed_log = copy.deepcopy(mapreduce.processed_log)
+
+        # Do
+        spilling_mapreduce = MapReduce(2, 2, spill_threshold=0)
+        spilling_mapreduce.process_log(self.FILE_PATH, split_size=4096)
+
+        # Assert
+        assert spilling_mapreduce.processed_log == expected_processed_log
+
+    def test_should_not_allow_negative_spill_threshold(self):
+        with pytest.raises(ValueError):
+            JobRunner(1, 1, spill_threshold=-1)
@@ -0,0 +1,42 @@
+import tempfile
+from pathlib import Path
+from unittest import TestCase
+
+from django.conf import settings
+
+from ..splits import compute_splits, read_split
+
+
+class TestSuite(TestCase):
+    FILE_PATH = settings.APPS_DIR / 'map_reduce/tests/sample.log'
+
+    def test_should_cover_file_with_splits(self):
+        # Do
+        splits = compute_splits(self.FILE_PATH, 1000)
+
+        # Assert
+        assert splits[0][0] == 0
+        assert splits[-1][1] == self.FILE_PATH.stat().st_size
+        assert all(end == next_start for (_, end), (next_start, _) in zip(splits, splits[1:]))
+
+    def test_should_read_every_line_once_across_splits(self):
+        for split_size in [100, 1000, 4096, 10 ** 9]:
+            # Do
+            splits = compute_splits(self.FILE_PATH, split_size)
+            content = b''.join(read_split(self.FILE_PATH, *split) for split in splits)
+
+            # Assert
+            assert content == self.FILE_PATH.read_bytes()
+
+    def test_should_align_split_to_lines(self):
+        with tempfile.TemporaryDirectory() as directory:
+            # Build data
+            file_path = Path(directory) / 'lines.log'
+            file_path.write_bytes(b'first\nsecond\nthird')
+
+            # Assert
+            assert read_split(file_path, 0, 3) == b'first\n'
+            assert read_split(file_path, 3, 9) == b'second\n'
+            assert read_split(file_path, 6, 7) == b'second\n'
+            assert read_split(file_path, 9, 18) == b'third'
+            assert read_split(file_path, 14, 18) == b''
@@ -0,0 +1,86 @@
+import json
+import tempfile
+import time
+from pathlib import Path
+from unittest import TestCase
+
+from django.conf import settings
+
+from ..map_reduce import MapReduce
+from ..stats import JobStats, TaskStats
+
+
+class TestSuite(TestCase):
+    FILE_PATH = settings.APPS_DIR / 'map_reduce/tests/sample.log'
+
+    def test_should_measure_task_phases(self):
+        # Build data
+        stats = TaskStats('map')
+
+        # Do
+        for _ in range(2):
+            with stats.measure('sleep'):
+                time.sleep(0.01)
+        stats.count('records', 5)
+        stats.finish()
+
+        # Assert
+        wall_seconds, cpu_seconds = stats.phases['sleep']
+        assert wall_seconds >= 0.02
+        assert cpu_seconds < wall_seconds
+        assert stats.counters['records'] == 5
+        assert stats.get_seconds() >= wall_seconds
+
+    def test_should_merge_task_stats(self):
+        # Build data
+        job_stats = JobStats()
+        for latency in [0.0005, 0.003, 0.003]:
+            task_stats = TaskStats('map')
+            task_stats.count('records', 10)
+            task_stats.end_time = task_stats.start_time + latency
+            job_stats.add_task(task_stats)
+
+        # Do
+        job_stats.sample_queue_depth(1)
+        job_stats.sample_queue_depth(3)
+        result = job_stats.finish().to_dict()
+
+        # Assert
+        assert result['counters'] == {'records': 30}
+        assert result['split_latency_histogram']['<=1ms'] == 1
+        assert result['split_latency_histogram']['<=5ms'] == 2
+        assert result['queue_depth'] == {'max': 3, 'mean': 2.0}
+        assert result['peak_memory_bytes'] > 0
+
+    def test_should_report_mapreduce_stats(self):
+        # Build data
+        mapreduce = MapReduce(2, 3)
+
+        # Do
+        mapreduce.process_log(self.FILE_PATH, split_size=50000)
+
+        # Assert
+        result = mapreduce.stats.to_dict()
+        assert result['counters']['bytes_read'] == self.FILE_PATH.stat().st_size
+        assert result['counters']['lines'] == len(self.FILE_PATH.read_text().splitlines())
+        assert result['counters']['skipped_lines'] == 12
+        assert result['counters']['splits'] == 7
+        assert {'read', 'parse', 'map', 'combine', 'partition', 'shuffle', 'reduce'} <= set(result['phases'])
+        assert sum(result['split_latency_histogram'].values()) == 7
+
+    def test_should_write_trace_file(self):
+        # Build data
+        mapreduce = MapReduce(2, 3)
+
+        with tempfile.TemporaryDirectory() as directory:
+            trace_path = Path(directory) / 'trace.json'
+
+            # Do
+            mapreduce.process_log(self.FILE_PATH, split_size=50000, trace_path=trace_path)
+
+            # Assert
+            trace = json.loads(trace_path.read_text())
+
+        assert len(trace['traceEvents']) == 7 + 3
+        assert all(event['ph'] == 'X' and event['dur'] >= 0 for event in trace['traceEvents'])
+        assert trace['otherData']['counters']['skipped_lines'] == 12
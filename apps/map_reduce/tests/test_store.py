@@ -0,0 +1,123 @@
+import os
+import tempfile
+from unittest import TestCase
+
+import pytest
+from django.conf import settings
+
+from ..benchmarks import benchmark_result_store
+from ..map_reduce import MapReduce
+from ..store import RECORD_COLUMNS, LogTable, decode_strings, encode_strings
+
+
+def build_table() -> LogTable:
+    return LogTable.from_counts(RECORD_COLUMNS, {
+        ('2024-01-01', '/home', '200', 'abc'): 5,
+        ('2024-01-01', '/home', '404', 'abc'): 1,
+        ('2024-01-02', '/login', '200', 'def'): 3,
+        ('2024-01-02', '/home', '200', 'def'): 2,
+    })
+
+
+class TestSuite(TestCase):
+    FILE_PATH = settings.APPS_DIR / 'map_reduce/tests/sample.log'
+
+    def test_should_group_by_columns(self):
+        # Build data
+        table = build_table()
+
+        # Assert
+        assert table.group_by('path') == {'/home': 8, '/login': 3}
+        assert table.group_by('date', 'code') == {
+            ('2024-01-01', '200'): 5,
+            ('2024-01-01', '404'): 1,
+            ('2024-01-02', '200'): 5,
+        }
+        assert table.get_total() == 11
+
+    def test_should_filter_rows(self):
+        # Build data
+        table = build_table()
+
+        # Do
+        filtered_table = table.filter(code='200', uid=['def', 'missing'])
+
+        # Assert
+        assert len(filtered_table) == 2
+        assert filtered_table.group_by('path') == {'/login': 3, '/home': 2}
+        assert table.filter(code='500').get_total() == 0
+
+    def test_should_get_top_k(self):
+        # Build data
+        table = build_table()
+
+        # Assert
+        assert table.top_k(1, 'uid') == [('abc', 6)]
+        assert table.top_k(5, 'path', 'code') == [(('/home', '200'), 7), (('/login', '200'), 3), (('/home', '404'), 1)]
+
+    def test_should_merge_tables(self):
+        # Build data
+        table = build_table()
+        other_table = LogTable.from_counts(RECORD_COLUMNS, {
+            ('2024-01-01', '/home', '200', 'abc'): 1,
+            ('2024-01-03', '/about', '500', 'ghi'): 4,
+        })
+
+        # Do
+        merged_table = table.merge(other_table)
+
+        # Assert
+        assert len(merged_table) == 5
+        assert merged_table.group_by('uid') == {'abc': 7, 'def': 5, 'ghi': 4}
+        assert table.get_total() == 11
+
+    def test_should_not_allow_unknown_columns(self):
+        with pytest.raises(KeyError):
+            build_table().group_by('method')
+
+        with pytest.raises(ValueError):
+            build_table().merge(LogTable(('window', *RECORD_COLUMNS)))
+
+    def test_should_save_and_load_table(self):
+        # Build data
+        table = build_table()
+
+        with tempfile.TemporaryDirectory() as directory:
+            table_path = os.path.join(directory, 'table.npz')
+
+            # Do
+            table.save(table_path)
+            loaded_table = LogTable.load(table_path)
+
+        # Assert
+        assert loaded_table.columns == RECORD_COLUMNS
+        assert loaded_table.group_by(*RECORD_COLUMNS) == table.group_by(*RECORD_COLUMNS)
+        assert loaded_table.counts.dtype == LogTable.COUNT_TYPE
+
+    def test_should_encode_strings(self):
+        # Build data
+        values = ['', 'ascii', 'ünïcode', '/path']
+
+        # Assert
+        assert decode_strings(*encode_strings(values)) == values
+        assert decode_strings(*encode_strings([])) == []
+
+    def test_should_query_processed_log_table(self):
+        # Build data
+        mapreduce = MapReduce(2, 2)
+
+        # Do
+        mapreduce.process_log(self.FILE_PATH)
+
+        # Assert
+        assert mapreduce.table.filter(uid='5xGm3HsW', path='/about').get_total() == 236
+        assert mapreduce.table.filter(code='503').group_by('date')['2023-03-14'] == 2
+        assert mapreduce.table.get_total() == sum(mapreduce.table.group_by('code').values())
+
+    def test_should_benchmark_result_store(self):
+        # Do
+        results = benchmark_result_store(self.FILE_PATH)
+
+        # Assert
+        assert results['table_memory_bytes'] < results['nested_memory_bytes']
+        assert results['table_file_bytes'] < results['nested_pickle_bytes']
@@ -73,6 +73,29 @@ class MerkleTree:
         self._update_modified_nodes(modified_nodes_list)
         self._touch()
 
+    def get_different_buckets(self, other) -> List[int]:
+        """
+        Bucket numbers whose hash differs from the :other tree's,
+        only descending into subtrees whose hashes differ.
+        """
+        self._perform_replicate_validations(other)
+
+        different_buckets: List[int] = []
+        tree_indexes: List[int] = [0]
+        while tree_indexes:
+            tree_index = tree_indexes.pop()
+            if self.tree[tree_index] == other.tree[tree_index]:
+                continue
+
+            bucket_number: int = tree_index - self.bucket_index_shift
+            if bucket_number >= 0:
+                if bucket_number < len(self.bucket_list):
+                    different_buckets.append(bucket_number)
+                continue
+            tree_indexes.extend([2 * tree_index + 1, 2 * tree_index + 2])
+
+        return sorted(different_buckets)
+
     def _traverse_and_replicate(self, tree_index, other, modified_nodes_list):
         left_child_index: int = 2 * tree_index + 1
         right_child_index: int = 2 * tree_index + 2
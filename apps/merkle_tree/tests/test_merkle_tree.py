@@ -125,3 +125,13 @@ class MyTestCase(TestCase):
         tree_two.replicate_from(tree_one)
         assert tree_one == tree_two
 
+    def test_should_find_different_buckets(self):
+        tree_one = MerkleTree(8, 16)
+        tree_two = MerkleTree(8, 16)
+        tree_one.insert(1, '0a', 1)
+        tree_two.insert(1, '0a', 1)
+        tree_one.insert(2, '0b', 2)
+        tree_two.insert(6, '0c', 3)
+
+        assert tree_one.get_different_buckets(tree_two) == [2, 6]
+        assert tree_one.get_different_buckets(tree_one) == []
@@ -0,0 +1,86 @@
+# src/raft/benchmarks.py
+import argparse
+import asyncio
+import json
+import time
+from collections import Counter
+from typing import Dict, Sequence
+
+from .raft import build_cluster, propose_to_leader, wait_for_leader
+from .transport import InMemoryTransport
+
+DEFAULT_NODE_COUNTS = (3, 5)
+
+
+async def benchmark_cluster(
+    node_count: int,
+    proposal_count: int = 2000,
+    concurrency: int = 64,
+    latency: float = 0.001,
+    max_batch_size: int = 64,
+    max_in_flight: int = 4,
+) -> Dict:
+    """
+    Throughput and commit latency of an in-memory cluster, 'concurrency'
+    clients proposing '('set', key, value)' commands to the leader.
+    """
+    transport = InMemoryTransport(latency=latency, seed=0)
+    nodes = build_cluster(node_count, transport, max_batch_size=max_batch_size, max_in_flight=max_in_flight)
+    [node.start() for node in nodes]
+    await wait_for_leader(nodes)
+    latencies = []
+
+    async def run_client(client_index: int):
+        for index in range(client_index, proposal_count, concurrency):
+            start_time = time.perf_counter()
+            await propose_to_leader(nodes, ('set', f'key-{index % 1000}', index))
+            latencies.append(time.perf_counter() - start_time)
+
+    messages_before = transport.sent_count
+    start_time = time.perf_counter()
+    await asyncio.gather(*[run_client(client_index) for client_index in range(concurrency)])
+    elapsed_time = time.perf_counter() - start_time
+    await asyncio.gather(*[node.stop() for node in nodes])
+
+    # Every leader of the run counts, in case leadership changed
+    stats = sum((node.stats for node in nodes), Counter())
+    latencies.sort()
+    return {
+        'proposals_per_second': proposal_count / elapsed_time,
+        'p50_latency_ms': latencies[len(latencies) // 2] * 1e3,
+        'p99_latency_ms': latencies[int(len(latencies) * 0.99)] * 1e3,
+        'messages': transport.sent_count - messages_before,
+        'append_entries': stats['append_entries_sent'],
+        'entries_per_append': stats['entries_sent'] / max(stats['append_entries_sent'], 1),
+    }
+
+
+def benchmark_raft(node_counts: Sequence[int] = DEFAULT_NODE_COUNTS, **config) -> Dict[str, Dict]:
+    """
+    Unbatched and unpipelined replication, one entry per AppendEntries and
+    one at a time, against the default batching and pipelining.
+    """
+    results = {}
+    for node_count in node_counts:
+        results[f'nodes_{node_count}_unbatched'] = asyncio.run(
+            benchmark_cluster(node_count, max_batch_size=1, max_in_flight=1, **config)
+        )
+        results[f'nodes_{node_count}'] = asyncio.run(benchmark_cluster(node_count, **config))
+    return results
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Raft replication throughput and latency benchmark.')
+    parser.add_argument('--nodes', type=int, nargs='+', default=DEFAULT_NODE_COUNTS)
+    parser.add_argument('--proposals', type=int, default=2000)
+    parser.add_argument('--concurrency', type=int, default=64)
+    parser.add_argument('--latency', type=float, default=0.001)
+    arguments = parser.parse_args()
+
+    results = benchmark_raft(
+        arguments.nodes,
+        proposal_count=arguments.proposals,
+        concurrency=arguments.concurrency,
+        latency=arguments.latency,
+    )
+    print(json.dumps(results, indent=2))
@@ -0,0 +1,87 @@
+# src/raft/log.py
+from typing import List
+
+from .messages import LogEntry
+
+
+class RaftLog:
+    """
+    Replicated log, indexed from 1. Entries up to 'snapshot_index' are
+    compacted away once a snapshot of the state machine covers them,
+    only the index and term of the last one are kept.
+    """
+
+    # Attributes
+    entries: List[LogEntry]  # Entries after 'snapshot_index'
+    snapshot_index: int
+    snapshot_term: int
+
+    def __init__(self):
+        self.entries = []
+        self.snapshot_index = 0
+        self.snapshot_term = 0
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def get_last_index(self) -> int:
+        return self.snapshot_index + len(self.entries)
+
+    def get_last_term(self) -> int:
+        return self.entries[-1][0] if self.entries else self.snapshot_term
+
+    def get_term(self, index: int) -> int | None:
+        """
+        Term of the entry at 'index', None when compacted or past the end.
+        """
+        if index == self.snapshot_index:
+            return self.snapshot_term
+        if not self.snapshot_index < index <= self.get_last_index():
+            return None
+        return self.entries[index - self.snapshot_index - 1][0]
+
+    def get_entry(self, index: int) -> LogEntry:
+        return self.entries[index - self.snapshot_index - 1]
+
+    def get_entries(self, start_index: int, limit: int) -> List[LogEntry]:
+        offset = start_index - self.snapshot_index - 1
+        return self.entries[offset:offset + limit]
+
+    def append(self, entry: LogEntry) -> int:
+        self.entries.append(entry)
+        return self.get_last_index()
+
+    def merge(self, prev_index: int, entries: List[LogEntry]) -> int:
+        """
+        Appends entries that follow 'prev_index', dropping any conflicting
+        suffix, and returns the index of the last one. Entries already
+        present with the same term are left untouched, so a late or
+        repeated batch never truncates newer entries.
+        """
+        index = prev_index
+        for entry in entries:
+            index += 1
+            if index <= self.snapshot_index:
+                continue
+
+            term = self.get_term(index)
+            if term is None:
+                self.entries.append(entry)
+            elif term != entry[0]:
+                del self.entries[index - self.snapshot_index - 1:]
+                self.entries.append(entry)
+        return index
+
+    def compact(self, index: int, term: int):
+        """
+        Drops every entry up to 'index', now covered by a snapshot.
+        """
+        if index <= self.snapshot_index:
+            return
+
+        if self.get_term(index) == term:
+            del self.entries[:index - self.snapshot_index]
+        else:
+            self.entries = []
+        self.snapshot_index = index
+        self.snapshot_term = term
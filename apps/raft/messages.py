@@ -0,0 +1,45 @@
+# src/raft/messages.py
+from typing import Any, List, NamedTuple, Tuple
+
+# Term and command of a log entry
+LogEntry = Tuple[int, Any]
+
+
+class RequestVote(NamedTuple):
+    sender_id: str
+    term: int
+    last_log_index: int
+    last_log_term: int
+
+
+class VoteResponse(NamedTuple):
+    sender_id: str
+    term: int
+    granted: bool
+
+
+class AppendEntries(NamedTuple):
+    sender_id: str
+    term: int
+    prev_log_index: int
+    prev_log_term: int
+    entries: List[LogEntry]
+    leader_commit: int
+
+
+class AppendResponse(NamedTuple):
+    sender_id: str
+    term: int
+    success: bool
+    match_index: int  # Last index known to match the leader's log, on failure a hint of where to resume
+
+
+class InstallSnapshot(NamedTuple):
+    sender_id: str
+    term: int
+    last_included_index: int
+    last_included_term: int
+    data: Any
+
+
+Message = RequestVote | VoteResponse | AppendEntries | AppendResponse | InstallSnapshot
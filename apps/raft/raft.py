@@ -0,0 +1,482 @@
+# src/raft/raft.py
+import asyncio
+import random
+from collections import Counter
+from typing import Any, Callable, Dict, List, Set, Tuple
+
+from .log import RaftLog
+from .messages import AppendEntries, AppendResponse, InstallSnapshot, Message, RequestVote, VoteResponse
+from .state_machines import KeyValueStateMachine, StateMachine
+from .transport import Transport
+
+
+class NotLeaderError(Exception):
+    """
+    A proposal reached a node that is not the leader, or its leader
+    stepped down before applying it, in which case the entry may still
+    be committed by the next leader. 'leader_id' is the node's best
+    guess of the leader.
+    """
+
+    def __init__(self, leader_id: str | None):
+        super().__init__(f'Not the leader, the leader is {leader_id}')
+        self.leader_id = leader_id
+
+
+class RaftNode:
+    """
+    Raft consensus, as described by Ongaro and Ousterhout, on asyncio.
+    The leader replicates its log to every follower from a task per
+    peer. Proposals made while a batch is on its way are sent together
+    in the next AppendEntries, of up to 'max_batch_size' entries, and up
+    to 'max_in_flight' batches are pipelined without waiting for their
+    responses. Once 'snapshot_threshold' entries are applied, the state
+    machine is snapshotted and the log compacted; followers too far
+    behind get the snapshot instead of the entries.
+    State is kept in memory only.
+    """
+
+    # Attributes
+    state: str
+    current_term: int
+    voted_for: str | None
+    leader_id: str | None
+    log: RaftLog
+    snapshot: Any  # Snapshot of the state machine, up to 'log.snapshot_index'
+    commit_index: int
+    last_applied: int
+    next_index: Dict[str, int]  # Peer -> next entry to send it, leader only
+    match_index: Dict[str, int]  # Peer -> last entry known to be replicated on it, leader only
+    stats: Counter
+
+    # Tunable Config
+    node_id: str
+    peer_ids: List[str]
+    transport: Transport
+    state_machine: StateMachine
+    election_timeout: Tuple[float, float]  # Range of the randomized timeout, in seconds
+    heartbeat_interval: float
+    max_batch_size: int
+    max_in_flight: int
+    snapshot_threshold: int
+
+    # Constants
+    DEFAULT_ELECTION_TIMEOUT = (0.15, 0.3)
+    DEFAULT_HEARTBEAT_INTERVAL = 0.05
+
+    # States
+    FOLLOWER = 'follower'
+    CANDIDATE = 'candidate'
+    LEADER = 'leader'
+
+    def __init__(
+        self,
+        node_id: str,
+        peer_ids: List[str],
+        transport: Transport,
+        state_machine: StateMachine | None = None,
+        election_timeout: Tuple[float, float] = DEFAULT_ELECTION_TIMEOUT,
+        heartbeat_interval: float = DEFAULT_HEARTBEAT_INTERVAL,
+        max_batch_size: int = 64,
+        max_in_flight: int = 4,
+        snapshot_threshold: int = 1000,
+        seed: int | None = None,
+    ):
+        self.node_id = node_id
+        self.peer_ids = [peer_id for peer_id in peer_ids if peer_id != node_id]
+        self.transport = transport
+        self.state_machine = state_machine or KeyValueStateMachine()
+        self.election_timeout = election_timeout
+        self.heartbeat_interval = heartbeat_interval
+        self.max_batch_size = max_batch_size
+        self.max_in_flight = max_in_flight
+        self.snapshot_threshold = snapshot_threshold
+        self._perform_validations()
+
+        self.state = self.FOLLOWER
+        self.current_term = 0
+        self.voted_for = None
+        self.leader_id = None
+        self.log = RaftLog()
+        self.snapshot = self.state_machine.snapshot()
+        self.commit_index = 0
+        self.last_applied = 0
+        self.next_index = {}
+        self.match_index = {}
+        self.stats = Counter()
+        self._random = random.Random(seed)
+        self._votes: Set[str] = set()
+        self._election_deadline = 0.0
+        self._in_flight: Dict[str, int] = {}
+        self._replicate_events: Dict[str, asyncio.Event] = {}
+        self._proposals: Dict[int, Tuple[int, asyncio.Future]] = {}  # Index -> (term, future) of local proposals
+        self._tasks: List[asyncio.Task] = []
+        self._leader_tasks: List[asyncio.Task] = []
+
+    def __repr__(self):
+        return f'RaftNode({self.node_id}, {self.state}, term={self.current_term})'
+
+    def get_quorum(self) -> int:
+        return (len(self.peer_ids) + 1) // 2 + 1
+
+    def start(self):
+        self.transport.register(self.node_id, self.handle)
+        self._reset_election_deadline()
+        self._tasks.append(asyncio.create_task(self._run_election_timer()))
+
+    async def stop(self):
+        self.transport.unregister(self.node_id)
+        # Replication tasks end on their own once not leader, even if a cancellation is lost
+        self.state = self.FOLLOWER
+        tasks = self._tasks + self._leader_tasks
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._tasks, self._leader_tasks = [], []
+        self._fail_proposals()
+
+    async def propose(self, command: Any) -> Any:
+        """
+        Appends 'command' to the log and returns the state machine's
+        result once it is committed and applied.
+        """
+        if self.state != self.LEADER:
+            raise NotLeaderError(self.leader_id)
+
+        index = self.log.append((self.current_term, command))
+        future = asyncio.get_running_loop().create_future()
+        self._proposals[index] = (self.current_term, future)
+        for event in self._replicate_events.values():
+            event.set()
+        # Alone in the cluster, the entry is committed right away
+        self._advance_commit_index()
+        return await future
+
+    def handle(self, message: Message):
+        if message.term > self.current_term:
+            # Only leaders send entries and snapshots
+            is_from_leader = isinstance(message, (AppendEntries, InstallSnapshot))
+            self._become_follower(message.term, message.sender_id if is_from_leader else None)
+
+        if isinstance(message, RequestVote):
+            self._handle_request_vote(message)
+        elif isinstance(message, VoteResponse):
+            self._handle_vote_response(message)
+        elif isinstance(message, AppendEntries):
+            self._handle_append_entries(message)
+        elif isinstance(message, AppendResponse):
+            self._handle_append_response(message)
+        elif isinstance(message, InstallSnapshot):
+            self._handle_install_snapshot(message)
+
+    async def _run_election_timer(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            delay = self._election_deadline - loop.time()
+            if self.state == self.LEADER:
+                await asyncio.sleep(self.heartbeat_interval)
+            elif delay > 0:
+                await asyncio.sleep(delay)
+            else:
+                self._start_election()
+
+    def _start_election(self):
+        self.state = self.CANDIDATE
+        self.current_term += 1
+        self.voted_for = self.node_id
+        self.leader_id = None
+        self._votes = {self.node_id}
+        self.stats['elections'] += 1
+        self._reset_election_deadline()
+        if len(self._votes) >= self.get_quorum():
+            self._become_leader()
+            return
+
+        request = RequestVote(self.node_id, self.current_term, self.log.get_last_index(), self.log.get_last_term())
+        for peer_id in self.peer_ids:
+            self.transport.send(peer_id, request)
+
+    def _become_follower(self, term: int, leader_id: str | None = None):
+        self.leader_id = leader_id
+        if self.state == self.LEADER:
+            self._stop_leader_tasks()
+            # Proposals of older terms may never be applied, and a new leader will not report on them
+            self._fail_proposals()
+        self.state = self.FOLLOWER
+        self.current_term = term
+        self.voted_for = None
+        self._reset_election_deadline()
+
+    def _become_leader(self):
+        self.state = self.LEADER
+        self.leader_id = self.node_id
+        last_index = self.log.get_last_index()
+        self.next_index = {peer_id: last_index + 1 for peer_id in self.peer_ids}
+        self.match_index = dict.fromkeys(self.peer_ids, 0)
+        self._in_flight = dict.fromkeys(self.peer_ids, 0)
+        self._replicate_events = {peer_id: asyncio.Event() for peer_id in self.peer_ids}
+        # Entries of past terms only commit along with one of the current term
+        self.log.append((self.current_term, None))
+        self._leader_tasks = [asyncio.create_task(self._replicate(peer_id)) for peer_id in self.peer_ids]
+        self._advance_commit_index()
+
+    def _stop_leader_tasks(self):
+        for task in self._leader_tasks:
+            task.cancel()
+        self._leader_tasks = []
+        self._replicate_events = {}
+
+    async def _replicate(self, peer_id: str):
+        """
+        Keeps 'peer_id' up to date while leader, woken up by proposals and
+        responses, and at least every 'heartbeat_interval'.
+        """
+        event = self._replicate_events[peer_id]
+        is_heartbeat = True
+        while self.state == self.LEADER:
+            self._send_append_entries(peer_id, is_heartbeat)
+            event.clear()
+            try:
+                await asyncio.wait_for(event.wait(), self.heartbeat_interval)
+                is_heartbeat = False
+            except asyncio.TimeoutError:
+                is_heartbeat = True
+                if self._in_flight[peer_id]:
+                    # Nothing came back for a whole interval, resend what was in flight
+                    self._in_flight[peer_id] = 0
+                    self.next_index[peer_id] = self.match_index[peer_id] + 1
+
+    def _send_append_entries(self, peer_id: str, is_heartbeat: bool):
+        if self.next_index[peer_id] <= self.log.snapshot_index:
+            if not self._in_flight[peer_id]:
+                self._in_flight[peer_id] = 1
+                self.stats['snapshots_sent'] += 1
+                self.transport.send(peer_id, InstallSnapshot(
+                    self.node_id, self.current_term, self.log.snapshot_index, self.log.snapshot_term, self.snapshot
+                ))
+            return
+
+        while self._in_flight[peer_id] < self.max_in_flight:
+            next_index = self.next_index[peer_id]
+            entries = self.log.get_entries(next_index, self.max_batch_size)
+            if not entries and not is_heartbeat:
+                return
+
+            prev_log_index = next_index - 1
+            self.transport.send(peer_id, AppendEntries(
+                self.node_id, self.current_term, prev_log_index, self.log.get_term(prev_log_index), entries,
+                self.commit_index,
+            ))
+            self.stats['append_entries_sent'] += 1
+            self.stats['entries_sent'] += len(entries)
+            # Pipelining, the next batch goes out before this one is acknowledged
+            self.next_index[peer_id] = next_index + len(entries)
+            self._in_flight[peer_id] += 1
+            if not entries:
+                return
+            is_heartbeat = False
+
+    def _handle_request_vote(self, request: RequestVote):
+        is_log_up_to_date = (request.last_log_term, request.last_log_index) >= (
+            self.log.get_last_term(), self.log.get_last_index()
+        )
+        granted = (
+            request.term == self.current_term
+            and self.voted_for in (None, request.sender_id)
+            and is_log_up_to_date
+        )
+        if granted:
+            self.voted_for = request.sender_id
+            self._reset_election_deadline()
+        self.transport.send(request.sender_id, VoteResponse(self.node_id, self.current_term, granted))
+
+    def _handle_vote_response(self, response: VoteResponse):
+        if self.state != self.CANDIDATE or response.term != self.current_term or not response.granted:
+            return
+
+        self._votes.add(response.sender_id)
+        if len(self._votes) >= self.get_quorum():
+            self._become_leader()
+
+    def _handle_append_entries(self, request: AppendEntries):
+        if request.term < self.current_term:
+            self._respond(request.sender_id, False, self.log.get_last_index())
+            return
+
+        self.state = self.FOLLOWER
+        self.leader_id = request.sender_id
+        self._reset_election_deadline()
+
+        prev_log_index = request.prev_log_index
+        if prev_log_index > self.log.get_last_index():
+            self._respond(request.sender_id, False, self.log.get_last_index())
+            return
+
+        # Entries up to the snapshot are committed, so they always match
+        if prev_log_index >= self.log.snapshot_index and self.log.get_term(prev_log_index) != request.prev_log_term:
+            self._respond(request.sender_id, False, self._get_conflict_hint(prev_log_index))
+            return
+
+        last_new_index = self.log.merge(prev_log_index, request.entries)
+        self._fail_proposals(lost_only=True)
+        if request.leader_commit > self.commit_index:
+            self.commit_index = min(request.leader_commit, last_new_index)
+            self._apply_committed()
+        self._respond(request.sender_id, True, last_new_index)
+
+    def _handle_append_response(self, response: AppendResponse):
+        if self.state != self.LEADER or response.term != self.current_term:
+            return
+
+        peer_id = response.sender_id
+        self._in_flight[peer_id] = max(self._in_flight[peer_id] - 1, 0)
+        if response.success:
+            self.match_index[peer_id] = max(self.match_index[peer_id], response.match_index)
+            self.next_index[peer_id] = max(self.next_index[peer_id], self.match_index[peer_id] + 1)
+            self._advance_commit_index()
+        else:
+            # Batches pipelined after a rejected one are rejected too, start over from the hint
+            self._in_flight[peer_id] = 0
+            self.next_index[peer_id] = max(self.match_index[peer_id], response.match_index) + 1
+        self._replicate_events[peer_id].set()
+
+    def _handle_install_snapshot(self, request: InstallSnapshot):
+        if request.term < self.current_term:
+            self._respond(request.sender_id, False, self.log.get_last_index())
+            return
+
+        self.state = self.FOLLOWER
+        self.leader_id = request.sender_id
+        self._reset_election_deadline()
+        if request.last_included_index > self.commit_index:
+            self.log.compact(request.last_included_index, request.last_included_term)
+            self.state_machine.restore(request.data)
+            self.snapshot = request.data
+            self.commit_index = self.last_applied = request.last_included_index
+        self._respond(request.sender_id, True, request.last_included_index)
+
+    def _respond(self, leader_id: str, success: bool, match_index: int):
+        self.transport.send(leader_id, AppendResponse(self.node_id, self.current_term, success, match_index))
+
+    def _get_conflict_hint(self, prev_log_index: int) -> int:
+        """
+        Last index before every entry of the conflicting term, so the
+        leader skips the whole term instead of one entry per round trip.
+        """
+        conflict_term = self.log.get_term(prev_log_index)
+        index = prev_log_index
+        while index - 1 > self.log.snapshot_index and self.log.get_term(index - 1) == conflict_term:
+            index -= 1
+        return max(index - 1, self.commit_index)
+
+    def _advance_commit_index(self):
+        match_indexes = sorted([self.log.get_last_index(), *self.match_index.values()], reverse=True)
+        majority_index = match_indexes[self.get_quorum() - 1]
+        # Only entries of the current term are committed by counting replicas
+        if majority_index > self.commit_index and self.log.get_term(majority_index) == self.current_term:
+            self.commit_index = majority_index
+            self._apply_committed()
+
+    def _apply_committed(self):
+        while self.last_applied < self.commit_index:
+            self.last_applied += 1
+            term, command = self.log.get_entry(self.last_applied)
+            result = None if command is None else self.state_machine.apply(command)
+
+            proposal = self._proposals.pop(self.last_applied, None)
+            if proposal is not None and not proposal[1].done():
+                proposal_term, future = proposal
+                if proposal_term == term:
+                    future.set_result(result)
+                else:
+                    future.set_exception(NotLeaderError(self.leader_id))
+
+        if self.last_applied - self.log.snapshot_index >= self.snapshot_threshold:
+            self.snapshot = self.state_machine.snapshot()
+            self.log.compact(self.last_applied, self.log.get_term(self.last_applied))
+
+    def _fail_proposals(self, lost_only: bool = False):
+        """
+        Fails pending proposals with 'NotLeaderError', with 'lost_only'
+        only those whose entry was cut off or replaced by another leader's.
+        """
+        for index, (term, future) in list(self._proposals.items()):
+            if lost_only and self.log.get_term(index) == term:
+                continue
+
+            del self._proposals[index]
+            if not future.done():
+                future.set_exception(NotLeaderError(self.leader_id))
+
+    def _reset_election_deadline(self):
+        self._election_deadline = asyncio.get_running_loop().time() + self._random.uniform(*self.election_timeout)
+
+    def _perform_validations(self):
+        if not 0 < self.heartbeat_interval < self.election_timeout[0] <= self.election_timeout[1]:
+            error_message = (
+                f'Heartbeat interval {self.heartbeat_interval} must be below '
+                f'the election timeout range {self.election_timeout}'
+            )
+            raise ValueError(error_message)
+
+        if self.max_batch_size < 1 or self.max_in_flight < 1:
+            error_message = (
+                f'Batch size and in flight batches must be at least 1, '
+                f'got {self.max_batch_size} and {self.max_in_flight}'
+            )
+            raise ValueError(error_message)
+
+        if self.snapshot_threshold < 1:
+            error_message = f'Snapshot threshold must be at least 1, got {self.snapshot_threshold}'
+            raise ValueError(error_message)
+
+
+def build_cluster(
+    node_count: int,
+    transport: Transport,
+    state_machine_factory: Callable[[], StateMachine] = KeyValueStateMachine,
+    seed: int = 0,
+    **config,
+) -> List[RaftNode]:
+    node_ids = [f'node-{index}' for index in range(node_count)]
+    return [
+        RaftNode(node_id, node_ids, transport, state_machine_factory(), seed=seed + index, **config)
+        for index, node_id in enumerate(node_ids)
+    ]
+
+
+async def wait_for_leader(nodes: List[RaftNode], timeout: float = 5.0) -> RaftNode:
+    """
+    The leader of the highest term among 'nodes', once there is one and
+    it committed an entry of its term, so a majority follows it.
+    """
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout
+    while loop.time() < deadline:
+        leaders = [
+            node
+            for node in nodes
+            if node.state == RaftNode.LEADER and node.log.get_term(node.commit_index) == node.current_term
+        ]
+        if leaders:
+            return max(leaders, key=lambda node: node.current_term)
+        await asyncio.sleep(0.005)
+
+    error_message = f'No leader elected within {timeout} seconds'
+    raise TimeoutError(error_message)
+
+
+async def propose_to_leader(nodes: List[RaftNode], command: Any, timeout: float = 5.0) -> Any:
+    """
+    Proposes 'command' to the leader among 'nodes', again to the next
+    leader on 'NotLeaderError'. A failed proposal may still be committed,
+    so a retried command should be idempotent.
+    """
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout
+    while True:
+        leader = await wait_for_leader(nodes, deadline - loop.time())
+        try:
+            return await leader.propose(command)
+        except NotLeaderError:
+            continue
@@ -0,0 +1,54 @@
+# src/raft/state_machines.py
+from typing import Any, Dict
+
+
+class StateMachine:
+    """
+    Deterministic state machine fed with the committed commands of the
+    log, in order. Snapshots must not share state with the machine.
+    """
+
+    def apply(self, command: Any) -> Any:
+        raise NotImplementedError
+
+    def snapshot(self) -> Any:
+        raise NotImplementedError
+
+    def restore(self, snapshot: Any):
+        raise NotImplementedError
+
+
+class KeyValueStateMachine(StateMachine):
+    """
+    Dictionary driven by '('set', key, value)' and '('delete', key)'
+    commands, e.g. cluster metadata such as the nodes of a hash ring.
+    Every command returns the previous value of its key.
+    """
+
+    # Attributes
+    data: Dict[str, Any]
+
+    # Operations
+    SET = 'set'
+    DELETE = 'delete'
+
+    def __init__(self):
+        self.data = {}
+
+    def apply(self, command: tuple) -> Any:
+        operation, key, *arguments = command
+        if operation == self.SET:
+            previous_value = self.data.get(key)
+            self.data[key] = arguments[0]
+            return previous_value
+        if operation == self.DELETE:
+            return self.data.pop(key, None)
+
+        error_message = f'Unknown operation: {operation}. Use one of {(self.SET, self.DELETE)}'
+        raise ValueError(error_message)
+
+    def snapshot(self) -> Dict[str, Any]:
+        return dict(self.data)
+
+    def restore(self, snapshot: Dict[str, Any]):
+        self.data = dict(snapshot)
@@ -0,0 +1,35 @@
+from django.test import TestCase
+
+from ..log import RaftLog
+
+
+class TestSuite(TestCase):
+    def test_should_only_truncate_on_conflict(self):
+        # Build test data
+        log = RaftLog()
+        [log.append((1, index)) for index in range(5)]
+
+        # Do
+        stale_last_index = log.merge(1, [(1, 1), (1, 2)])
+        conflict_last_index = log.merge(3, [(2, 'new')])
+
+        # Assert
+        assert stale_last_index == 3
+        assert conflict_last_index == 4
+        assert log.get_last_index() == 4
+        assert log.get_entry(4) == (2, 'new')
+
+    def test_should_compact_up_to_snapshot(self):
+        # Build test data
+        log = RaftLog()
+        [log.append((1, index)) for index in range(10)]
+
+        # Do
+        log.compact(6, 1)
+
+        # Assert
+        assert len(log) == 4
+        assert log.get_term(6) == 1
+        assert log.get_term(5) is None
+        assert log.get_entries(7, 2) == [(1, 6), (1, 7)]
+        assert log.get_last_index() == 10
@@ -0,0 +1,216 @@
+import asyncio
+from typing import List
+
+from django.test import TestCase
+
+from ..raft import NotLeaderError, RaftNode, build_cluster, propose_to_leader, wait_for_leader
+from ..transport import InMemoryTransport
+
+# Short timeouts keep the tests fast
+CONFIG = {'election_timeout': (0.05, 0.1), 'heartbeat_interval': 0.01}
+
+
+# Test Utils
+async def start_cluster(node_count: int, transport: InMemoryTransport, **config) -> List[RaftNode]:
+    nodes = build_cluster(node_count, transport, **{**CONFIG, **config})
+    [node.start() for node in nodes]
+    return nodes
+
+
+async def stop_cluster(nodes: List[RaftNode]):
+    await asyncio.gather(*[node.stop() for node in nodes])
+
+
+async def wait_for_commit(nodes: List[RaftNode], index: int, timeout: float = 2.0):
+    await asyncio.wait_for(_poll_commit(nodes, index), timeout)
+
+
+async def _poll_commit(nodes: List[RaftNode], index: int):
+    while any(node.last_applied < index for node in nodes):
+        await asyncio.sleep(0.005)
+
+
+class TestSuite(TestCase):
+    def test_should_elect_a_single_leader(self):
+        async def run():
+            nodes = await start_cluster(5, InMemoryTransport())
+            leader = await wait_for_leader(nodes)
+            await asyncio.sleep(0.2)
+            leaders = [node for node in nodes if node.state == RaftNode.LEADER]
+            await stop_cluster(nodes)
+            return nodes, leader, leaders
+
+        # Do
+        nodes, leader, leaders = asyncio.run(run())
+
+        # Assert
+        assert leaders == [leader]
+        assert all(node.leader_id == leader.node_id for node in nodes)
+
+    def test_should_replicate_proposals(self):
+        async def run():
+            nodes = await start_cluster(3, InMemoryTransport(latency=0.001))
+            leader = await wait_for_leader(nodes)
+            first_result = await leader.propose(('set', 'key', 1))
+            second_result = await leader.propose(('set', 'key', 2))
+            await wait_for_commit(nodes, leader.commit_index)
+            await stop_cluster(nodes)
+            return nodes, first_result, second_result
+
+        # Do
+        nodes, first_result, second_result = asyncio.run(run())
+
+        # Assert
+        assert first_result is None
+        assert second_result == 1
+        assert all(node.state_machine.data == {'key': 2} for node in nodes)
+
+    def test_should_reject_proposals_to_followers(self):
+        async def run():
+            nodes = await start_cluster(3, InMemoryTransport())
+            leader = await wait_for_leader(nodes)
+            await asyncio.sleep(0.05)
+            follower = next(node for node in nodes if node is not leader)
+            try:
+                await follower.propose(('set', 'key', 1))
+            except NotLeaderError as error:
+                return leader, error
+            finally:
+                await stop_cluster(nodes)
+
+        # Do
+        leader, error = asyncio.run(run())
+
+        # Assert
+        assert error.leader_id == leader.node_id
+
+    def test_should_batch_concurrent_proposals(self):
+        async def run():
+            nodes = await start_cluster(3, InMemoryTransport(latency=0.001), max_batch_size=32)
+            await wait_for_leader(nodes)
+            sent_before = sum(node.stats['append_entries_sent'] for node in nodes)
+            await asyncio.gather(*[propose_to_leader(nodes, ('set', f'key-{index}', index)) for index in range(200)])
+            await wait_for_commit(nodes, max(node.commit_index for node in nodes))
+            await stop_cluster(nodes)
+            return nodes, sum(node.stats['append_entries_sent'] for node in nodes) - sent_before
+
+        # Do
+        nodes, append_entries_count = asyncio.run(run())
+
+        # Assert
+        assert append_entries_count < 200
+        assert all(len(node.state_machine.data) == 200 for node in nodes)
+
+    def test_should_fail_over_to_a_new_leader(self):
+        async def run():
+            transport = InMemoryTransport(latency=0.001)
+            nodes = await start_cluster(5, transport)
+            old_leader = await wait_for_leader(nodes)
+            await old_leader.propose(('set', 'key', 1))
+            transport.disconnect(old_leader.node_id)
+            new_leader = await wait_for_leader([node for node in nodes if node is not old_leader])
+            result = await new_leader.propose(('set', 'key', 2))
+            transport.reconnect(old_leader.node_id)
+            await wait_for_commit(nodes, new_leader.commit_index)
+            await stop_cluster(nodes)
+            return nodes, old_leader, new_leader, result
+
+        # Do
+        nodes, old_leader, new_leader, result = asyncio.run(run())
+
+        # Assert
+        assert new_leader is not old_leader
+        assert new_leader.current_term > 1
+        assert result == 1
+        assert old_leader.state == RaftNode.FOLLOWER
+        assert all(node.state_machine.data == {'key': 2} for node in nodes)
+
+    def test_should_fail_proposals_of_a_deposed_leader(self):
+        async def run():
+            transport = InMemoryTransport(latency=0.001)
+            nodes = await start_cluster(5, transport)
+            old_leader = await wait_for_leader(nodes)
+            transport.disconnect(old_leader.node_id)
+            proposals = [asyncio.ensure_future(old_leader.propose(('set', 'key', index))) for index in range(5)]
+            await wait_for_leader([node for node in nodes if node is not old_leader])
+            transport.reconnect(old_leader.node_id)
+            # Checked before stopping, which fails whatever is still pending
+            done_proposals, _ = await asyncio.wait(proposals, timeout=1.0)
+            await stop_cluster(nodes)
+            return proposals, done_proposals
+
+        # Do
+        proposals, done_proposals = asyncio.run(run())
+
+        # Assert
+        assert len(done_proposals) == 5
+        assert all(isinstance(proposal.exception(), NotLeaderError) for proposal in proposals)
+
+    def test_should_not_commit_in_a_minority_partition(self):
+        async def run():
+            transport = InMemoryTransport(latency=0.001)
+            nodes = await start_cluster(5, transport)
+            leader = await wait_for_leader(nodes)
+            followers = [node for node in nodes if node is not leader]
+            [transport.disconnect(node.node_id) for node in followers[:3]]
+            proposal = asyncio.ensure_future(leader.propose(('set', 'key', 1)))
+            await asyncio.sleep(0.3)
+            is_committed = proposal.done() and proposal.exception() is None
+            await stop_cluster(nodes)
+            return nodes, is_committed, proposal
+
+        # Do
+        nodes, is_committed, proposal = asyncio.run(run())
+
+        # Assert
+        assert not is_committed
+        assert isinstance(proposal.exception(), NotLeaderError)
+        assert not any('key' in node.state_machine.data for node in nodes)
+
+    def test_should_catch_up_from_a_snapshot(self):
+        async def run():
+            transport = InMemoryTransport(latency=0.001)
+            nodes = await start_cluster(3, transport, snapshot_threshold=50)
+            leader = await wait_for_leader(nodes)
+            lagging_node = next(node for node in nodes if node is not leader)
+            transport.disconnect(lagging_node.node_id)
+            await asyncio.gather(*[leader.propose(('set', f'key-{index}', index)) for index in range(120)])
+            transport.reconnect(lagging_node.node_id)
+            await wait_for_commit(nodes, leader.commit_index)
+            await stop_cluster(nodes)
+            return leader, lagging_node
+
+        # Do
+        leader, lagging_node = asyncio.run(run())
+
+        # Assert
+        assert leader.log.snapshot_index >= 50
+        assert leader.stats['snapshots_sent'] >= 1
+        assert lagging_node.state_machine.data == leader.state_machine.data
+        assert len(lagging_node.state_machine.data) == 120
+
+    def test_should_converge_with_message_loss(self):
+        async def run():
+            nodes = await start_cluster(3, InMemoryTransport(latency=0.001, drop_rate=0.1, seed=0))
+            for index in range(50):
+                leader = await wait_for_leader(nodes)
+                try:
+                    await asyncio.wait_for(leader.propose(('set', 'key', index)), 1.0)
+                except (NotLeaderError, asyncio.TimeoutError):
+                    continue
+            leader = await wait_for_leader(nodes)
+            await wait_for_commit(nodes, leader.commit_index, timeout=5.0)
+            await stop_cluster(nodes)
+            return nodes
+
+        # Do
+        nodes = asyncio.run(run())
+
+        # Assert
+        assert all(node.state_machine.data == nodes[0].state_machine.data for node in nodes)
+        assert nodes[0].state_machine.data['key'] == 49
+
+    def test_should_validate_config(self):
+        # Assert
+        with self.assertRaises(ValueError):
+            RaftNode('node-0', [], InMemoryTransport(), heartbeat_interval=0.5)
@@ -0,0 +1,88 @@
+# src/raft/transport.py
+import asyncio
+import random
+from typing import Callable, Dict, Set
+
+from .messages import Message
+
+Handler = Callable[[Message], None]
+
+
+class Transport:
+    """
+    Delivers messages between Raft nodes, fire and forget. Raft already
+    copes with lost, late and repeated messages, so no delivery
+    guarantee is needed.
+    """
+
+    def register(self, node_id: str, handler: Handler):
+        raise NotImplementedError
+
+    def unregister(self, node_id: str):
+        raise NotImplementedError
+
+    def send(self, target_id: str, message: Message):
+        raise NotImplementedError
+
+
+class InMemoryTransport(Transport):
+    """
+    Transport within one event loop, for tests and benchmarks. Messages
+    are delivered after 'latency' seconds unless dropped, and nodes can
+    be disconnected to simulate crashes and partitions. Drops are drawn
+    from a seeded generator, so runs are repeatable.
+    """
+
+    # Attributes
+    handlers: Dict[str, Handler]
+    disconnected: Set[str]
+    sent_count: int
+    dropped_count: int
+
+    # Tunable Config
+    latency: float
+    drop_rate: float
+
+    def __init__(self, latency: float = 0.0, drop_rate: float = 0.0, seed: int | None = None):
+        self.handlers = {}
+        self.disconnected = set()
+        self.sent_count = 0
+        self.dropped_count = 0
+        self.latency = latency
+        self.drop_rate = drop_rate
+        self._random = random.Random(seed)
+
+    def register(self, node_id: str, handler: Handler):
+        self.handlers[node_id] = handler
+
+    def unregister(self, node_id: str):
+        self.handlers.pop(node_id, None)
+
+    def disconnect(self, node_id: str):
+        self.disconnected.add(node_id)
+
+    def reconnect(self, node_id: str):
+        self.disconnected.discard(node_id)
+
+    def send(self, target_id: str, message: Message):
+        self.sent_count += 1
+        if self._is_dropped(message.sender_id, target_id):
+            self.dropped_count += 1
+            return
+
+        loop = asyncio.get_running_loop()
+        if self.latency:
+            loop.call_later(self.latency, self._deliver, target_id, message)
+        else:
+            loop.call_soon(self._deliver, target_id, message)
+
+    def _deliver(self, target_id: str, message: Message):
+        # The target may have been disconnected while the message was on its way
+        handler = self.handlers.get(target_id)
+        if handler is not None and target_id not in self.disconnected:
+            handler(message)
+
+    def _is_dropped(self, sender_id: str, target_id: str) -> bool:
+        if sender_id in self.disconnected or target_id in self.disconnected:
+            return True
+        return self.drop_rate > 0 and self._random.random() < self.drop_rate